@@ -309,7 +309,7 @@ class assetsManagerBaseLayout():
 
 	def rebuildListModel(self):
 		self.QSourceModel.clear()
-		lFolders = workspaces.getFoldersFromFolderList(self.sPath)
+		lFolders = workspaces.getWorkspaceFolders(self.sPath)
 		for sFolder in lFolders:
 			sFolder_item = QtGui.QStandardItem(sFolder)
 			self.QSourceModel.appendRow(sFolder_item)
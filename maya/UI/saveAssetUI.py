@@ -15,6 +15,7 @@ except:
 ## libs Import
 import common.workspaces as workspaces
 import common.files as files
+import common.saveQueue as saveQueue
 reload(workspaces)
 reload(files)
 
@@ -35,6 +36,13 @@ class saveAssetUI(QtGui.QWidget):
 		self.setFixedSize(400, 240)
 		self.initUI()
 
+		## failed and dropped background saves are reported to the artist
+		saveQueue.addStatusCallback(showSaveJobStatus)
+		## finish save jobs interrupted in the last session
+		iJobs = saveQueue.resumeJobs()
+		if iJobs:
+			print 'resumed %d unfinished save jobs' %iJobs
+
 	def initUI(self):
 		QLayoutBase = QtGui.QVBoxLayout(self)
 		self.setLayout(QLayoutBase)
@@ -134,9 +142,36 @@ class saveAssetUI(QtGui.QWidget):
 		bCheck = QtGui.QMessageBox.question(self, 'Save Asset', 'Project: %s\n\nAsset: %s\n\nType: %s\n\nTag: %s\n\nComment: %s' %(sProject, sAsset, sType, sTag, sComment), QtGui.QMessageBox.Yes, QtGui.QMessageBox.No)
 
 		if bCheck == QtGui.QMessageBox.Yes:
+			if not self.__resolveFailedJobs(sProject, sAsset, sType):
+				return
 			workspaces.saveAsset(sAsset, sType, sProject, sTag = sTag, sComment = sComment)
 			self.close()
 
+	def __resolveFailedJobs(self, sProject, sAsset, sType):
+		'''
+		retry or discard the failed save jobs on the asset type, return False if some are left
+		'''
+		sDirectory, sWipDirectory = workspaces.getAssetDirectory(sProject = sProject, sAsset = sAsset, sType = sType)
+		lJobs = saveQueue.getFailedJobs(sDirectory = sDirectory)
+		if not lJobs:
+			return True
+		QMessageBox = QtGui.QMessageBox(QtGui.QMessageBox.Warning, 'Save Asset', 'Save job %s did not finish.\n\nRetry it, or discard it and save a new version?' %', '.join([dJob['sName'] for dJob in lJobs]), parent = self)
+		QPushButtonRetry = QMessageBox.addButton('Retry', QtGui.QMessageBox.AcceptRole)
+		QPushButtonDiscard = QMessageBox.addButton('Discard', QtGui.QMessageBox.DestructiveRole)
+		QMessageBox.addButton(QtGui.QMessageBox.Cancel)
+		QMessageBox.exec_()
+		if QMessageBox.clickedButton() == QPushButtonRetry:
+			saveQueue.resumeJobs()
+			saveQueue.waitForJobs()
+		elif QMessageBox.clickedButton() == QPushButtonDiscard:
+			saveQueue.discardJobs(lJobs)
+		else:
+			return False
+		if saveQueue.getFailedJobs(sDirectory = sDirectory):
+			QtGui.QMessageBox.warning(self, 'Save Asset', 'Save job still failing, check the script editor.')
+			return False
+		return True
+
 	def closeEvent(self, event):
 		try:
 			self.setPathWin.close()
@@ -144,6 +179,17 @@ class saveAssetUI(QtGui.QWidget):
 			pass
 		event.accept()
 
+def showSaveJobStatus(dStatus):
+	'''
+	save job status callback, called on the main thread
+	'''
+	if dStatus['sStatus'] == saveQueue.sStatusFailed:
+		sMessage = 'Save job %s failed at step %d of %d:\n\n%s\n\nThe asset can not be saved again until the job is retried or discarded from the Save Asset window.' %(dStatus['sName'], dStatus['iStep'] + 1, dStatus['iSteps'], dStatus['sMessage'])
+		cmds.warning(sMessage.replace('\n\n', ' '))
+		cmds.confirmDialog(title = 'Save Asset', message = sMessage, button = ['OK'])
+	elif dStatus['sStatus'] == saveQueue.sStatusDropped:
+		cmds.warning('save job %s was dropped, %s' %(dStatus['sName'], dStatus['sMessage']))
+
 class setPathWin(QtGui.QDialog):
 	def __init__(self, sParent=None):
 		super(setPathWin, self).__init__()
@@ -191,7 +237,7 @@ class setPathWin(QtGui.QDialog):
 		self.QPushButtonPath.pressed.connect(self.setPath)
 
 	def listProjects(self):
-		lFolders = workspaces.getFoldersFromFolderList(files.sPathLocal)
+		lFolders = workspaces.getWorkspaceFolders(files.sPathLocal)
 		for sFolder in lFolders:
 			self.QComboBoxProject.addItem(sFolder)
 
@@ -200,7 +246,7 @@ class setPathWin(QtGui.QDialog):
 		if sProject:
 			self.QComboBoxAsset.clear()
 			sDir, sWipDir = workspaces.getAssetDirectory(sProject = sProject)
-			lFolders = workspaces.getFoldersFromFolderList(sDir)
+			lFolders = workspaces.getWorkspaceFolders(sDir)
 			for sFolder in lFolders:
 				self.QComboBoxAsset.addItem(sFolder)
 		else:
@@ -212,7 +258,7 @@ class setPathWin(QtGui.QDialog):
 		if sAsset:
 			self.QComboBoxType.clear()
 			sDir, sWipDir = workspaces.getAssetDirectory(sProject = sProject, sAsset = sAsset)
-			lFolders = workspaces.getFoldersFromFolderList(sDir)
+			lFolders = workspaces.getWorkspaceFolders(sDir)
 			for sFolder in lFolders:
 				self.QComboBoxType.addItem(sFolder)
 		else:
@@ -7,16 +7,20 @@ try:
 	from PySide import QtGui
 	from PySide import QtCore
 	from shiboken import wrapInstance
+	Signal = QtCore.Signal
 except:
 	from PyQt4 import QtGui
 	from PyQt4 import QtCore
 	from sip import wrapinstance as wrapInstance
+	Signal = QtCore.pyqtSignal
 
 ## libs Import
 import common.workspaces as workspaces
 import common.files as files
+import common.syncStatus as syncStatus
 reload(workspaces)
 reload(files)
+reload(syncStatus)
 
 
 ## sync assets UI
@@ -25,8 +29,9 @@ class syncAssetsUI(QtGui.QWidget):
 	def __init__(self, sParent = None):
 		super(syncAssetsUI, self).__init__()
 
-		self.dAssetData = getFileInfoFromLocalAndServer()
-		print self.dAssetData
+		self.dAssetData = {}
+		self.sProject = None
+		self.oStatusThread = None
 		
 		#Parent widget under Maya main window        
 		self.setParent(sParent)       
@@ -82,6 +87,8 @@ class syncAssetsUI(QtGui.QWidget):
 		QLayoutButton.addWidget(self.QPushButtonPull)
 		self.QPushButtonPull.clicked.connect(self.__checkoutCmd)
 
+		self.__refreshCmd()
+
 	def setProjectList(self):
 		lProjects = self.dAssetData.keys()
 		lStatus = []
@@ -150,9 +157,34 @@ class syncAssetsUI(QtGui.QWidget):
 			self.__syncCmd('local')
 
 	def __refreshCmd(self):
+		if self.oStatusThread and self.oStatusThread.isRunning():
+			return
+		self.dAssetData = {}
+		self.sProject = None
+		self.sAsset = None
 		self.oLayout_project.refreshFileList()
-		self.dAssetData = getFileInfoFromLocalAndServer()
-		self.setProjectList()
+		self.oLayout_asset.refreshFileList()
+		self.oLayout_type.refreshFileList()
+		self.QPushButtonRefresh.setEnabled(False)
+		self.oStatusThread = syncStatusThread(self)
+		self.oStatusThread.assetStatusReady.connect(self.__updateAssetStatus)
+		self.oStatusThread.finished.connect(self.__refreshFinished)
+		self.oStatusThread.start()
+
+	def __updateAssetStatus(self, sProject, sStatusProject, sAsset, dAsset):
+		if sProject not in self.dAssetData:
+			self.dAssetData[sProject] = {'status': sStatusProject, 'folders': {}}
+		self.dAssetData[sProject]['status'] = sStatusProject
+		self.oLayout_project.setFileStatus(sProject, sStatusProject)
+		if sAsset:
+			self.dAssetData[sProject]['folders'][sAsset] = dAsset
+			## self.sProject is only set on selection changes, the lists are cleared by the refresh
+			sProjectSel, sStatusProjectSel = self.__getSelectItem(self.oLayout_project)
+			if sProject == sProjectSel:
+				self.oLayout_asset.setFileStatus(sAsset, dAsset['status'])
+
+	def __refreshFinished(self):
+		self.QPushButtonRefresh.setEnabled(True)
 			
 	def __syncCmd(self, sMode):
 		sTypeSel, sStatusTypeSel = self.__getSelectItem(self.oLayout_type)
@@ -237,6 +269,15 @@ class syncAssetLayout():
 
 		self.QFilterEdit.textChanged.connect(self.filterRegExpChanged)
 
+	def setFileStatus(self, sName, sStatus):
+		lItems = self.QSourceModel.findItems(sName, QtCore.Qt.MatchExactly, syncAssetLayout.NAME)
+		if lItems:
+			iRow = lItems[0].row()
+			self.QSourceModel.setData(self.QSourceModel.index(iRow, syncAssetLayout.STATUS), sStatus)
+			self.__setStatusColor(iRow, sStatus)
+		else:
+			self.addFile(sName, sStatus)
+
 	def setList(self, lFiles, lStatus):
 		for i, sFile in enumerate(lFiles):
 			self.addFile(sFile, lStatus[i])
@@ -251,12 +292,15 @@ class syncAssetLayout():
 		self.QSourceModel.insertRow(iRowCount)
 		self.QSourceModel.setData(self.QSourceModel.index(iRowCount, syncAssetLayout.NAME), sName)
 		self.QSourceModel.setData(self.QSourceModel.index(iRowCount, syncAssetLayout.STATUS), sStatus)
+		self.__setStatusColor(iRowCount, sStatus)
+
+	def __setStatusColor(self, iRow, sStatus):
 		if sStatus == 'Out of date':
-			self.QSourceModel.item(iRowCount, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('red')))
+			self.QSourceModel.item(iRow, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('red')))
 		elif sStatus == 'Up to date':
-			self.QSourceModel.item(iRowCount, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('green')))
+			self.QSourceModel.item(iRow, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('green')))
 		else:
-			self.QSourceModel.item(iRowCount, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('yellow')))
+			self.QSourceModel.item(iRow, column = syncAssetLayout.STATUS).setForeground(QtGui.QBrush(QtGui.QColor('yellow')))
 
 	def filterRegExpChanged(self):
 		regExp = QtCore.QRegExp(self.QFilterEdit.text(), QtCore.Qt.CaseInsensitive)
@@ -287,119 +331,17 @@ class fileTreeView(QtGui.QTreeView):
 	def mouseDoubleClickEvent(self, event):
 		pass
 
-def getFileInfoFromLocalAndServer():
-	dAssetData = {}
-	## get projects
-	lProjectsData, lProjects = compareFilesLocalServer(files.sPathLocal, files.sPathServer)
-	for iProject, sProject in enumerate(lProjects):
-		dAssetData.update(lProjectsData[iProject])
-		sStatus_project = dAssetData[sProject]['status']
-
-		sPathLocal_asset = os.path.join(files.sPathLocal, sProject)
-		sPathLocal_asset = os.path.join(sPathLocal_asset, 'assets')
-		sPathServer_asset = os.path.join(files.sPathServer, sProject)
-		sPathServer_asset = os.path.join(sPathServer_asset, 'assets')
-
-		lAssetsData, lAssets = compareFilesLocalServer(sPathLocal_asset, sPathServer_asset)
-		for iAsset, sAsset in enumerate(lAssets):
-			dAssetData[sProject]['folders'].update(lAssetsData[iAsset])
-			sStatus_asset = dAssetData[sProject]['folders'][sAsset]['status']
-
-			sPathLocal_type = os.path.join(sPathLocal_asset, sAsset)
-			sPathServer_type = os.path.join(sPathServer_asset, sAsset)
-
-			lTypesData, lTypes = compareFilesLocalServer(sPathLocal_type, sPathServer_type)
-
-			for iType, sType in enumerate(lTypes):
-				dAssetData[sProject]['folders'][sAsset]['folders'].update(lTypesData[iType])
-				sPathLocal_file = os.path.join(sPathLocal_type, sType)
-				sPathServer_file = os.path.join(sPathServer_type, sType)
-				sStatus = compareFileVersion(sPathLocal_file, sPathServer_file)
-				dAssetData[sProject]['folders'][sAsset]['folders'][sType]['status'] = sStatus
-
-				if sStatus_asset == 'Out of date' or sStatus == 'Out of date':
-					sStatus_asset = 'Out of date'
-				elif sStatus_asset == 'Not on local' or sStatus == 'Not on local':
-					sStatus_asset = 'Not on local'
-				else:
-					sStatus_asset = 'Up to date'
-
-			dAssetData[sProject]['folders'][sAsset]['status'] = sStatus_asset
-
-			if sStatus_project == 'Out of date' or sStatus_asset == 'Out of date':
-				sStatus_project = 'Out of date'
-			elif sStatus_project == 'Not on local' or sStatus_asset == 'Not on local':
-				sStatus_project = 'Not on local'
-			else:
-				sStatus_project = 'Up to date'
-
-		dAssetData[sProject]['status'] = sStatus_project
-
-	return dAssetData
-
-def compareFilesLocalServer(sPathLocal, sPathServer):
-	lReturn = []
-
-	if os.path.exists(sPathLocal):
-		lFiles_local = workspaces.getFoldersFromFolderList(sPathLocal)
-	else:
-		lFiles_local = []
-	if os.path.exists(sPathServer):
-		lFiles_server = workspaces.getFoldersFromFolderList(sPathServer)
-	else:
-		lFiles_server = []
-
-	lFiles = list(set(lFiles_local + lFiles_server))
-	for sFile in lFiles:
-		if sFile in lFiles_local and sFile in lFiles_server:
-			sStatus = 'Up to date'
-		elif sFile in lFiles_local:
-			sStatus = 'Out of date'
-		else:
-			sStatus = 'Not on local'
-		dFiles = {sFile: {'status': sStatus, 'folders': {}}}
-		lReturn.append(dFiles)
-
-	return lReturn, lFiles
-
-def compareFileVersion(sPathLocal, sPathServer):
-	sVersionLocal = os.path.join(sPathLocal, 'assetInfo.version')
-	sVersionServer = os.path.join(sPathServer, 'assetInfo.version')
-
-	if os.path.exists(sVersionLocal) and os.path.exists(sVersionServer):
-		dAssetDataLocal = files.readJsonFile(sVersionLocal)
-		dAssetDataServer = files.readJsonFile(sVersionServer)
+class syncStatusThread(QtCore.QThread):
+	'''
+	run the local/server status scan off the ui thread, emit each asset as soon as it is compared
+	'''
+	assetStatusReady = Signal(str, str, object, object)
 
-		if dAssetDataLocal['versionInfo']:
-			lVersionsLocal = []
-			for sKey in dAssetDataLocal['versionInfo'].keys():
-				lVersionsLocal.append(int(sKey))
-			iVersionLocal = int(max(lVersionsLocal))
-		else:
-			iVersionLocal = -1
-
-		if dAssetDataServer['versionInfo']:
-			lVersionsServer = []
-			for sKey in dAssetDataServer['versionInfo'].keys():
-				lVersionsServer.append(int(sKey))
-			iVersionServer = int(max(lVersionsServer))
-		else:
-			iVersionServer = -1
-
-		if iVersionLocal == iVersionServer:
-			sStatus = 'Up to date'
-		elif iVersionLocal > iVersionServer:
-			sStatus = 'Out of date'
-		else:
-			sStatus = 'Not on local'
-
-	elif os.path.exists(sVersionLocal):
-		sStatus = 'Out of date'
-	elif os.path.exists(sVersionServer):
-		sStatus = 'Not on local'
-	else:
-		sStatus = 'Up to date'
-
-	return sStatus
+	def run(self):
+		syncStatus.getFileInfoFromLocalAndServer(fnCallback = self.__emitAssetStatus)
 
+	def __emitAssetStatus(self, sProject, sStatusProject, sAsset, dAsset):
+		self.assetStatusReady.emit(sProject, sStatusProject, sAsset, dAsset)
 
+def getFileInfoFromLocalAndServer():
+	return syncStatus.getFileInfoFromLocalAndServer()
@@ -4,6 +4,9 @@ import maya.mel as mel
 import maya.OpenMaya as OpenMaya
 import math
 
+## libs Import
+import matrixMath
+
 #### Functions
 def setMObj(sNode):
 	'''
@@ -39,6 +42,13 @@ def convertMPointArrayToList(mPntArray):
 		lPntList.append([mPntArray[i].x, mPntArray[i].y, mPntArray[i].z])
 	return lPntList
 
+def convertListToMPointArray(lPntList):
+	mPntArray = OpenMaya.MPointArray()
+	mPntArray.setLength(len(lPntList))
+	for i, lPnt in enumerate(lPntList):
+		mPntArray.set(i, lPnt[0], lPnt[1], lPnt[2])
+	return mPntArray
+
 def convertMDoubleArrayToList(mDoubleArray):
 	lList = []
 	for i in range(mDoubleArray.length()):
@@ -50,6 +60,18 @@ def createMDoubleArray(lList):
 	mDoubleArray.createFromList(lList,3)
 	return mDoubleArray
 
+def convertListToMDoubleArray(lList):
+	'''
+	build a MDoubleArray in one call, through a MScriptUtil double buffer
+	'''
+	iLength = len(lList)
+	if not iLength:
+		return OpenMaya.MDoubleArray()
+	mUtil = OpenMaya.MScriptUtil()
+	mUtil.createFromList(lList, iLength)
+	mDoubleArray = OpenMaya.MDoubleArray(mUtil.asDoublePtr(), iLength)
+	return mDoubleArray
+
 def convertDegreeToRadians(fDegree):
 	return math.radians(fDegree)
 
@@ -62,28 +84,8 @@ def convertRotationToRadians(lRotate):
 
 # ----------------- mMatrix ----------------------
 def createMMatrixFromTransformInfo(lTranslate = [0,0,0], lRotate = [0,0,0], lScale = [1,1,1], lShear = [0,0,0], iRotateOrder = 0):
-	lRotateOrder = [OpenMaya.MTransformationMatrix.kXYZ, 
-					OpenMaya.MTransformationMatrix.kYZX,
-					OpenMaya.MTransformationMatrix.kZXY,
-					OpenMaya.MTransformationMatrix.kXZY,
-					OpenMaya.MTransformationMatrix.kYXZ,
-					OpenMaya.MTransformationMatrix.kZYX,]
-
-	mTransformationMatrix = OpenMaya.MTransformationMatrix()
-	mVectorTranslate = OpenMaya.MVector(lTranslate[0], lTranslate[1], lTranslate[2])
-	lRotate = convertRotationToRadians(lRotate)
-	mDoubleArrayRotate = createMDoubleArray(lRotate)
-	mDoubleArrayScale = createMDoubleArray(lScale)
-	mDoubleArrayShear = createMDoubleArray(lShear)
-
-	mTransformationMatrix.setTranslation(mVectorTranslate, OpenMaya.MSpace.kWorld)
-	mTransformationMatrix.setRotation(mDoubleArrayRotate.asDoublePtr(), lRotateOrder[iRotateOrder], OpenMaya.MSpace.kWorld)
-	mTransformationMatrix.setScale(mDoubleArrayScale.asDoublePtr(), OpenMaya.MSpace.kWorld)
-	mTransformationMatrix.setShear(mDoubleArrayShear.asDoublePtr(), OpenMaya.MSpace.kWorld)
-
-	mMatrix = mTransformationMatrix.asMatrix()
-
-	return mMatrix
+	lMatrix = matrixMath.composeMatrix(lTranslate = lTranslate, lRotate = lRotate, lScale = lScale, lShear = lShear, iRotateOrder = iRotateOrder)
+	return convertListToMMatrix(lMatrix)
 
 def createMMatrixFromTransformNode(sNode, sSpace = 'world'):
 	if sSpace == 'world':
@@ -109,53 +111,21 @@ def convertListToMMatrix(lMatrix):
 def getLocalMatrixInNode(sNode, sParent, sNodeAttr = 'worldMatrix[0]', sParentAttr = 'worldMatrix[0]'):
 	lMatrix_node = cmds.getAttr('%s.%s' %(sNode, sNodeAttr))
 	lMatrix_parent = cmds.getAttr('%s.%s' %(sParent, sParentAttr))
-	mMatrix_node = convertListToMMatrix(lMatrix_node)
-	mMatrix_parent = convertListToMMatrix(lMatrix_parent)
-	mMatrixInverse_parent = mMatrix_parent.inverse()
-	mMatrix_local = mMatrix_node * mMatrixInverse_parent
-	lMatrixLocal = convertMMatrixToList(mMatrix_local)
-	return lMatrixLocal
+	return matrixMath.getLocalMatrix(lMatrix_node, lMatrix_parent)
 
 def getLocalMatrixInMatrix(sNode, lParentMatrix, sNodeAttr = 'worldMatrix[0]'):
 	lMatrix_node = cmds.getAttr('%s.%s' %(sNode, sNodeAttr))
-	mMatrix_node = convertListToMMatrix(lMatrix_node)
-	mMatrix_parent = convertListToMMatrix(lParentMatrix)
-	mMatrixInverse_parent = mMatrix_parent.inverse()
-	mMatrix_local = mMatrix_node * mMatrixInverse_parent
-	lMatrixLocal = convertMMatrixToList(mMatrix_local)
-	return lMatrixLocal
+	return matrixMath.getLocalMatrix(lMatrix_node, lParentMatrix)
 
 def decomposeMMatrix(mMatrix, sSpace = 'world', iRotateOrder = 0):
-	if sSpace == 'world':
-		mSpace = OpenMaya.MSpace.kWorld
-	else:
-		mSpace = OpenMaya.MSpace.kObject
-	mTransformationMatrix = OpenMaya.MTransformationMatrix(mMatrix)
-	
-	mDoubleArrayTranslate = mTransformationMatrix.getTranslation(mSpace)
-	
-	## there is a maya api bug, getRotation seems not work, have to get a quaternion then convert to euler
-	mQuaternion = mTransformationMatrix.rotation()
-	mRotation = mQuaternion.asEulerRotation()
-	mRotation.reorderIt(iRotateOrder)
-
-	mDoubleArrayScale = createMDoubleArray([1,1,1])
-	mDoubleArrayScalePtr = mDoubleArrayScale.asDoublePtr()
-	mTransformationMatrix.getScale(mDoubleArrayScalePtr, mSpace)
-
-	lTranslate = [mDoubleArrayTranslate(0), mDoubleArrayTranslate(1), mDoubleArrayTranslate(2)]
-	lRotate = [mRotation.x, mRotation.y, mRotation.z]
-	fScaleX = OpenMaya.MScriptUtil.getDoubleArrayItem(mDoubleArrayScalePtr, 0)
-	fScaleY = OpenMaya.MScriptUtil.getDoubleArrayItem(mDoubleArrayScalePtr, 1)
-	fScaleZ = OpenMaya.MScriptUtil.getDoubleArrayItem(mDoubleArrayScalePtr, 2)
-	lScale = [fScaleX, fScaleY, fScaleZ]
-
-	return [lTranslate, lRotate, lScale]
+	'''
+	return [lTranslate, lRotate, lScale], rotation in radians
+	'''
+	return decomposeMatrix(convertMMatrixToList(mMatrix), iRotateOrder = iRotateOrder)
 
 def decomposeMatrix(lMatrix, iRotateOrder = 0):
-	mMatrix = OpenMaya.MMatrix()
-	OpenMaya.MScriptUtil.createMatrixFromList(lMatrix, mMatrix)
-	lTransformInfo = decomposeMMatrix(mMatrix, iRotateOrder = iRotateOrder)
-	return lTransformInfo
-
-
+	'''
+	return [lTranslate, lRotate, lScale], rotation in radians, matrixMath.decomposeMatrix returns degrees
+	'''
+	lTranslate, lRotate, lScale = matrixMath.decomposeMatrix(lMatrix, iRotateOrder = iRotateOrder)
+	return [lTranslate, convertRotationToRadians(lRotate), lScale]
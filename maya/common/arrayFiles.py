@@ -0,0 +1,139 @@
+## External Import
+import os
+import sys
+import json
+import struct
+import array
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+## Vars
+sMagic = 'EBARRAY\x00'
+iFormatVersion = 1
+iAlignment = 64
+sByteOrder = '<'
+dArrayTypes = {
+				'f4': 'f',
+				'f8': 'd',
+				'i4': 'i',
+				'u4': 'I',
+				'u1': 'B',
+			}
+
+#### Functions
+def isArrayFile(sPath):
+	'''
+	check if the file is written by writeArrayFile by reading the magic bytes
+	'''
+	if not os.path.isfile(sPath):
+		return False
+	with open(sPath, 'rb') as oFile:
+		sHead = oFile.read(len(sMagic))
+	return sHead == sMagic.encode('ascii')
+
+def writeArrayFile(sPath, dMeta, lArrays):
+	'''
+	write a versioned binary container
+
+	layout: magic, uint32 header size, json header, arrays
+	each array is a contiguous little endian block aligned to 64 bytes,
+	so it can be memory mapped without copying
+
+	dMeta: json serializable dict, saved in the header
+	lArrays: [(sName, sDtype, lShape, data), ...]
+			 sDtype is one of dArrayTypes' keys,
+			 data can be a numpy array, array.array or a flat list
+	'''
+	dArrayInfo = {}
+	lBlocks = []
+	iOffset = 0
+	for sName, sDtype, lShape, data in lArrays:
+		iCount = 1
+		for iDim in lShape:
+			iCount *= iDim
+		oBlock = __convertToBlock(data, sDtype)
+		if len(oBlock) != iCount:
+			raise RuntimeError('%s has %d elements, shape %s needs %d' %(sName, len(oBlock), lShape, iCount))
+		iOffset = __align(iOffset)
+		dArrayInfo[sName] = {'sDtype': sDtype, 'lShape': list(lShape), 'iOffset': iOffset}
+		lBlocks.append((iOffset, oBlock))
+		iOffset += iCount * struct.calcsize(sByteOrder + dArrayTypes[sDtype])
+
+	dHeader = {'iVersion': iFormatVersion, 'dMeta': dMeta, 'dArrays': dArrayInfo}
+	sHeader = json.dumps(dHeader).encode('utf-8')
+	iDataStart = __align(len(sMagic) + 4 + len(sHeader))
+	sHeader += b' ' * (iDataStart - len(sMagic) - 4 - len(sHeader))
+
+	with open(sPath, 'wb') as oFile:
+		oFile.write(sMagic.encode('ascii'))
+		oFile.write(struct.pack(sByteOrder + 'I', len(sHeader)))
+		oFile.write(sHeader)
+		for iOffsetBlock, oBlock in lBlocks:
+			iPad = iDataStart + iOffsetBlock - oFile.tell()
+			if iPad:
+				oFile.write(b'\x00' * iPad)
+			oBlock.tofile(oFile)
+
+def readArrayFile(sPath, bMmap = True):
+	'''
+	read the file written by writeArrayFile
+
+	return dMeta, dArrays
+	dArrays values are flat arrays, the shapes are stored in dMeta['dShapes']
+	if numpy is available and bMmap is True, the arrays are read-only numpy.memmap
+	views on the file, otherwise they are loaded into array.array
+	'''
+	dHeader, iDataStart = readArrayFileHeader(sPath)
+	if dHeader['iVersion'] > iFormatVersion:
+		raise RuntimeError('%s is version %d, only support up to version %d' %(sPath, dHeader['iVersion'], iFormatVersion))
+
+	dMeta = dHeader['dMeta']
+	dMeta['dShapes'] = {}
+	dArrays = {}
+	with open(sPath, 'rb') as oFile:
+		for sName, dInfo in dHeader['dArrays'].items():
+			iCount = 1
+			for iDim in dInfo['lShape']:
+				iCount *= iDim
+			iOffset = iDataStart + dInfo['iOffset']
+			dMeta['dShapes'][sName] = dInfo['lShape']
+			if numpy is not None and bMmap and iCount:
+				dArrays[sName] = numpy.memmap(sPath, dtype = sByteOrder + dInfo['sDtype'], mode = 'r', offset = iOffset, shape = (iCount,))
+			else:
+				oFile.seek(iOffset)
+				oBlock = array.array(dArrayTypes[dInfo['sDtype']])
+				oBlock.fromfile(oFile, iCount)
+				if sys.byteorder != 'little':
+					oBlock.byteswap()
+				dArrays[sName] = oBlock
+	return dMeta, dArrays
+
+def readArrayFileHeader(sPath):
+	'''
+	read the json header only, return dHeader and the data start offset
+	'''
+	with open(sPath, 'rb') as oFile:
+		sHead = oFile.read(len(sMagic))
+		if sHead != sMagic.encode('ascii'):
+			raise RuntimeError('%s is not an array file' %sPath)
+		iHeader = struct.unpack(sByteOrder + 'I', oFile.read(4))[0]
+		dHeader = json.loads(oFile.read(iHeader).decode('utf-8'))
+	iDataStart = len(sMagic) + 4 + iHeader
+	return dHeader, iDataStart
+
+#### Sub Functions
+def __align(iOffset):
+	return (iOffset + iAlignment - 1) // iAlignment * iAlignment
+
+def __convertToBlock(data, sDtype):
+	if numpy is not None and isinstance(data, numpy.ndarray):
+		return numpy.ascontiguousarray(data, dtype = sByteOrder + sDtype).ravel()
+	if isinstance(data, array.array) and data.typecode == dArrayTypes[sDtype]:
+		oBlock = array.array(data.typecode, data)
+	else:
+		oBlock = array.array(dArrayTypes[sDtype], data)
+	if sys.byteorder != 'little':
+		oBlock.byteswap()
+	return oBlock
@@ -0,0 +1,275 @@
+## External Import
+import os
+import sqlite3
+import time
+
+## libs Import
+import files
+
+## Vars
+sCatalogName = 'assets.catalog'
+lCatalogSchema = [
+	'CREATE TABLE IF NOT EXISTS projects (sProject TEXT PRIMARY KEY)',
+	'CREATE TABLE IF NOT EXISTS assets (sProject TEXT, sAsset TEXT, PRIMARY KEY (sProject, sAsset))',
+	'''CREATE TABLE IF NOT EXISTS types (sProject TEXT, sAsset TEXT, sType TEXT,
+		sCurrentVersionName TEXT, sFileType TEXT, iLatestVersion INTEGER, sPath TEXT,
+		PRIMARY KEY (sProject, sAsset, sType))''',
+	'''CREATE TABLE IF NOT EXISTS versions (sProject TEXT, sAsset TEXT, sType TEXT, iVersion INTEGER,
+		sVersionName TEXT, sComment TEXT, sFileType TEXT, sPath TEXT,
+		PRIMARY KEY (sProject, sAsset, sType, iVersion))''',
+	'CREATE INDEX IF NOT EXISTS typesByType ON types (sProject, sType)',
+	'CREATE TABLE IF NOT EXISTS meta (sKey TEXT PRIMARY KEY, sValue TEXT)',
+]
+sCompleteKey = 'bComplete'
+
+#### Functions
+## the catalog mirrors folders.folderList and assetInfo.version files under a root path (local or server),
+## paths are saved relative to the root
+def getCatalogPath(sRoot = None):
+	if not sRoot:
+		sRoot = files.sPathLocal
+	return os.path.join(sRoot, sCatalogName)
+
+def connectCatalog(sRoot = None):
+	'''
+	open the catalog, create the tables if not exist
+	'''
+	oConnection = sqlite3.connect(getCatalogPath(sRoot = sRoot), timeout = 30)
+	oConnection.row_factory = sqlite3.Row
+	for sCmd in lCatalogSchema:
+		oConnection.execute(sCmd)
+	return oConnection
+
+def hasCatalog(sRoot = None):
+	'''
+	the catalog is only trusted after a full rebuild,
+	the incremental updates create the file with partial rows
+	'''
+	sCatalogPath = getCatalogPath(sRoot = sRoot)
+	if not os.path.isfile(sCatalogPath):
+		return False
+	oConnection = sqlite3.connect(sCatalogPath, timeout = 30)
+	try:
+		oRow = oConnection.execute('SELECT sValue FROM meta WHERE sKey = ?', (sCompleteKey,)).fetchone()
+	except sqlite3.OperationalError:
+		oRow = None
+	oConnection.close()
+	return bool(oRow)
+
+def ensureCatalog(sRoot = None):
+	'''
+	rebuild the catalog if it is missing or was never completed,
+	return False if the catalog can not be used, the callers walk the folders then
+	'''
+	if not sRoot:
+		sRoot = files.sPathLocal
+	if not os.path.isdir(sRoot):
+		return False
+	try:
+		if not hasCatalog(sRoot = sRoot):
+			rebuildCatalog(sRoot = sRoot)
+	except (sqlite3.Error, IOError, OSError) as oError:
+		print 'asset catalog at %s is not available, %s' %(sRoot, oError)
+		return False
+	return True
+
+#------------ incremental update functions -----------
+def addProject(sProject, sRoot = None):
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		oConnection.execute('INSERT OR IGNORE INTO projects VALUES (?)', (sProject,))
+	oConnection.close()
+
+def addAsset(sProject, sAsset, sRoot = None):
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		oConnection.execute('INSERT OR IGNORE INTO projects VALUES (?)', (sProject,))
+		oConnection.execute('INSERT OR IGNORE INTO assets VALUES (?, ?)', (sProject, sAsset))
+	oConnection.close()
+
+def updateAssetType(sProject, sAsset, sType, dAssetInfo = None, sRoot = None):
+	'''
+	write the type and all its versions, read from the assetInfo.version file if dAssetInfo is not given
+	'''
+	if not sRoot:
+		sRoot = files.sPathLocal
+	sPathType = os.path.join(sProject, 'assets', sAsset, sType)
+	if dAssetInfo is None:
+		sVersionFile = os.path.join(sRoot, sPathType, 'assetInfo.version')
+		if not os.path.isfile(sVersionFile):
+			return
+		dAssetInfo = files.readJsonFile(sVersionFile)
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		__writeAssetType(oConnection, sProject, sAsset, sType, sPathType, dAssetInfo)
+	oConnection.close()
+
+def renameProject(sProject, sName, sRoot = None):
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		oConnection.execute('UPDATE projects SET sProject = ? WHERE sProject = ?', (sName, sProject))
+		oConnection.execute('UPDATE assets SET sProject = ? WHERE sProject = ?', (sName, sProject))
+		for sTable in ['types', 'versions']:
+			for oRow in oConnection.execute('SELECT rowid, sPath FROM %s WHERE sProject = ?' %sTable, (sProject,)).fetchall():
+				sPath = __replacePathFolder(oRow['sPath'], 0, sProject, sName)
+				oConnection.execute('UPDATE %s SET sProject = ?, sPath = ? WHERE rowid = ?' %sTable, (sName, sPath, oRow['rowid']))
+	oConnection.close()
+
+def renameAsset(sProject, sAsset, sName, sRoot = None):
+	'''
+	rename the asset, version names have the asset name replaced same as workspaces.renameAsset
+	'''
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		oConnection.execute('UPDATE assets SET sAsset = ? WHERE sProject = ? AND sAsset = ?', (sName, sProject, sAsset))
+		for oRow in oConnection.execute('SELECT rowid, sPath, sCurrentVersionName FROM types WHERE sProject = ? AND sAsset = ?', (sProject, sAsset)).fetchall():
+			sPath = __replacePathFolder(oRow['sPath'], 2, sAsset, sName)
+			sCurrentVersionName = oRow['sCurrentVersionName']
+			if sCurrentVersionName:
+				sCurrentVersionName = sCurrentVersionName.replace(sAsset, sName)
+			oConnection.execute('UPDATE types SET sAsset = ?, sPath = ?, sCurrentVersionName = ? WHERE rowid = ?', (sName, sPath, sCurrentVersionName, oRow['rowid']))
+		for oRow in oConnection.execute('SELECT rowid, sPath, sVersionName FROM versions WHERE sProject = ? AND sAsset = ?', (sProject, sAsset)).fetchall():
+			sPath = __replacePathFolder(oRow['sPath'], 2, sAsset, sName)
+			sPath = os.path.join(os.path.dirname(sPath), os.path.basename(sPath).replace(sAsset, sName))
+			oConnection.execute('UPDATE versions SET sAsset = ?, sPath = ?, sVersionName = ? WHERE rowid = ?', (sName, sPath, oRow['sVersionName'].replace(sAsset, sName), oRow['rowid']))
+	oConnection.close()
+
+def removeFolder(sPath, sRoot = None):
+	'''
+	remove the project, asset or asset type at the path and everything under it
+	'''
+	if not sRoot:
+		sRoot = files.sPathLocal
+	lFolders = os.path.relpath(os.path.abspath(sPath), os.path.abspath(sRoot)).replace('\\', '/').split('/')
+	if len(lFolders) == 1:
+		lKeys = ['sProject']
+	elif len(lFolders) == 3:
+		lKeys = ['sProject', 'sAsset']
+	elif len(lFolders) == 4:
+		lKeys = ['sProject', 'sAsset', 'sType']
+	else:
+		return
+	lArgs = [lFolders[0]] + lFolders[2:]
+	sWhere = ' AND '.join(['%s = ?' %sKey for sKey in lKeys])
+	oConnection = connectCatalog(sRoot = sRoot)
+	with oConnection:
+		for sTable in ['versions', 'types', 'assets', 'projects']:
+			if sTable == 'projects' and len(lKeys) > 1 or sTable == 'assets' and len(lKeys) > 2:
+				continue
+			oConnection.execute('DELETE FROM %s WHERE %s' %(sTable, sWhere), lArgs)
+	oConnection.close()
+
+def rebuildCatalog(sRoot = None):
+	'''
+	drop the catalog and rebuild it from the folder lists and version files on disk
+	'''
+	fStartTime = time.time()
+	if not sRoot:
+		sRoot = files.sPathLocal
+	oConnection = connectCatalog(sRoot = sRoot)
+	iTypes = 0
+	with oConnection:
+		for sTable in ['meta', 'versions', 'types', 'assets', 'projects']:
+			oConnection.execute('DELETE FROM %s' %sTable)
+		for sProject in __getFolders(sRoot):
+			oConnection.execute('INSERT OR IGNORE INTO projects VALUES (?)', (sProject,))
+			sPathAssets = os.path.join(sRoot, sProject, 'assets')
+			for sAsset in __getFolders(sPathAssets):
+				oConnection.execute('INSERT OR IGNORE INTO assets VALUES (?, ?)', (sProject, sAsset))
+				for sType in __getFolders(os.path.join(sPathAssets, sAsset)):
+					sPathType = os.path.join(sProject, 'assets', sAsset, sType)
+					sVersionFile = os.path.join(sRoot, sPathType, 'assetInfo.version')
+					if os.path.isfile(sVersionFile):
+						__writeAssetType(oConnection, sProject, sAsset, sType, sPathType, files.readJsonFile(sVersionFile))
+						iTypes += 1
+		oConnection.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (sCompleteKey, '1'))
+	oConnection.close()
+	fEndTime = time.time()
+	print 'rebuilt asset catalog at %s, %d asset types, took %f seconds' %(sRoot, iTypes, fEndTime - fStartTime)
+#------------ incremental update functions end -----------
+
+#------------ query functions -----------
+def getProjects(sRoot = None):
+	return [oRow['sProject'] for oRow in __query('SELECT sProject FROM projects ORDER BY sProject', (), sRoot = sRoot)]
+
+def getAssets(sProject, sRoot = None):
+	return [oRow['sAsset'] for oRow in __query('SELECT sAsset FROM assets WHERE sProject = ? ORDER BY sAsset', (sProject,), sRoot = sRoot)]
+
+def getAssetTypes(sProject, sAsset = None, sType = None, sRoot = None):
+	'''
+	return a list of dicts, one per asset type, with the latest version and the version file path
+	'''
+	sCmd = 'SELECT * FROM types WHERE sProject = ?'
+	lArgs = [sProject]
+	for sKey, sValue in [('sAsset', sAsset), ('sType', sType)]:
+		if sValue:
+			sCmd += ' AND %s = ?' %sKey
+			lArgs.append(sValue)
+	return [dict(oRow) for oRow in __query(sCmd + ' ORDER BY sAsset, sType', lArgs, sRoot = sRoot)]
+
+def getLatestVersions(sProject, sType, sRoot = None):
+	'''
+	latest version of every asset of the type in the project, as {sAsset: dVersion}
+	'''
+	sCmd = '''SELECT versions.* FROM types JOIN versions USING (sProject, sAsset, sType)
+				WHERE types.sProject = ? AND types.sType = ? AND versions.iVersion = types.iLatestVersion'''
+	dReturn = {}
+	for oRow in __query(sCmd, (sProject, sType), sRoot = sRoot):
+		dReturn[oRow['sAsset']] = dict(oRow)
+	return dReturn
+
+def getVersions(sProject, sAsset, sType, sRoot = None):
+	sCmd = 'SELECT * FROM versions WHERE sProject = ? AND sAsset = ? AND sType = ? ORDER BY iVersion'
+	return [dict(oRow) for oRow in __query(sCmd, (sProject, sAsset, sType), sRoot = sRoot)]
+
+def getFolders(sPath, sRoot = None):
+	'''
+	the folders under the root, a project's assets folder or an asset, same as their folder list files,
+	None for other paths
+	'''
+	if not sRoot:
+		sRoot = files.sPathLocal
+	sRelPath = os.path.relpath(os.path.abspath(sPath), os.path.abspath(sRoot)).replace('\\', '/')
+	if sRelPath == '.':
+		return getProjects(sRoot = sRoot)
+	lFolders = sRelPath.split('/')
+	if len(lFolders) == 2 and lFolders[1] == 'assets':
+		return getAssets(lFolders[0], sRoot = sRoot)
+	if len(lFolders) == 3 and lFolders[1] == 'assets':
+		return [dType['sType'] for dType in getAssetTypes(lFolders[0], sAsset = lFolders[2], sRoot = sRoot)]
+	return None
+#------------ query functions end -----------
+
+#### Sub Functions
+def __query(sCmd, lArgs, sRoot = None):
+	oConnection = connectCatalog(sRoot = sRoot)
+	lRows = oConnection.execute(sCmd, lArgs).fetchall()
+	oConnection.close()
+	return lRows
+
+def __writeAssetType(oConnection, sProject, sAsset, sType, sPathType, dAssetInfo):
+	dVersions = dAssetInfo['versionInfo']
+	lVersions = [int(sKey) for sKey in dVersions.keys()]
+	if lVersions:
+		iLatestVersion = max(lVersions)
+	else:
+		iLatestVersion = None
+	oConnection.execute('INSERT OR IGNORE INTO projects VALUES (?)', (sProject,))
+	oConnection.execute('INSERT OR IGNORE INTO assets VALUES (?, ?)', (sProject, sAsset))
+	oConnection.execute('INSERT OR REPLACE INTO types VALUES (?, ?, ?, ?, ?, ?, ?)', (sProject, sAsset, sType, dAssetInfo['assetInfo']['sCurrentVersionName'], dAssetInfo['assetInfo']['sFileType'], iLatestVersion, sPathType))
+	oConnection.execute('DELETE FROM versions WHERE sProject = ? AND sAsset = ? AND sType = ?', (sProject, sAsset, sType))
+	for sKey, dVersion in dVersions.items():
+		sPath = os.path.join(sPathType, 'wipFiles', '%s%s' %(dVersion['sVersionName'], dVersion['sFileType']))
+		oConnection.execute('INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (sProject, sAsset, sType, int(sKey), dVersion['sVersionName'], dVersion['sComment'], dVersion['sFileType'], sPath))
+
+def __getFolders(sPath):
+	sFolderListPath = os.path.join(sPath, files.sFolderListName)
+	if os.path.isfile(sFolderListPath):
+		return files.readJsonFile(sFolderListPath)
+	return []
+
+def __replacePathFolder(sPath, iIndex, sFolder, sName):
+	lFolders = sPath.replace('\\', '/').split('/')
+	if len(lFolders) > iIndex and lFolders[iIndex] == sFolder:
+		lFolders[iIndex] = sName
+	return os.path.join(*lFolders)
@@ -1,14 +1,116 @@
 ## External Import
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.OpenMaya as OpenMaya
 import os
 import json
 import time
 
 ## lib import
 import namingAPI.naming as naming
+import namingAPI.nameRegistry as nameRegistry
+
+## vars
+## named attribute states, the listed attributes are locked and hidden
+dAttrProfiles = {
+					'lockedGroup': ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'],
+					'lockedGroupVisible': ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'],
+					'translateRotateCtrl': ['sx', 'sy', 'sz', 'v'],
+					'translateCtrl': ['rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'],
+					'rotateCtrl': ['tx', 'ty', 'tz', 'sx', 'sy', 'sz', 'v'],
+				}
+dCompiledProfiles = {}
+## each profile plug replaces one cmds.setAttr(keyable, lock, channelBox) call
+dProfileStats = {'iNodes': 0, 'iSetAttrsAvoided': 0}
+## enum switch node counts, the condition chains would have made iNodesLegacy nodes
+dSwitchStats = {'iNodesLegacy': 0, 'iNodesCreated': 0, 'iSwitchesShared': 0}
+lColorChannels = ['R', 'G', 'B']
+## choice nodes keep their constant inputs on this multi attribute
+sSwitchValuesAttr = 'switchValues'
+
+class oAttrProfile(object):
+	'''
+	a compiled attribute profile, the attribute MObjects are looked up once per node type
+	'''
+	def __init__(self, sName, lAttrs):
+		super(oAttrProfile, self).__init__()
+		self.sName = sName
+		self.tAttrs = tuple(lAttrs)
+		self.dAttrObjs = {}
+
+	def getAttrObjs(self, mFnNode):
+		sType = mFnNode.typeName()
+		lAttrObjs = self.dAttrObjs.get(sType, None)
+		if lAttrObjs is None:
+			lAttrObjs = []
+			for sAttr in self.tAttrs:
+				if not mFnNode.hasAttribute(sAttr):
+					raise RuntimeError('attribute profile %s: %s has no attribute %s' %(self.sName, mFnNode.name(), sAttr))
+				lAttrObjs.append(mFnNode.attribute(sAttr))
+			## dynamic attributes belong to the node, only static ones are shared by the type
+			if all([not OpenMaya.MFnAttribute(mAttr).isDynamic() for mAttr in lAttrObjs]):
+				self.dAttrObjs[sType] = lAttrObjs
+		return lAttrObjs
 
 ## functions
+def getAttrProfile(profile):
+	'''
+	return the compiled oAttrProfile, cached
+	profile: a profile name in dAttrProfiles, a list of attributes or a compiled oAttrProfile
+	'''
+	if isinstance(profile, oAttrProfile):
+		return profile
+	if isinstance(profile, basestring):
+		if profile not in dAttrProfiles:
+			raise RuntimeError('%s is not an attribute profile, profiles are %s' %(profile, ', '.join(sorted(dAttrProfiles.keys()))))
+		key = profile
+		lAttrs = dAttrProfiles[profile]
+	else:
+		key = tuple(profile)
+		lAttrs = profile
+	oProfile = dCompiledProfiles.get(key, None)
+	if oProfile is None:
+		oProfile = oAttrProfile(str(key), lAttrs)
+		dCompiledProfiles[key] = oProfile
+	return oProfile
+
+def applyAttrProfile(lNodes, profile):
+	'''
+	lock and hide the profile attributes on all the nodes in one api pass,
+	the plug states are set by the api and are not on maya's undo queue, used by the builds,
+	lockHideAttrs keeps the undoable cmds path for single calls
+	return the locked plugs
+
+	lNodes: node names or MObjects
+	'''
+	oProfile = getAttrProfile(profile)
+	lPlugs = []
+	if not lNodes or not oProfile.tAttrs:
+		return lPlugs
+	mSel = OpenMaya.MSelectionList()
+	for node in lNodes:
+		mSel.add(node)
+	for i in range(mSel.length()):
+		mObj = OpenMaya.MObject()
+		mSel.getDependNode(i, mObj)
+		mFnNode = OpenMaya.MFnDependencyNode(mObj)
+		for mAttr in oProfile.getAttrObjs(mFnNode):
+			mPlug = OpenMaya.MPlug(mObj, mAttr)
+			mPlug.setKeyable(False)
+			mPlug.setChannelBox(False)
+			mPlug.setLocked(True)
+			lPlugs.append(mPlug)
+	dProfileStats['iNodes'] += mSel.length()
+	dProfileStats['iSetAttrsAvoided'] += mSel.length() * len(oProfile.tAttrs)
+	return lPlugs
+
+def getAttrProfileStats():
+	return dict(dProfileStats)
+
+def resetAttrProfileStats():
+	for sKey in dProfileStats.keys():
+		dProfileStats[sKey] = 0
+
 def lockHideAttrs(lAttrs, sNode = None):
 	for sAttr in lAttrs:
 		if '.' not in sAttr:
@@ -61,50 +163,193 @@ def connectAttrs(lDriverAttrs, lDrivenAttrs, sDriver = None, sDriven = None, bFo
 				cmds.connectAttr(sDriverAttr, sDrivenAttr, f = True)
 				cmds.setAttr(sDrivenAttr, lock = True)
 
-def enumToSingleAttrs(sEnumAttr, lAttrs, iEnumRange = 2, lValRange = [[0,1]], sEnumObj = None):
-	if '.' not in sEnumAttr:
-		sEnumAttrName = sEnumAttr
-		sEnumAttr = '%s.%s' %(sEnumObj, sEnumAttr)
-	else:
-		sEnumObj = sEnumAttr.split('.')[0]
-		sEnumAttrName = sEnumAttr.split('.')[1]
+def connectAttrsBatch(lEdges, bDryRun = False):
+	'''
+	connect all the edges, [(sDriverAttr, sDrivenAttr, bForce), ...], with the connectAttrs rules,
+	the driven plugs are read in one api pass, the disconnects and connects are done by one modifier,
+	the modifier is not on maya's undo queue, used by the builds, connectAttrs keeps the undoable cmds path for single calls
 
-	oObjName = naming.oName(sEnumObj)
-	sSide = oObjName.sSide
-	if not sSide:
-		sSide = 'middle'
-	iIndex = oObjName.iIndex
+	bDryRun: only return the plan diff, nothing is changed
+	'''
+	lPlan = planConnections(lEdges)
+	if bDryRun:
+		return getConnectionPlanDiff(lPlan)
+	applyConnectionPlan(lPlan)
+	return lPlan
 
-	sConditionMain = None
-	sConditionSave = None
-	for i in range(iEnumRange):
-		if iIndex:
-			sCondition = naming.oName(sType = 'condition', sSide = sSide, sPart = '%s%s' %(sEnumObj, sEnumAttrName.title()), iIndex = iIndex, iSuffix = i).sName
+def planConnections(lEdges):
+	'''
+	return a dict per edge, sDriver, sDriven, sSource (the current source, or None), bLock and sAction,
+	sAction is 'connect', 'reconnect', 'keep' when the driver already drives the plug, or 'skip' when bForce is off
+	an edge sees the plan of the edges before it on the same driven plug
+	'''
+	lPlan = []
+	dPlanned = {}
+	dPlugs = {}
+	for sDriverAttr, sDrivenAttr, bForce in lEdges:
+		mPlugDriver = __getPlug(sDriverAttr, dPlugs)
+		mPlugDriven = __getPlug(sDrivenAttr, dPlugs)
+		sKey = mPlugDriven.name()
+		if sKey in dPlanned:
+			mPlugSource, bLock = dPlanned[sKey]
 		else:
-			sCondition = naming.oName(sType = 'condition', sSide = sSide, sPart = '%s%s' %(sEnumObj, sEnumAttrName.title()), iIndex = i).sName
-		cmds.createNode('condition', name = sCondition)
-		cmds.connectAttr(sEnumAttr, '%s.firstTerm' %sCondition)
-		cmds.setAttr('%s.secondTerm' %sCondition, i)
-		if len(lValRange) == iEnumRange:
-			lValTrue = lValRange[i][1]
-			lValFalse = lValRange[i][0]
+			mPlugSource = __getSourcePlug(mPlugDriven)
+			bLock = mPlugDriven.isLocked()
+		## like listConnections(skipConversionNodes = True), the driver behind a unit conversion is the source
+		mPlugSourceDriver = mPlugSource
+		if mPlugSource is not None and mPlugSource.node().hasFn(OpenMaya.MFn.kUnitConversion):
+			mPlugSourceDriver = __getSourcePlug(OpenMaya.MFnDependencyNode(mPlugSource.node()).findPlug('input', False)) or mPlugSource
+		sSource = None
+		if mPlugSourceDriver is not None:
+			sSource = mPlugSourceDriver.name()
+		if mPlugSourceDriver is not None and mPlugSourceDriver == mPlugDriver:
+			sAction = 'keep'
+		elif (mPlugSource is not None or bLock) and not bForce:
+			sAction = 'skip'
+		elif mPlugSource is not None:
+			sAction = 'reconnect'
 		else:
-			lValTrue = lValRange[0][1]
-			lValFalse = lValRange[0][0]
-		cmds.setAttr('%s.colorIfTrueR' %sCondition, lValTrue)
-		cmds.setAttr('%s.colorIfFalseR' %sCondition, lValFalse)
-		
-		if i == 0:
-			sConditionMain = sCondition
-
-		if sConditionSave:
-			cmds.connectAttr('%s.outColorR' %sCondition, '%s.colorIfFalseR' %sConditionSave)
-		sConditionSave = sCondition
+			sAction = 'connect'
+		lPlan.append({'sDriver': sDriverAttr,
+					  'sDriven': sDrivenAttr,
+					  'sSource': sSource,
+					  'bLock': bLock,
+					  'sAction': sAction,
+					  'mPlugDriver': mPlugDriver,
+					  'mPlugDriven': mPlugDriven,
+					  'mPlugSource': mPlugSource})
+		if sAction in ['connect', 'reconnect']:
+			dPlanned[sKey] = (mPlugDriver, bLock)
+	return lPlan
 
-	for sAttr in lAttrs:
-		connectAttrs(['%s.outColorR' %sConditionMain], [sAttr], bForce = True)
+def applyConnectionPlan(lPlan):
+	'''
+	unlock the locked driven plugs, disconnect and connect with one modifier, then lock them back,
+	not undoable, same as connectAttrsBatch
+	'''
+	mDgMod = OpenMaya.MDGModifier()
+	lPlugsLocked = []
+	dConnected = {}
+	for dEdge in lPlan:
+		if dEdge['sAction'] == 'skip':
+			if dEdge['sSource']:
+				cmds.warning('%s already has connection from %s, skipped' %(dEdge['sDriven'], dEdge['sSource']))
+			else:
+				cmds.warning('%s is locked, skipped' %dEdge['sDriven'])
+			continue
+		if dEdge['sAction'] == 'keep':
+			continue
+		mPlugDriven = dEdge['mPlugDriven']
+		sKey = mPlugDriven.name()
+		if dEdge['bLock'] and mPlugDriven.isLocked():
+			mPlugDriven.setLocked(False)
+			lPlugsLocked.append(mPlugDriven)
+		## the scene source is disconnected once, later edges on the plug replace the connection made in this plan
+		if dEdge['sAction'] == 'reconnect' and sKey not in dConnected and dEdge['mPlugSource'] is not None:
+			mDgMod.disconnect(dEdge['mPlugSource'], mPlugDriven)
+		elif sKey in dConnected:
+			mDgMod.disconnect(dConnected[sKey], mPlugDriven)
+		mDgMod.connect(dEdge['mPlugDriver'], mPlugDriven)
+		dConnected[sKey] = dEdge['mPlugDriver']
+	mDgMod.doIt()
+	for mPlug in lPlugsLocked:
+		mPlug.setLocked(True)
+
+def getConnectionPlanDiff(lPlan):
+	'''
+	return the plan as lines, '- source -> driven' for disconnects, '+ driver -> driven' for connects,
+	'~ driven' for plugs unlocked and locked back, '! driven' for skipped edges
+	'''
+	lDiff = []
+	for dEdge in lPlan:
+		if dEdge['sAction'] == 'skip':
+			lDiff.append('! %s skipped, %s' %(dEdge['sDriven'], ['locked', 'connected from %s' %dEdge['sSource']][bool(dEdge['sSource'])]))
+		elif dEdge['sAction'] in ['connect', 'reconnect']:
+			if dEdge['bLock']:
+				lDiff.append('~ %s' %dEdge['sDriven'])
+			if dEdge['sAction'] == 'reconnect':
+				lDiff.append('- %s -> %s' %(dEdge['sSource'], dEdge['sDriven']))
+			lDiff.append('+ %s -> %s' %(dEdge['sDriver'], dEdge['sDriven']))
+	return lDiff
+
+def enumToSingleAttrs(sEnumAttr, lAttrs, iEnumRange = 2, lValRange = [[0,1]], sEnumObj = None):
+	'''
+	drive the attributes with lValRange[i][1] when the enum is i,
+	two values share one condition channel, more values use one choice node,
+	switches already driven by the enum attribute are reused
+	'''
+	sEnumAttr, sSide, sPart, iIndex = __getEnumSwitchName(sEnumAttr, sEnumObj)
+	dSwitchNodes = __getSwitchNodes(sEnumAttr)
+	lValues = [__getValRange(lValRange, i, iEnumRange)[1] for i in range(iEnumRange)]
+	dSwitchStats['iNodesLegacy'] += iEnumRange
+
+	sOutput = None
+	for iOperation in [0, 1, 4, 3]:
+		for iValue in range(iEnumRange):
+			lSwitch = __getConditionValues(lValues, iOperation, iValue)
+			if lSwitch:
+				sOutput = __getConditionChannel(sEnumAttr, iOperation, iValue, lSwitch[0], lSwitch[1], dSwitchNodes, sSide, sPart, iIndex)
+				break
+		if sOutput:
+			break
+	if not sOutput:
+		sOutput = __getChoiceOutput(sEnumAttr, lValues, dSwitchNodes, sSide, sPart, iIndex)
+
+	connectAttrsBatch([(sOutput, sAttr, True) for sAttr in lAttrs])
 
 def enumToMultiAttrs(sEnumAttr, lAttrs, iEnumRange = 2, lEnumIndex = None, lValRange = [[0,1]], sEnumObj = None):
+	'''
+	drive each attribute with lValRange[i][1] when the enum is lEnumIndex[i], lValRange[i][0] otherwise,
+	switches on the same index share one condition node, up to three value pairs on its color channels
+	'''
+	sEnumAttr, sSide, sPart, iIndex = __getEnumSwitchName(sEnumAttr, sEnumObj)
+	dSwitchNodes = __getSwitchNodes(sEnumAttr)
+
+	if not lEnumIndex:
+		lEnumIndex = range(iEnumRange)
+	lEdges = []
+	for i, val in enumerate(lEnumIndex):
+		dSwitchStats['iNodesLegacy'] += 1
+		if not lAttrs[i]:
+			continue
+		fValFalse, fValTrue = __getValRange(lValRange, i, iEnumRange)
+		sOutput = __getConditionChannel(sEnumAttr, 0, val, fValTrue, fValFalse, dSwitchNodes, sSide, sPart, iIndex)
+		lEdges.append((sOutput, lAttrs[i], True))
+	connectAttrsBatch(lEdges)
+
+def getSwitchStats():
+	'''
+	return the switch node counts since the last reset, iNodesLegacy is what the condition chains would have created
+	'''
+	dStats = dict(dSwitchStats)
+	dStats['iNodesSaved'] = dStats['iNodesLegacy'] - dStats['iNodesCreated']
+	return dStats
+
+def resetSwitchStats():
+	for sKey in dSwitchStats.keys():
+		dSwitchStats[sKey] = 0
+
+## sub functions
+def __getPlug(sPlug, dPlugs):
+	'''
+	return the MPlug of the attribute path, cached in dPlugs
+	'''
+	mPlug = dPlugs.get(sPlug, None)
+	if mPlug is None:
+		mSel = OpenMaya.MSelectionList()
+		try:
+			mSel.add(sPlug)
+		except RuntimeError:
+			raise RuntimeError('%s does not exist' %sPlug)
+		mPlug = OpenMaya.MPlug()
+		mSel.getPlug(0, mPlug)
+		dPlugs[sPlug] = mPlug
+	return mPlug
+
+def __getEnumSwitchName(sEnumAttr, sEnumObj):
+	'''
+	return the enum plug, and the side, part and index of its switch nodes
+	'''
 	if '.' not in sEnumAttr:
 		sEnumAttrName = sEnumAttr
 		sEnumAttr = '%s.%s' %(sEnumObj, sEnumAttr)
@@ -116,23 +361,121 @@ def enumToMultiAttrs(sEnumAttr, lAttrs, iEnumRange = 2, lEnumIndex = None, lValR
 	sSide = oObjName.sSide
 	if not sSide:
 		sSide = 'middle'
-	iIndex = oObjName.iIndex
+	return sEnumAttr, sSide, '%s%s' %(sEnumObj, sEnumAttrName.title()), oObjName.iIndex
 
-	if not lEnumIndex:
-		lEnumIndex = range(iEnumRange)
-	for i, val in enumerate(lEnumIndex):
-		sCondition = naming.oName(sType = 'condition', sSide = sSide, sPart = '%s%s' %(sEnumObj, sEnumAttrName.title()), iIndex = iIndex, iSuffix = i).sName
-		cmds.createNode('condition', name = sCondition)
-		cmds.connectAttr(sEnumAttr, '%s.firstTerm' %sCondition)
-		cmds.setAttr('%s.secondTerm' %sCondition, val)
-		if len(lValRange) == iEnumRange:
-			lValTrue = lValRange[i][1]
-			lValFalse = lValRange[i][0]
-		else:
-			lValTrue = lValRange[0][1]
-			lValFalse = lValRange[0][0]
-		cmds.setAttr('%s.colorIfTrueR' %sCondition, lValTrue)
-		cmds.setAttr('%s.colorIfFalseR' %sCondition, lValFalse)
-		
-		if lAttrs[i]:
-			connectAttrs(['%s.outColorR' %sCondition], [lAttrs[i]], bForce = True)
+def __getValRange(lValRange, i, iEnumRange):
+	'''
+	return [fValFalse, fValTrue] of the enum index
+	'''
+	if len(lValRange) == iEnumRange:
+		return lValRange[i]
+	return lValRange[0]
+
+def __getConditionValues(lValues, iOperation, iValue):
+	'''
+	return [fTrue, fFalse] if one condition operation on iValue gives the enum values, None if it can not
+	'''
+	lTrue = []
+	lFalse = []
+	for i, fValue in enumerate(lValues):
+		bTrue = [i == iValue, i != iValue, i > iValue, i >= iValue, i < iValue, i <= iValue][iOperation]
+		[lFalse, lTrue][bTrue].append(fValue)
+	if len(set(lTrue)) > 1 or len(set(lFalse)) > 1:
+		return None
+	lValuesEach = lTrue + lFalse
+	return [(lTrue or lValuesEach)[0], (lFalse or lValuesEach)[0]]
+
+def __getSwitchNodes(sEnumAttr):
+	'''
+	return the conditions and choices already driven by the enum attribute,
+	{'dConditions': {(iOperation, fSecondTerm): [[sCondition, lChannels], ...]}, 'dChoices': {tValues: sChoice}}
+	a channel is (fTrue, fFalse) when it can be shared, None when it is free, False when its values are driven
+	'''
+	dSwitchNodes = {'dConditions': {}, 'dChoices': {}}
+	mPlugArray = OpenMaya.MPlugArray()
+	__getPlug(sEnumAttr, {}).connectedTo(mPlugArray, False, True)
+	for i in range(mPlugArray.length()):
+		mPlug = mPlugArray[i]
+		mFnNode = OpenMaya.MFnDependencyNode(mPlug.node())
+		if mFnNode.typeName() == 'condition' and mPlug.attribute() == mFnNode.attribute('firstTerm'):
+			if mFnNode.findPlug('secondTerm', False).isConnected():
+				continue
+			tKey = (mFnNode.findPlug('operation', False).asInt(), mFnNode.findPlug('secondTerm', False).asDouble())
+			bOutput = mFnNode.findPlug('outColor', False).isConnected()
+			lChannels = []
+			for sChannel in lColorChannels:
+				mPlugTrue = mFnNode.findPlug('colorIfTrue%s' %sChannel, False)
+				mPlugFalse = mFnNode.findPlug('colorIfFalse%s' %sChannel, False)
+				if mPlugTrue.isConnected() or mPlugFalse.isConnected():
+					lChannels.append(False)
+				elif bOutput or mFnNode.findPlug('outColor%s' %sChannel, False).isConnected():
+					lChannels.append((mPlugTrue.asDouble(), mPlugFalse.asDouble()))
+				else:
+					lChannels.append(None)
+			dSwitchNodes['dConditions'].setdefault(tKey, []).append([mFnNode.name(), lChannels])
+		elif mFnNode.typeName() == 'choice' and mPlug.attribute() == mFnNode.attribute('selector') and mFnNode.hasAttribute(sSwitchValuesAttr):
+			mPlugValues = mFnNode.findPlug(sSwitchValuesAttr, False)
+			tValues = tuple([mPlugValues.elementByPhysicalIndex(j).asDouble() for j in range(mPlugValues.numElements())])
+			dSwitchNodes['dChoices'][tValues] = mFnNode.name()
+	return dSwitchNodes
+
+def __getConditionChannel(sEnumAttr, iOperation, fSecondTerm, fTrue, fFalse, dSwitchNodes, sSide, sPart, iIndex):
+	'''
+	return the condition output giving fTrue or fFalse, a matching channel is shared, then a free channel is used,
+	then a new condition is created
+	'''
+	tValues = (float(fTrue), float(fFalse))
+	lConditions = dSwitchNodes['dConditions'].setdefault((iOperation, float(fSecondTerm)), [])
+	for sCondition, lChannels in lConditions:
+		for i, tChannel in enumerate(lChannels):
+			if tChannel == tValues:
+				dSwitchStats['iSwitchesShared'] += 1
+				return '%s.outColor%s' %(sCondition, lColorChannels[i])
+	for sCondition, lChannels in lConditions:
+		for i, tChannel in enumerate(lChannels):
+			if tChannel is None:
+				cmds.setAttr('%s.colorIfTrue%s' %(sCondition, lColorChannels[i]), tValues[0])
+				cmds.setAttr('%s.colorIfFalse%s' %(sCondition, lColorChannels[i]), tValues[1])
+				lChannels[i] = tValues
+				dSwitchStats['iSwitchesShared'] += 1
+				return '%s.outColor%s' %(sCondition, lColorChannels[i])
+
+	sCondition = cmds.createNode('condition', name = __getSwitchNodeName('condition', sSide, sPart, iIndex))
+	dSwitchStats['iNodesCreated'] += 1
+	cmds.connectAttr(sEnumAttr, '%s.firstTerm' %sCondition)
+	cmds.setAttr('%s.operation' %sCondition, iOperation)
+	cmds.setAttr('%s.secondTerm' %sCondition, fSecondTerm)
+	cmds.setAttr('%s.colorIfTrueR' %sCondition, tValues[0])
+	cmds.setAttr('%s.colorIfFalseR' %sCondition, tValues[1])
+	lConditions.append([sCondition, [tValues, None, None]])
+	return '%s.outColorR' %sCondition
+
+def __getChoiceOutput(sEnumAttr, lValues, dSwitchNodes, sSide, sPart, iIndex):
+	'''
+	return the output of a choice node picking the enum values, the values are kept on the choice node and connected to its inputs
+	'''
+	tValues = tuple([float(fValue) for fValue in lValues])
+	if tValues in dSwitchNodes['dChoices']:
+		dSwitchStats['iSwitchesShared'] += 1
+		return '%s.output' %dSwitchNodes['dChoices'][tValues]
+	sChoice = cmds.createNode('choice', name = __getSwitchNodeName('choice', sSide, sPart, iIndex))
+	dSwitchStats['iNodesCreated'] += 1
+	cmds.addAttr(sChoice, ln = sSwitchValuesAttr, at = 'double', multi = True)
+	for i, fValue in enumerate(tValues):
+		cmds.setAttr('%s.%s[%d]' %(sChoice, sSwitchValuesAttr, i), fValue)
+		cmds.connectAttr('%s.%s[%d]' %(sChoice, sSwitchValuesAttr, i), '%s.input[%d]' %(sChoice, i))
+	cmds.connectAttr(sEnumAttr, '%s.selector' %sChoice)
+	dSwitchNodes['dChoices'][tValues] = sChoice
+	return '%s.output' %sChoice
+
+def __getSwitchNodeName(sType, sSide, sPart, iIndex):
+	if iIndex:
+		return naming.oName(sType = sType, sSide = sSide, sPart = sPart, iIndex = iIndex, iSuffix = nameRegistry.getNextSuffix(sType = sType, sSide = sSide, sPart = sPart, iIndex = iIndex)).sName
+	return naming.oName(sType = sType, sSide = sSide, sPart = sPart, iIndex = nameRegistry.getNextIndex(sType = sType, sSide = sSide, sPart = sPart)).sName
+
+def __getSourcePlug(mPlug):
+	mPlugArray = OpenMaya.MPlugArray()
+	mPlug.connectedTo(mPlugArray, True, False)
+	if mPlugArray.length():
+		return mPlugArray[0]
+	return None
@@ -0,0 +1,155 @@
+## External Import
+import os
+import json
+import hashlib
+import shutil
+import time
+from multiprocessing.pool import ThreadPool
+
+## libs Import
+import files
+
+## Vars
+sManifestName = 'sync.manifest'
+sTempSuffix = '.syncTmp'
+## temp files from common.files, and lock files left in the folders before the locks moved to files.sPathLock
+lSkipSuffixes = [sTempSuffix, '.tmp', '.lock']
+iHashChunk = 1024 * 1024
+iThreads = 4
+
+#### Functions
+## a manifest is {sRelativePath: {'iSize': , 'fMTime': , 'sHash': }} of every file under a folder,
+## saved as sync.manifest in the folder
+
+def buildManifest(sPath, dManifestCache = None):
+	'''
+	scan the folder, file hashes are reused from dManifestCache when size and mtime are unchanged
+	'''
+	if dManifestCache is None:
+		dManifestCache = readManifest(sPath)
+	dManifest = {}
+	for sRoot, lDirs, lFiles in os.walk(sPath):
+		for sFile in lFiles:
+			if sFile == sManifestName or sFile.endswith(tuple(lSkipSuffixes)):
+				continue
+			sFilePath = os.path.join(sRoot, sFile)
+			sRelPath = os.path.relpath(sFilePath, sPath).replace('\\', '/')
+			oStat = os.stat(sFilePath)
+			dCache = dManifestCache.get(sRelPath, None)
+			if dCache and dCache['iSize'] == oStat.st_size and dCache['fMTime'] == oStat.st_mtime:
+				sHash = dCache['sHash']
+			else:
+				sHash = getFileHash(sFilePath)
+			dManifest[sRelPath] = {'iSize': oStat.st_size, 'fMTime': oStat.st_mtime, 'sHash': sHash}
+	return dManifest
+
+def readManifest(sPath):
+	sManifestPath = os.path.join(sPath, sManifestName)
+	if os.path.isfile(sManifestPath):
+		try:
+			with open(sManifestPath, 'r') as oFile:
+				return json.load(oFile)
+		except ValueError:
+			pass
+	return {}
+
+def writeManifest(sPath, dManifest):
+	sManifestPath = os.path.join(sPath, sManifestName)
+	with open(sManifestPath + sTempSuffix, 'w') as oFile:
+		json.dump(dManifest, oFile)
+	files.replaceFile(sManifestPath + sTempSuffix, sManifestPath)
+
+def updateManifest(sPath):
+	'''
+	rescan the folder and save its manifest
+	'''
+	dManifest = buildManifest(sPath)
+	writeManifest(sPath, dManifest)
+	return dManifest
+
+def diffManifests(dManifestSource, dManifestDest):
+	'''
+	return lCopy, lDelete
+	lCopy: files new or changed in the source
+	lDelete: files removed from the source
+	'''
+	lCopy = []
+	for sRelPath, dFile in dManifestSource.items():
+		dFileDest = dManifestDest.get(sRelPath, None)
+		if not dFileDest or dFileDest['iSize'] != dFile['iSize'] or dFileDest['sHash'] != dFile['sHash']:
+			lCopy.append(sRelPath)
+	lDelete = [sRelPath for sRelPath in dManifestDest.keys() if sRelPath not in dManifestSource]
+	lCopy.sort()
+	lDelete.sort()
+	return lCopy, lDelete
+
+def syncFolder(sPathSource, sPathDest, iThreadCount = iThreads, bDelete = True):
+	'''
+	make sPathDest match sPathSource, copy only new or changed files and delete the removed ones
+
+	files are copied to temp names on a thread pool, and renamed in place once all copies finished,
+	so an interrupted sync leaves only temp files behind, which are cleaned up by the next sync
+	'''
+	fStartTime = time.time()
+	if not os.path.exists(sPathDest):
+		os.makedirs(sPathDest)
+	__removeTempFiles(sPathDest)
+
+	dManifestSource = updateManifest(sPathSource)
+	dManifestDest = buildManifest(sPathDest)
+	lCopy, lDelete = diffManifests(dManifestSource, dManifestDest)
+
+	if lCopy:
+		oPool = ThreadPool(max(1, min(iThreadCount, len(lCopy))))
+		try:
+			oPool.map(lambda sRelPath: __copyToTemp(sPathSource, sPathDest, sRelPath), lCopy)
+		finally:
+			oPool.close()
+			oPool.join()
+		for sRelPath in lCopy:
+			sFileDest = os.path.join(sPathDest, sRelPath)
+			files.replaceFile(sFileDest + sTempSuffix, sFileDest)
+			dManifestDest[sRelPath] = dict(dManifestSource[sRelPath])
+			dManifestDest[sRelPath]['fMTime'] = os.stat(sFileDest).st_mtime
+
+	if bDelete:
+		for sRelPath in lDelete:
+			sFileDest = os.path.join(sPathDest, sRelPath)
+			if os.path.exists(sFileDest):
+				os.remove(sFileDest)
+			dManifestDest.pop(sRelPath, None)
+
+	writeManifest(sPathDest, dManifestDest)
+
+	fEndTime = time.time()
+	print 'synced %s to %s, copied %d files, deleted %d files, took %f seconds' %(sPathSource, sPathDest, len(lCopy), len(lDelete) * bDelete, fEndTime - fStartTime)
+	return lCopy, lDelete
+
+def getFileHash(sPath):
+	oHash = hashlib.md5()
+	with open(sPath, 'rb') as oFile:
+		while True:
+			sChunk = oFile.read(iHashChunk)
+			if not sChunk:
+				break
+			oHash.update(sChunk)
+	return oHash.hexdigest()
+
+#### Sub Functions
+def __copyToTemp(sPathSource, sPathDest, sRelPath):
+	sFileDest = os.path.join(sPathDest, sRelPath)
+	sDirDest = os.path.dirname(sFileDest)
+	if not os.path.exists(sDirDest):
+		try:
+			os.makedirs(sDirDest)
+		except OSError:
+			## another worker created it
+			if not os.path.isdir(sDirDest):
+				raise
+	shutil.copy2(os.path.join(sPathSource, sRelPath), sFileDest + sTempSuffix)
+
+def __removeTempFiles(sPath):
+	for sRoot, lDirs, lFiles in os.walk(sPath):
+		for sFile in lFiles:
+			if sFile.endswith(sTempSuffix):
+				os.remove(os.path.join(sRoot, sFile))
@@ -4,6 +4,9 @@ import json
 import os
 from shutil import rmtree
 import cPickle
+import threading
+import hashlib
+import tempfile
 ## Vars
 lAssetTypes = ['model', 'rig']
 import getpass
@@ -25,19 +28,71 @@ dRiggingComponents = {
 					}
 sBlueprintGrp = '_blueprint_'
 
+sTempSuffix = '.tmp'
+sLockSuffix = '.lock'
+## advisory lock files are kept in one folder outside the workspaces, the asset folders and the synced server never see them
+sPathLock = os.path.join(tempfile.gettempdir(), 'mayaFileLocks')
+## json read cache, {sPath: ((mtime, size, inode), data)}
+dJsonCache = {}
+dJsonCacheStats = {'iHit': 0, 'iMiss': 0}
+oJsonCacheLock = threading.Lock()
+
 #### Functions
 
 #------------ custom file functions -----------
 def writeJsonFile(sPath, data):
-	with open(sPath, 'w') as sOutfile:
-		json.dump(data, sOutfile)
-	file.close(sOutfile)
+	'''
+	write to a temp file and rename it over the file, under an advisory lock,
+	a crash mid-write leaves the old file untouched
+	'''
+	sPath = os.path.abspath(sPath)
+	with oFileLock(sPath):
+		sTempPath = sPath + sTempSuffix
+		with open(sTempPath, 'w') as sOutfile:
+			json.dump(data, sOutfile)
+			sOutfile.flush()
+			os.fsync(sOutfile.fileno())
+		replaceFile(sTempPath, sPath)
+	with oJsonCacheLock:
+		dJsonCache.pop(sPath, None)
 
-def readJsonFile(sPath):
+def readJsonFile(sPath, bCache = True):
+	'''
+	read json file, the parsed data is cached by path, mtime and size,
+	an unchanged file returns a copy of the cached data without parsing
+	'''
+	sPath = os.path.abspath(sPath)
+	if not bCache:
+		with open(sPath, 'r') as sInfile:
+			data = json.load(sInfile)
+		return data
+
+	oStat = os.stat(sPath)
+	## inode changes with every atomic write on posix
+	tKey = (oStat.st_mtime, oStat.st_size, oStat.st_ino)
+	with oJsonCacheLock:
+		tCache = dJsonCache.get(sPath, None)
+		if tCache and tCache[0] == tKey:
+			dJsonCacheStats['iHit'] += 1
+			return __copyJsonData(tCache[1])
+		dJsonCacheStats['iMiss'] += 1
 	with open(sPath, 'r') as sInfile:
 		data = json.load(sInfile)
-	file.close(sInfile)
-	return data
+	with oJsonCacheLock:
+		dJsonCache[sPath] = (tKey, data)
+	return __copyJsonData(data)
+
+def getJsonCacheStats():
+	with oJsonCacheLock:
+		dStats = dict(dJsonCacheStats)
+	dStats['iFiles'] = len(dJsonCache)
+	return dStats
+
+def clearJsonCache():
+	with oJsonCacheLock:
+		dJsonCache.clear()
+		dJsonCacheStats['iHit'] = 0
+		dJsonCacheStats['iMiss'] = 0
 
 def writePickleFile(sPath, data):
 	sOutfile = open(sPath, 'wb')
@@ -49,6 +104,91 @@ def readPickleFile(sPath):
 	data = cPickle.load(sInfile)
 	sInfile.close()
 	return data
+
+def replaceFile(sPath, sPathTarget):
+	'''
+	rename sPath to sPathTarget, overwrite sPathTarget atomically
+	'''
+	if os.name == 'nt':
+		import ctypes
+		## MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH
+		if not ctypes.windll.kernel32.MoveFileExW(unicode(sPath), unicode(sPathTarget), 0x1 | 0x8):
+			raise ctypes.WinError()
+	else:
+		os.rename(sPath, sPathTarget)
+
+def getLockPath(sPath):
+	'''
+	lock file of sPath in the lock folder, named by the hash of the normalized path
+	'''
+	sPath = os.path.normcase(os.path.abspath(sPath))
+	if isinstance(sPath, unicode):
+		sPath = sPath.encode('utf-8')
+	return os.path.join(sPathLock, hashlib.md5(sPath).hexdigest() + sLockSuffix)
+
+class oFileLock(object):
+	'''
+	advisory lock on the getLockPath file of sPath, shared between maya sessions on this machine
+	usage: with oFileLock(sPath): ...
+	or oLock.acquire(bBlocking = False) to test the lock, returns False if another session holds it
+	'''
+	def __init__(self, sPath):
+		super(oFileLock, self).__init__()
+		self.sLockPath = getLockPath(sPath)
+		self.oFile = None
+
+	def __enter__(self):
+		self.acquire()
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		self.release()
+		return False
+
+	def acquire(self, bBlocking = True):
+		if not os.path.exists(sPathLock):
+			try:
+				os.makedirs(sPathLock)
+			except OSError:
+				## another session created it
+				if not os.path.isdir(sPathLock):
+					raise
+		self.oFile = open(self.sLockPath, 'a+')
+		try:
+			if os.name == 'nt':
+				import msvcrt
+				self.oFile.seek(0)
+				## LK_LOCK retries for 10 seconds before raising
+				if bBlocking:
+					msvcrt.locking(self.oFile.fileno(), msvcrt.LK_LOCK, 1)
+				else:
+					msvcrt.locking(self.oFile.fileno(), msvcrt.LK_NBLCK, 1)
+			else:
+				import fcntl
+				if bBlocking:
+					fcntl.flock(self.oFile.fileno(), fcntl.LOCK_EX)
+				else:
+					fcntl.flock(self.oFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except IOError:
+			self.oFile.close()
+			self.oFile = None
+			if bBlocking:
+				raise
+			return False
+		return True
+
+	def release(self):
+		if not self.oFile:
+			return
+		if os.name == 'nt':
+			import msvcrt
+			self.oFile.seek(0)
+			msvcrt.locking(self.oFile.fileno(), msvcrt.LK_UNLCK, 1)
+		else:
+			import fcntl
+			fcntl.flock(self.oFile.fileno(), fcntl.LOCK_UN)
+		self.oFile.close()
+		self.oFile = None
 #------------ custom file functions End -----------
 
 #------------ folder & path functions -----------
@@ -144,3 +284,10 @@ def convertStringToCamelcase(sString):
 			sString += sPart[0].upper() + sPart[1:]
 	sString = sString[0].lower() + sString[1:]
 	return sString
+
+def __copyJsonData(data):
+	if isinstance(data, dict):
+		return dict([(key, __copyJsonData(value)) for key, value in data.iteritems()])
+	elif isinstance(data, list):
+		return [__copyJsonData(value) for value in data]
+	return data
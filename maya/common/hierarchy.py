@@ -1,6 +1,7 @@
 ## External Import
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.OpenMaya as OpenMaya
 import os
 import json
 import time
@@ -32,12 +33,73 @@ def saveNodesHierarchy(lNodes, sPath):
 
 def loadNodesHierarchy(sPath):
 	dHierarchy = files.readJsonFile(sPath)
+	setNodesHierarchy(dHierarchy)
+
+def setNodesHierarchy(dHierarchy):
+	'''
+	parent the nodes to their parents in {sNode: sParent}, missing nodes and parents are skipped,
+	one parent call per destination, parents are placed before their children
+	'''
+	for mParentHandle, lNodeHandles in getNodesHierarchyMoves(dHierarchy):
+		cmds.parent([__getFullPathName(mNodeHandle) for mNodeHandle in lNodeHandles], __getFullPathName(mParentHandle))
+
+def getNodesHierarchyMoves(dHierarchy):
+	'''
+	return [(mParentHandle, [mNodeHandle, ...]), ...] for the nodes not under their parent yet,
+	in topological order of the new hierarchy, the nodes are MObjectHandles so the moves survive renamed paths
+	'''
+	dObjs = {}
+	for sNode, sParent in dHierarchy.items():
+		for sName in [sNode, sParent]:
+			if sName and sName not in dObjs:
+				dObjs[sName] = __getDagNode(sName)
+
+	## depth of each node in the new hierarchy, nodes whose parent is not in the data are roots
+	dDepths = {}
 	for sNode in dHierarchy.keys():
-		if cmds.objExists(sNode):
-			sParent = dHierarchy[sNode]
-			if sParent:
-				if cmds.objExists(sParent):
-					sParentOrig = cmds.listRelatives(sNode, p = True)
-					if not sParentOrig or sParent not in sParentOrig:
-						cmds.parent(sNode, sParent)
-#------------ save & load hierarchy functions end -----------
\ No newline at end of file
+		lChain = []
+		sName = sNode
+		while sName in dHierarchy and sName not in dDepths and sName not in lChain:
+			lChain.append(sName)
+			sName = dHierarchy[sName]
+		iDepth = dDepths.get(sName, -1)
+		for sName in reversed(lChain):
+			iDepth += 1
+			dDepths[sName] = iDepth
+
+	dMoves = {}
+	for sNode, sParent in dHierarchy.items():
+		mObjNode = dObjs.get(sNode, None)
+		mObjParent = dObjs.get(sParent, None)
+		if mObjNode is None or mObjParent is None:
+			continue
+		mFnNode = OpenMaya.MFnDagNode(mObjNode)
+		if mFnNode.parentCount() and mFnNode.parent(0) == mObjParent:
+			continue
+		sKey = (dDepths[sNode], sParent)
+		if sKey not in dMoves:
+			dMoves[sKey] = (OpenMaya.MObjectHandle(mObjParent), [])
+		dMoves[sKey][1].append(OpenMaya.MObjectHandle(mObjNode))
+	return [dMoves[sKey] for sKey in sorted(dMoves.keys())]
+#------------ save & load hierarchy functions end -----------
+
+#### Sub Functions
+def __getDagNode(sNode):
+	'''
+	return the dag node MObject, None if the node does not exist or the name is not unique
+	'''
+	mSel = OpenMaya.MSelectionList()
+	try:
+		mSel.add(sNode)
+	except RuntimeError:
+		return None
+	if mSel.length() != 1:
+		return None
+	mObj = OpenMaya.MObject()
+	mSel.getDependNode(0, mObj)
+	if not mObj.hasFn(OpenMaya.MFn.kDagNode):
+		return None
+	return mObj
+
+def __getFullPathName(mObjHandle):
+	return OpenMaya.MFnDagNode(mObjHandle.object()).fullPathName()
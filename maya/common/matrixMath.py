@@ -0,0 +1,220 @@
+## External Import
+import math
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+## Vars
+## matrices are 16 floats, row major, points are row vectors multiplied on the left, translation is the last row, like maya
+## rotations are in degrees, the rotate order index is maya's rotateOrder enum, the first axis is applied first
+lRotateOrders = ['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx']
+lIdentity = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+fEpsilon = 1e-10
+
+#### Functions
+def composeMatrix(lTranslate = [0,0,0], lRotate = [0,0,0], lScale = [1,1,1], lShear = [0,0,0], iRotateOrder = 0):
+	'''
+	return scale * shear * rotate * translate, maya's transform matrix without pivots
+	lShear: xy, xz, yz
+	'''
+	lAxisMatrices = {}
+	for i, sAxis in enumerate('xyz'):
+		fRadians = math.radians(lRotate[i])
+		fCos = math.cos(fRadians)
+		fSin = math.sin(fRadians)
+		if sAxis == 'x':
+			lAxisMatrices[sAxis] = [[1.0, 0.0, 0.0], [0.0, fCos, fSin], [0.0, -fSin, fCos]]
+		elif sAxis == 'y':
+			lAxisMatrices[sAxis] = [[fCos, 0.0, -fSin], [0.0, 1.0, 0.0], [fSin, 0.0, fCos]]
+		else:
+			lAxisMatrices[sAxis] = [[fCos, fSin, 0.0], [-fSin, fCos, 0.0], [0.0, 0.0, 1.0]]
+	sOrder = lRotateOrders[iRotateOrder]
+	lRotate3 = __mult3(__mult3(lAxisMatrices[sOrder[0]], lAxisMatrices[sOrder[1]]), lAxisMatrices[sOrder[2]])
+	lScaleShear3 = [[lScale[0], 0.0, 0.0],
+					[lShear[0] * lScale[1], lScale[1], 0.0],
+					[lShear[1] * lScale[2], lShear[2] * lScale[2], lScale[2]]]
+	lMatrix3 = __mult3(lScaleShear3, lRotate3)
+	return [lMatrix3[0][0], lMatrix3[0][1], lMatrix3[0][2], 0.0,
+			lMatrix3[1][0], lMatrix3[1][1], lMatrix3[1][2], 0.0,
+			lMatrix3[2][0], lMatrix3[2][1], lMatrix3[2][2], 0.0,
+			float(lTranslate[0]), float(lTranslate[1]), float(lTranslate[2]), 1.0]
+
+def composeMatrices(lTranslates, lRotates = None, lScales = None, lShears = None, lRotateOrders = None):
+	'''
+	composeMatrix for N transforms, the optional lists default to zero rotation, unit scale, no shear, xyz order
+	'''
+	iCount = len(lTranslates)
+	lRotates = lRotates or [[0, 0, 0]] * iCount
+	lScales = lScales or [[1, 1, 1]] * iCount
+	lShears = lShears or [[0, 0, 0]] * iCount
+	lRotateOrders = lRotateOrders or [0] * iCount
+	return [composeMatrix(lTranslates[i], lRotates[i], lScales[i], lShears[i], lRotateOrders[i]) for i in range(iCount)]
+
+def decomposeMatrix(lMatrix, iRotateOrder = 0, bShear = False):
+	'''
+	return [lTranslate, lRotate, lScale], and lShear if bShear, rotation in degrees in the rotate order
+	a negative determinant is put on the x scale
+	'''
+	lRows = [[lMatrix[i * 4 + j] for j in range(3)] for i in range(3)]
+	fScaleX = __length(lRows[0])
+	lRow0 = __divide(lRows[0], fScaleX)
+	fDot01 = __dot(lRows[1], lRow0)
+	lRow1 = [lRows[1][j] - fDot01 * lRow0[j] for j in range(3)]
+	fScaleY = __length(lRow1)
+	lRow1 = __divide(lRow1, fScaleY)
+	fDot02 = __dot(lRows[2], lRow0)
+	fDot12 = __dot(lRows[2], lRow1)
+	lRow2 = [lRows[2][j] - fDot02 * lRow0[j] - fDot12 * lRow1[j] for j in range(3)]
+	fScaleZ = __length(lRow2)
+	lRow2 = __divide(lRow2, fScaleZ)
+	if __dot(lRow0, __cross(lRow1, lRow2)) < 0:
+		fScaleX = -fScaleX
+		lRow0 = [-fPos for fPos in lRow0]
+		fDot01 = -fDot01
+		fDot02 = -fDot02
+
+	lRotate = __getEuler([lRow0, lRow1, lRow2], iRotateOrder)
+	lTransformInfo = [[lMatrix[12], lMatrix[13], lMatrix[14]], lRotate, [fScaleX, fScaleY, fScaleZ]]
+	if bShear:
+		lTransformInfo.append([__safeDivide(fDot01, fScaleY), __safeDivide(fDot02, fScaleZ), __safeDivide(fDot12, fScaleZ)])
+	return lTransformInfo
+
+def decomposeMatrices(lMatrices, lRotateOrders = None, bShear = False):
+	lRotateOrders = lRotateOrders or [0] * len(lMatrices)
+	return [decomposeMatrix(lMatrix, iRotateOrder = lRotateOrders[i], bShear = bShear) for i, lMatrix in enumerate(lMatrices)]
+
+def multMatrix(lMatrixA, lMatrixB):
+	return [sum([lMatrixA[i * 4 + k] * lMatrixB[k * 4 + j] for k in range(4)]) for i in range(4) for j in range(4)]
+
+def multMatrices(lMatricesA, lMatricesB):
+	'''
+	pairwise A * B for N matrices
+	'''
+	if numpy is not None and lMatricesA:
+		aMatrices = numpy.einsum('nij,njk->nik', __toArray(lMatricesA), __toArray(lMatricesB))
+		return aMatrices.reshape(-1, 16).tolist()
+	return [multMatrix(lMatrixA, lMatrixB) for lMatrixA, lMatrixB in zip(lMatricesA, lMatricesB)]
+
+def inverseMatrix(lMatrix):
+	'''
+	gauss jordan inverse with partial pivoting, raise if the matrix is singular
+	'''
+	lRows = [[float(lMatrix[i * 4 + j]) for j in range(4)] + [float(i == j) for j in range(4)] for i in range(4)]
+	for iCol in range(4):
+		iPivot = max(range(iCol, 4), key = lambda iRow: abs(lRows[iRow][iCol]))
+		if abs(lRows[iPivot][iCol]) < fEpsilon:
+			raise RuntimeError('matrix is singular, can not be inverted')
+		lRows[iCol], lRows[iPivot] = lRows[iPivot], lRows[iCol]
+		fPivot = lRows[iCol][iCol]
+		lRows[iCol] = [fValue / fPivot for fValue in lRows[iCol]]
+		for iRow in range(4):
+			if iRow != iCol and lRows[iRow][iCol]:
+				fFactor = lRows[iRow][iCol]
+				lRows[iRow] = [fValue - fFactor * lRows[iCol][j] for j, fValue in enumerate(lRows[iRow])]
+	return [lRows[i][j + 4] for i in range(4) for j in range(4)]
+
+def inverseMatrices(lMatrices):
+	if numpy is not None and lMatrices:
+		return numpy.linalg.inv(__toArray(lMatrices)).reshape(-1, 16).tolist()
+	return [inverseMatrix(lMatrix) for lMatrix in lMatrices]
+
+def getLocalMatrix(lMatrix, lParentMatrix):
+	'''
+	return the matrix in the parent's space, matrix * parent inverse
+	'''
+	return multMatrix(lMatrix, inverseMatrix(lParentMatrix))
+
+def getLocalMatrices(lMatrices, lParentMatrices):
+	return multMatrices(lMatrices, inverseMatrices(lParentMatrices))
+
+def transformPoints(lPoints, lMatrix, lPivot = None):
+	'''
+	return the points multiplied by the matrix about the pivot, one matrix operation over the point array
+	the matrix is taken as affine, no w divide
+	'''
+	if not lPoints:
+		return []
+	if not lPivot:
+		lPivot = [0.0, 0.0, 0.0]
+	if numpy is not None:
+		aPoints = numpy.asarray([lPoint[:3] for lPoint in lPoints], dtype = numpy.float64) - lPivot
+		aPoints = numpy.hstack([aPoints, numpy.ones((aPoints.shape[0], 1))])
+		aPoints = aPoints.dot(numpy.asarray(lMatrix, dtype = numpy.float64).reshape(4, 4))[:, :3] + lPivot
+		return aPoints.tolist()
+	lPointsTransformed = []
+	for lPoint in lPoints:
+		lPos = [lPoint[0] - lPivot[0], lPoint[1] - lPivot[1], lPoint[2] - lPivot[2], 1.0]
+		lPointsTransformed.append([sum([lPos[k] * lMatrix[k * 4 + j] for k in range(4)]) + lPivot[j] for j in range(3)])
+	return lPointsTransformed
+
+def transformPointsBatch(llPoints, lMatrices):
+	'''
+	return each points list multiplied by its own matrix, all the points in one numpy operation
+	'''
+	if not llPoints:
+		return []
+	if numpy is not None:
+		lCounts = [len(lPoints) for lPoints in llPoints]
+		aPoints = numpy.asarray([lPoint[:3] for lPoints in llPoints for lPoint in lPoints], dtype = numpy.float64).reshape(-1, 3)
+		aPoints = numpy.hstack([aPoints, numpy.ones((aPoints.shape[0], 1))])
+		aIndices = numpy.repeat(numpy.arange(len(lCounts)), lCounts)
+		aPoints = numpy.einsum('ni,nij->nj', aPoints, __toArray(lMatrices)[aIndices])[:, :3]
+		return [aPointsEach.tolist() for aPointsEach in numpy.split(aPoints, numpy.cumsum(lCounts)[:-1])]
+	return [transformPoints(lPoints, lMatrix) for lPoints, lMatrix in zip(llPoints, lMatrices)]
+
+#### Sub Functions
+def __getEuler(lRotate3, iRotateOrder):
+	'''
+	euler angles in degrees of a rotation matrix, in the rotate order
+
+	the axes are permuted so the order reads as xyz, an odd permutation flips the angles
+	'''
+	sOrder = lRotateOrders[iRotateOrder]
+	lAxes = ['xyz'.index(sAxis) for sAxis in sOrder]
+	bOdd = sOrder in ['xzy', 'yxz', 'zyx']
+	m = [[lRotate3[lAxes[i]][lAxes[j]] for j in range(3)] for i in range(3)]
+	fCosB = math.sqrt(m[0][0] * m[0][0] + m[0][1] * m[0][1])
+	if fCosB > 1e-8:
+		fA = math.atan2(m[1][2], m[2][2])
+		fB = math.atan2(-m[0][2], fCosB)
+		fC = math.atan2(m[0][1], m[0][0])
+	else:
+		## gimbal lock, the last rotation is folded into the first one
+		fA = math.atan2(-m[2][1], m[1][1])
+		fB = math.atan2(-m[0][2], fCosB)
+		fC = 0.0
+	lAngles = [math.degrees(fAngle) for fAngle in [fA, fB, fC]]
+	if bOdd:
+		lAngles = [-fAngle for fAngle in lAngles]
+	lRotate = [0.0, 0.0, 0.0]
+	for i, iAxis in enumerate(lAxes):
+		lRotate[iAxis] = lAngles[i]
+	return lRotate
+
+def __mult3(lMatrixA, lMatrixB):
+	return [[sum([lMatrixA[i][k] * lMatrixB[k][j] for k in range(3)]) for j in range(3)] for i in range(3)]
+
+def __toArray(lMatrices):
+	return numpy.asarray(lMatrices, dtype = numpy.float64).reshape(-1, 4, 4)
+
+def __dot(lVectorA, lVectorB):
+	return lVectorA[0] * lVectorB[0] + lVectorA[1] * lVectorB[1] + lVectorA[2] * lVectorB[2]
+
+def __cross(lVectorA, lVectorB):
+	return [lVectorA[1] * lVectorB[2] - lVectorA[2] * lVectorB[1],
+			lVectorA[2] * lVectorB[0] - lVectorA[0] * lVectorB[2],
+			lVectorA[0] * lVectorB[1] - lVectorA[1] * lVectorB[0]]
+
+def __length(lVector):
+	return math.sqrt(__dot(lVector, lVector))
+
+def __divide(lVector, fValue):
+	if abs(fValue) < fEpsilon:
+		return [0.0, 0.0, 0.0]
+	return [fPos / fValue for fPos in lVector]
+
+def __safeDivide(fValueA, fValueB):
+	if abs(fValueB) < fEpsilon:
+		return 0.0
+	return fValueA / fValueB
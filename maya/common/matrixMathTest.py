@@ -0,0 +1,151 @@
+## External Import
+import random
+
+## libs Import
+import matrixMath
+
+## Vars
+iSamples = 200
+fTolerance = 1e-6
+
+#### Functions
+## round trip checks of matrixMath, runs without maya: python matrixMathTest.py
+## with numpy installed, the batch functions are checked on both the numpy and the pure python path
+def runTests(iCount = iSamples, iSeed = 0):
+	oRandom = random.Random(iSeed)
+	testComposeRotateOrders(oRandom)
+	testRoundTrip(oRandom, iCount)
+	testGimbal()
+	testInverse(oRandom, iCount)
+	lPaths = [matrixMath.numpy]
+	if matrixMath.numpy is not None:
+		lPaths.append(None)
+	for numpy in lPaths:
+		matrixMath.numpy = numpy
+		try:
+			testPoints(oRandom)
+			testLocalMatrices(oRandom, iCount)
+		finally:
+			matrixMath.numpy = lPaths[0]
+	print 'matrixMath ok, %d paths' %len(lPaths)
+
+def testComposeRotateOrders(oRandom):
+	'''
+	each rotate order is the product of the single axis rotations, first axis applied first
+	'''
+	for iRotateOrder, sOrder in enumerate(matrixMath.lRotateOrders):
+		lRotate = [oRandom.uniform(-180, 180) for i in range(3)]
+		lMatrix = matrixMath.lIdentity
+		for sAxis in sOrder:
+			lRotateAxis = [0, 0, 0]
+			lRotateAxis['xyz'.index(sAxis)] = lRotate['xyz'.index(sAxis)]
+			lMatrix = matrixMath.multMatrix(lMatrix, matrixMath.composeMatrix(lRotate = lRotateAxis))
+		__assertMatrix(matrixMath.composeMatrix(lRotate = lRotate, iRotateOrder = iRotateOrder), lMatrix, 'rotate order %s' %sOrder)
+	## row vectors, rotate x 90 turns +y to +z
+	__assertValues(matrixMath.transformPoints([[0, 1, 0]], matrixMath.composeMatrix(lRotate = [90, 0, 0]))[0], [0, 0, 1], 'rotate x 90')
+
+def testRoundTrip(oRandom, iCount):
+	'''
+	compose, decompose and compose again in all six rotate orders, with shear and negative scale
+	'''
+	for iRotateOrder, sOrder in enumerate(matrixMath.lRotateOrders):
+		for i in range(iCount):
+			lTranslate = [oRandom.uniform(-5, 5) for j in range(3)]
+			lRotate = [oRandom.uniform(-170, 170) for j in range(3)]
+			lScale = [oRandom.uniform(0.2, 3) for j in range(3)]
+			lShear = [oRandom.uniform(-1, 1) for j in range(3)]
+			iNegative = oRandom.randint(-1, 2)
+			if iNegative >= 0:
+				lScale[iNegative] = -lScale[iNegative]
+			lMatrix = matrixMath.composeMatrix(lTranslate, lRotate, lScale, lShear, iRotateOrder)
+			lTranslate2, lRotate2, lScale2, lShear2 = matrixMath.decomposeMatrix(lMatrix, iRotateOrder = iRotateOrder, bShear = True)
+			sMessage = 'round trip %s, rotate %s, scale %s, shear %s' %(sOrder, lRotate, lScale, lShear)
+			__assertValues(lTranslate2, lTranslate, sMessage)
+			__assertMatrix(matrixMath.composeMatrix(lTranslate2, lRotate2, lScale2, lShear2, iRotateOrder), lMatrix, sMessage)
+			## without shear the rotation and scale come back as given, the negative determinant on the x scale
+			lMatrix = matrixMath.composeMatrix(lTranslate, lRotate, [abs(fScale) for fScale in lScale], iRotateOrder = iRotateOrder)
+			lTranslate2, lRotate2, lScale2 = matrixMath.decomposeMatrix(lMatrix, iRotateOrder = iRotateOrder)
+			__assertValues(lScale2, [abs(fScale) for fScale in lScale], sMessage)
+			__assertMatrix(matrixMath.composeMatrix(lTranslate2, lRotate2, lScale2, iRotateOrder = iRotateOrder), lMatrix, sMessage)
+		lMatrix = matrixMath.composeMatrix(lScale = [1, -2, 3], iRotateOrder = iRotateOrder)
+		__assertValues(matrixMath.decomposeMatrix(lMatrix, iRotateOrder = iRotateOrder)[2], [-1, 2, 3], 'negative scale %s' %sOrder)
+	lMatrices = [matrixMath.composeMatrix([oRandom.uniform(-5, 5) for j in range(3)], [oRandom.uniform(-170, 170) for j in range(3)]) for i in range(iCount)]
+	lRotateOrders = [oRandom.randint(0, 5) for i in range(iCount)]
+	for lMatrix, lTransformInfo, iRotateOrder in zip(lMatrices, matrixMath.decomposeMatrices(lMatrices, lRotateOrders = lRotateOrders), lRotateOrders):
+		__assertMatrix(matrixMath.composeMatrix(lTransformInfo[0], lTransformInfo[1], lTransformInfo[2], iRotateOrder = iRotateOrder), lMatrix, 'decomposeMatrices')
+
+def testGimbal():
+	'''
+	the middle axis at +-90 degrees, the matrix still rebuilds in every rotate order
+	'''
+	for iRotateOrder, sOrder in enumerate(matrixMath.lRotateOrders):
+		iMiddle = 'xyz'.index(sOrder[1])
+		for fAngle in [90, -90]:
+			lRotate = [30, 20, 10]
+			lRotate[iMiddle] = fAngle
+			lMatrix = matrixMath.composeMatrix(lRotate = lRotate, iRotateOrder = iRotateOrder)
+			lRotate2 = matrixMath.decomposeMatrix(lMatrix, iRotateOrder = iRotateOrder)[1]
+			__assertMatrix(matrixMath.composeMatrix(lRotate = lRotate2, iRotateOrder = iRotateOrder), lMatrix, 'gimbal %s %s' %(sOrder, lRotate))
+
+def testInverse(oRandom, iCount):
+	lMatrices = []
+	for i in range(iCount):
+		lScale = [oRandom.choice([-1, 1]) * oRandom.uniform(0.2, 3) for j in range(3)]
+		lMatrices.append(matrixMath.composeMatrix([oRandom.uniform(-5, 5) for j in range(3)], [oRandom.uniform(-180, 180) for j in range(3)],
+												  lScale, [oRandom.uniform(-1, 1) for j in range(3)], oRandom.randint(0, 5)))
+	for lMatrix, lMatrixInverse in zip(lMatrices, matrixMath.inverseMatrices(lMatrices)):
+		__assertMatrix(matrixMath.multMatrix(lMatrix, lMatrixInverse), matrixMath.lIdentity, 'inverseMatrices')
+		__assertMatrix(matrixMath.multMatrix(matrixMath.inverseMatrix(lMatrix), lMatrix), matrixMath.lIdentity, 'inverseMatrix')
+	try:
+		matrixMath.inverseMatrix(matrixMath.composeMatrix(lScale = [1, 0, 1]))
+	except RuntimeError:
+		pass
+	else:
+		raise AssertionError('singular matrix inverted')
+
+def testPoints(oRandom):
+	lMatrix = matrixMath.composeMatrix([1, 2, 3], [0, 0, 90], [2, 2, 2])
+	## +x scaled by 2, turned to +y, then moved
+	__assertValues(matrixMath.transformPoints([[1, 0, 0]], lMatrix)[0], [1, 4, 3], 'transformPoints')
+	__assertValues(matrixMath.transformPoints([[2, 0, 0]], lMatrix, lPivot = [1, 0, 0])[0], [2, 4, 3], 'transformPoints pivot')
+	if matrixMath.transformPoints([], lMatrix) or matrixMath.transformPointsBatch([], []):
+		raise AssertionError('empty points')
+
+	llPoints = [[[oRandom.uniform(-5, 5) for j in range(3)] for k in range(oRandom.randint(1, 6))] for i in range(20)]
+	lMatrices = [matrixMath.composeMatrix([oRandom.uniform(-5, 5) for j in range(3)], [oRandom.uniform(-180, 180) for j in range(3)]) for i in range(20)]
+	for lPoints, lMatrix, lPointsBatch in zip(llPoints, lMatrices, matrixMath.transformPointsBatch(llPoints, lMatrices)):
+		lPointsEach = matrixMath.transformPoints(lPoints, lMatrix)
+		if len(lPointsBatch) != len(lPointsEach):
+			raise AssertionError('transformPointsBatch returned %d points, expected %d' %(len(lPointsBatch), len(lPointsEach)))
+		for lPoint, lPointEach in zip(lPointsBatch, lPointsEach):
+			__assertValues(lPoint, lPointEach, 'transformPointsBatch')
+
+def testLocalMatrices(oRandom, iCount):
+	'''
+	local * parent gives the world matrix back
+	'''
+	lMatrices = []
+	lParentMatrices = []
+	for i in range(iCount):
+		lMatrices.append(matrixMath.composeMatrix([oRandom.uniform(-5, 5) for j in range(3)], [oRandom.uniform(-180, 180) for j in range(3)], [oRandom.uniform(0.2, 3) for j in range(3)]))
+		lParentMatrices.append(matrixMath.composeMatrix([oRandom.uniform(-5, 5) for j in range(3)], [oRandom.uniform(-180, 180) for j in range(3)], [oRandom.uniform(0.2, 3) for j in range(3)]))
+	lLocalMatrices = matrixMath.getLocalMatrices(lMatrices, lParentMatrices)
+	for lMatrix, lParentMatrix, lLocalMatrix in zip(lMatrices, lParentMatrices, lLocalMatrices):
+		__assertMatrix(lLocalMatrix, matrixMath.getLocalMatrix(lMatrix, lParentMatrix), 'getLocalMatrices')
+		__assertMatrix(matrixMath.multMatrix(lLocalMatrix, lParentMatrix), lMatrix, 'getLocalMatrices')
+	for lMatrixA, lMatrixB, lMatrixMult in zip(lMatrices, lParentMatrices, matrixMath.multMatrices(lMatrices, lParentMatrices)):
+		__assertMatrix(lMatrixMult, matrixMath.multMatrix(lMatrixA, lMatrixB), 'multMatrices')
+
+#### Sub Functions
+def __assertValues(lValues, lValuesExpected, sMessage):
+	for fValue, fValueExpected in zip(lValues, lValuesExpected):
+		if abs(fValue - fValueExpected) > fTolerance:
+			raise AssertionError('%s: %s, expected %s' %(sMessage, list(lValues), list(lValuesExpected)))
+
+def __assertMatrix(lMatrix, lMatrixExpected, sMessage):
+	if len(lMatrix) != 16:
+		raise AssertionError('%s: %d values, expected 16' %(sMessage, len(lMatrix)))
+	__assertValues(lMatrix, lMatrixExpected, sMessage)
+
+if __name__ == '__main__':
+	runTests()
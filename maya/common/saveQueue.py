@@ -0,0 +1,383 @@
+## External Import
+import os
+import time
+import socket
+import uuid
+import threading
+import Queue
+from shutil import copyfile
+try:
+	import maya.utils as mayaUtils
+except ImportError:
+	mayaUtils = None
+
+## libs Import
+import files
+import assetCatalog
+
+## Vars
+sJournalFolder = '.saveJournal'
+sJournalSuffix = '.saveJob'
+## the owning session holds the lock of <journal>.owner until the job ends,
+## a lock left by a killed session is released by the os
+sOwnerSuffix = '.owner'
+sStatusQueued = 'queued'
+sStatusRunning = 'running'
+sStatusDone = 'done'
+sStatusFailed = 'failed'
+## a journal older than the version file it would write, discarded instead of replayed
+sStatusDropped = 'dropped'
+sVersionFileName = 'assetInfo.version'
+iStatusLogSize = 200
+
+oJobQueue = Queue.Queue()
+oWorker = None
+oWorkerLock = threading.Lock()
+## latest queued asset info per asset type directory, cleared once its job is done,
+## so a new save before the worker caught up still gets the right version number
+dPendingAssetInfo = {}
+oPendingLock = threading.Lock()
+## status channel, callbacks are called with a status dict on maya's main thread,
+## the worker defers them and the status prints through maya.utils.executeDeferred
+lStatusCallbacks = []
+lStatusLog = []
+## queued or running job ids
+dActiveJobs = {}
+## owner locks of this session's journals, {sJobId: oFileLock}
+dJobLocks = {}
+
+#### Functions
+## a job is a list of steps, each step is idempotent so an interrupted job can be replayed from the journal
+## ['copy', sPath, sPathTarget]
+## ['remove', sPath]
+## ['writeJson', sPath, data]
+## ['catalog', sProject, sAsset, sType, dAssetInfo]
+## a save job also records its asset type directory and the version it writes,
+## a failed journal blocks new saves on the directory until it is resumed or discarded
+
+def createJob(sName, lSteps, sRoot = None, sDirectory = None, iVersion = None, sVersionName = None):
+	'''
+	write the job journal and return the job dict,
+	the journal records the owning host and pid, and this session holds its owner lock until the job ends
+	'''
+	if not sRoot:
+		sRoot = files.sPathLocal
+	sJobId = '%d_%s' %(int(time.time() * 1000), uuid.uuid4().hex[:8])
+	dJob = {'sJobId': sJobId, 'sName': sName, 'lSteps': lSteps, 'iStep': 0,
+			'sJournal': os.path.join(getJournalDirectory(sRoot = sRoot), sJobId + sJournalSuffix),
+			'sHost': socket.gethostname(), 'iPid': os.getpid(),
+			'sDirectory': sDirectory, 'iVersion': iVersion, 'sVersionName': sVersionName}
+	oLock = files.oFileLock(dJob['sJournal'] + sOwnerSuffix)
+	oLock.acquire()
+	dJobLocks[sJobId] = oLock
+	files.writeJsonFile(dJob['sJournal'], dJob)
+	return dJob
+
+def addJob(dJob, sDirectory = None, dAssetInfo = None):
+	'''
+	queue the job on the background worker
+	sDirectory, dAssetInfo: asset type directory and the asset info the job will write
+	'''
+	if sDirectory:
+		dJob['sDirectory'] = sDirectory
+	sDirectory = dJob.get('sDirectory', None)
+	if sDirectory and dAssetInfo is not None:
+		with oPendingLock:
+			dPendingAssetInfo[sDirectory] = (dJob['sJobId'], dAssetInfo)
+	dActiveJobs[dJob['sJobId']] = True
+	__startWorker()
+	__setStatus(dJob, sStatusQueued)
+	oJobQueue.put(dJob)
+
+def runJob(dJob):
+	'''
+	run the remaining steps of the job, update the journal after each step, remove it once done
+	'''
+	__setStatus(dJob, sStatusRunning)
+	try:
+		lSteps = dJob['lSteps']
+		for i in range(dJob['iStep'], len(lSteps)):
+			__runStep(lSteps[i])
+			dJob['iStep'] = i + 1
+			if dJob['iStep'] < len(lSteps):
+				files.writeJsonFile(dJob['sJournal'], dJob)
+				__setStatus(dJob, sStatusRunning)
+		__removeJournal(dJob)
+	except Exception, oError:
+		## the journal keeps the failed step, resumeJobs retries it, new saves on the directory wait for it
+		__setStatus(dJob, sStatusFailed, sMessage = str(oError))
+		return False
+	finally:
+		## a failed job's journal can be resumed by any session once the lock is released
+		__releaseJob(dJob)
+		dActiveJobs.pop(dJob['sJobId'], None)
+		sDirectory = dJob.get('sDirectory', None)
+		if sDirectory:
+			with oPendingLock:
+				if sDirectory in dPendingAssetInfo and dPendingAssetInfo[sDirectory][0] == dJob['sJobId']:
+					dPendingAssetInfo.pop(sDirectory)
+	__setStatus(dJob, sStatusDone)
+	return True
+
+def resumeJobs(sRoot = None):
+	'''
+	queue the jobs left in the journal folder by a dead session or failed in this one, return the job count,
+	jobs owned by another live session are skipped, the journal folder is shared by all the sessions,
+	a job whose version file already moved past the version it writes is dropped
+	'''
+	sJournalDir = getJournalDirectory(sRoot = sRoot)
+	lJournals = sorted([sFile for sFile in os.listdir(sJournalDir) if sFile.endswith(sJournalSuffix)])
+	iCount = 0
+	for sJournal in lJournals:
+		sJournalPath = os.path.join(sJournalDir, sJournal)
+		sJobId = sJournal[:-len(sJournalSuffix)]
+		if sJobId in dActiveJobs or sJobId in dJobLocks:
+			continue
+		oLock = files.oFileLock(sJournalPath + sOwnerSuffix)
+		if not oLock.acquire(bBlocking = False):
+			continue
+		try:
+			dJob = files.readJsonFile(sJournalPath, bCache = False)
+		except (IOError, ValueError):
+			## finished by its owner before the lock was taken, or corrupted
+			oLock.release()
+			if os.path.exists(sJournalPath):
+				print 'save job journal %s is corrupted, skipped' %sJournal
+			continue
+		if __isOwnerAlive(dJob):
+			oLock.release()
+			continue
+		dJobLocks[dJob['sJobId']] = oLock
+		if __isStale(dJob):
+			__removeJournal(dJob)
+			__setStatus(dJob, sStatusDropped, sMessage = 'the asset has a newer version than v%03d' %dJob['iVersion'])
+			continue
+		addJob(dJob, dAssetInfo = __getJobAssetInfo(dJob))
+		iCount += 1
+	return iCount
+
+def getFailedJobs(sDirectory = None):
+	'''
+	return the journals left on disk that no session is running, on the asset type directory if given
+	'''
+	sJournalDir = getJournalDirectory()
+	lJobs = []
+	for sJournal in sorted(os.listdir(sJournalDir)):
+		if not sJournal.endswith(sJournalSuffix) or sJournal[:-len(sJournalSuffix)] in dActiveJobs:
+			continue
+		sJournalPath = os.path.join(sJournalDir, sJournal)
+		oLock = files.oFileLock(sJournalPath + sOwnerSuffix)
+		if not oLock.acquire(bBlocking = False):
+			continue
+		oLock.release()
+		try:
+			dJob = files.readJsonFile(sJournalPath, bCache = False)
+		except (IOError, ValueError):
+			continue
+		if sDirectory and dJob.get('sDirectory', None) != sDirectory:
+			continue
+		lJobs.append(dJob)
+	return lJobs
+
+def discardJobs(lJobs):
+	'''
+	remove the journals of failed jobs without running their remaining steps
+	'''
+	for dJob in lJobs:
+		oLock = files.oFileLock(dJob['sJournal'] + sOwnerSuffix)
+		if dJob['sJobId'] in dActiveJobs or not oLock.acquire(bBlocking = False):
+			continue
+		dJobLocks[dJob['sJobId']] = oLock
+		__removeJournal(dJob)
+		__setStatus(dJob, sStatusDropped, sMessage = 'discarded')
+
+def getPendingAssetInfo(sDirectory):
+	'''
+	asset info of the last queued job on the asset type directory, None if nothing pending
+	'''
+	with oPendingLock:
+		tPending = dPendingAssetInfo.get(sDirectory, None)
+	if tPending:
+		return __copyAssetInfo(tPending[1])
+	return None
+
+def waitForJobs(fTimeout = None):
+	'''
+	block until the queue is empty, return False if timed out
+	'''
+	fStartTime = time.time()
+	while oJobQueue.unfinished_tasks:
+		if fTimeout is not None and time.time() - fStartTime > fTimeout:
+			return False
+		time.sleep(0.05)
+	return True
+
+def hasPendingJobs():
+	return oJobQueue.unfinished_tasks > 0
+
+def addStatusCallback(fnCallback):
+	'''
+	a reloaded module's callback replaces the one registered before the reload
+	'''
+	for fnCallbackEach in list(lStatusCallbacks):
+		if getattr(fnCallbackEach, '__module__', None) == getattr(fnCallback, '__module__', None) and getattr(fnCallbackEach, '__name__', None) == getattr(fnCallback, '__name__', None):
+			lStatusCallbacks.remove(fnCallbackEach)
+	lStatusCallbacks.append(fnCallback)
+
+def removeStatusCallback(fnCallback):
+	if fnCallback in lStatusCallbacks:
+		lStatusCallbacks.remove(fnCallback)
+
+def getStatusLog():
+	return list(lStatusLog)
+
+def getJournalDirectory(sRoot = None):
+	if not sRoot:
+		sRoot = files.sPathLocal
+	sJournalDir = os.path.join(sRoot, sJournalFolder)
+	if not os.path.exists(sJournalDir):
+		os.makedirs(sJournalDir)
+	return sJournalDir
+
+#### Sub Functions
+def __releaseJob(dJob):
+	oLock = dJobLocks.pop(dJob['sJobId'], None)
+	if oLock:
+		oLock.release()
+
+def __removeJournal(dJob):
+	__releaseJob(dJob)
+	for sPath in [dJob['sJournal'], files.getLockPath(dJob['sJournal']), files.getLockPath(dJob['sJournal'] + sOwnerSuffix)]:
+		if os.path.exists(sPath):
+			os.remove(sPath)
+
+def __isStale(dJob):
+	'''
+	True if the version file has a later version than the job's, or another save under the job's version number,
+	replaying the job would write its old asset info over it
+	'''
+	sDirectory = dJob.get('sDirectory', None)
+	iVersion = dJob.get('iVersion', None)
+	if not sDirectory or iVersion is None:
+		return False
+	sVersionFile = os.path.join(sDirectory, sVersionFileName)
+	if not os.path.isfile(sVersionFile):
+		return False
+	dVersions = files.readJsonFile(sVersionFile)['versionInfo']
+	if not dVersions:
+		return False
+	iLatestVersion = max([int(sKey) for sKey in dVersions.keys()])
+	if iLatestVersion > iVersion:
+		return True
+	if iLatestVersion == iVersion and dVersions[str(iVersion)]['sVersionName'] != dJob.get('sVersionName', None):
+		return True
+	return False
+
+def __getJobAssetInfo(dJob):
+	'''
+	asset info the job writes to its version file, None if it has none
+	'''
+	for lStep in dJob['lSteps']:
+		if lStep[0] == 'writeJson' and os.path.basename(lStep[1]) == sVersionFileName:
+			return lStep[2]
+	return None
+
+def __isOwnerAlive(dJob):
+	'''
+	True if the journal's owner is another process still running,
+	the locks are per machine, so a job of another host always counts as alive
+	'''
+	iPid = dJob.get('iPid', None)
+	if not iPid or iPid == os.getpid():
+		return False
+	if dJob.get('sHost', None) != socket.gethostname():
+		return True
+	if os.name == 'nt':
+		import ctypes
+		## PROCESS_QUERY_LIMITED_INFORMATION, STILL_ACTIVE
+		hProcess = ctypes.windll.kernel32.OpenProcess(0x1000, False, iPid)
+		if not hProcess:
+			return False
+		iExitCode = ctypes.c_ulong()
+		ctypes.windll.kernel32.GetExitCodeProcess(hProcess, ctypes.byref(iExitCode))
+		ctypes.windll.kernel32.CloseHandle(hProcess)
+		return iExitCode.value == 259
+	try:
+		os.kill(iPid, 0)
+	except OSError, oError:
+		## EPERM, the process exists under another user
+		return oError.errno == 1
+	return True
+
+def __startWorker():
+	global oWorker
+	with oWorkerLock:
+		if oWorker and oWorker.is_alive():
+			return
+		oWorker = threading.Thread(target = __workerLoop, name = 'saveQueueWorker')
+		## a killed session leaves the journal behind, nothing is lost
+		oWorker.daemon = True
+		oWorker.start()
+
+def __workerLoop():
+	while True:
+		dJob = oJobQueue.get()
+		try:
+			runJob(dJob)
+		finally:
+			oJobQueue.task_done()
+
+def __runStep(lStep):
+	sStep = lStep[0]
+	if sStep == 'copy':
+		sPath, sPathTarget = lStep[1], lStep[2]
+		if not os.path.exists(sPath):
+			if os.path.exists(sPathTarget):
+				## copied already, the source is gone by a later step
+				return
+			raise IOError('%s does not exist' %sPath)
+		sDirectory = os.path.dirname(sPathTarget)
+		if not os.path.exists(sDirectory):
+			os.makedirs(sDirectory)
+		copyfile(sPath, sPathTarget + files.sTempSuffix)
+		files.replaceFile(sPathTarget + files.sTempSuffix, sPathTarget)
+	elif sStep == 'remove':
+		if os.path.exists(lStep[1]):
+			os.remove(lStep[1])
+	elif sStep == 'writeJson':
+		files.writeJsonFile(lStep[1], lStep[2])
+	elif sStep == 'catalog':
+		assetCatalog.updateAssetType(lStep[1], lStep[2], lStep[3], dAssetInfo = lStep[4])
+	else:
+		raise RuntimeError('unknown save job step %s' %sStep)
+
+def __setStatus(dJob, sStatus, sMessage = None):
+	dStatus = {'sJobId': dJob['sJobId'], 'sName': dJob['sName'], 'sStatus': sStatus,
+			   'iStep': dJob['iStep'], 'iSteps': len(dJob['lSteps']), 'sMessage': sMessage, 'fTime': time.time()}
+	lStatusLog.append(dStatus)
+	if len(lStatusLog) > iStatusLogSize:
+		del lStatusLog[0]
+	if mayaUtils:
+		mayaUtils.executeDeferred(__sendStatus, dStatus)
+	else:
+		__sendStatus(dStatus)
+
+def __sendStatus(dStatus):
+	if dStatus['sStatus'] == sStatusFailed:
+		print 'save job %s failed at step %d: %s' %(dStatus['sName'], dStatus['iStep'], dStatus['sMessage'])
+	elif dStatus['sStatus'] == sStatusDone:
+		print 'save job %s done' %dStatus['sName']
+	elif dStatus['sStatus'] == sStatusDropped:
+		print 'save job %s dropped: %s' %(dStatus['sName'], dStatus['sMessage'])
+	for fnCallback in list(lStatusCallbacks):
+		try:
+			fnCallback(dStatus)
+		except Exception, oError:
+			print 'save job status callback error: %s' %oError
+
+def __copyAssetInfo(data):
+	if isinstance(data, dict):
+		return dict([(key, __copyAssetInfo(value)) for key, value in data.iteritems()])
+	elif isinstance(data, list):
+		return [__copyAssetInfo(value) for value in data]
+	return data
@@ -0,0 +1,186 @@
+## External Import
+import math
+
+#### Functions
+class oPointGrid(object):
+	'''
+	a uniform grid hash of points, for tolerance lookup and closest point query
+	points are any [x, y, z] sequences, no maya dependency
+	'''
+	def __init__(self, lPoints, fCellSize = None):
+		super(oPointGrid, self).__init__()
+		self.lPoints = [(float(lPnt[0]), float(lPnt[1]), float(lPnt[2])) for lPnt in lPoints]
+		if fCellSize:
+			self.fCellSize = float(fCellSize)
+		else:
+			self.fCellSize = getGridCellSize(self.lPoints)
+		self.dCells = {}
+		for i, lPnt in enumerate(self.lPoints):
+			tCell = self.getCell(lPnt)
+			if tCell in self.dCells:
+				self.dCells[tCell].append(i)
+			else:
+				self.dCells[tCell] = [i]
+		self.lCellMin = [0, 0, 0]
+		self.lCellMax = [0, 0, 0]
+		if self.dCells:
+			for iAxis in range(3):
+				lCells = [tCell[iAxis] for tCell in self.dCells.keys()]
+				self.lCellMin[iAxis] = min(lCells)
+				self.lCellMax[iAxis] = max(lCells)
+
+	def getCell(self, lPos):
+		fCellSize = self.fCellSize
+		return (int(math.floor(lPos[0] / fCellSize)), int(math.floor(lPos[1] / fCellSize)), int(math.floor(lPos[2] / fCellSize)))
+
+	def findPoint(self, lPos, fTolerance = 0.00001):
+		'''
+		return the lowest point index within fTolerance on every axis, None if not found
+		'''
+		tCellMin = self.getCell([lPos[0] - fTolerance, lPos[1] - fTolerance, lPos[2] - fTolerance])
+		tCellMax = self.getCell([lPos[0] + fTolerance, lPos[1] + fTolerance, lPos[2] + fTolerance])
+		iFound = None
+		for iX in range(tCellMin[0], tCellMax[0] + 1):
+			for iY in range(tCellMin[1], tCellMax[1] + 1):
+				for iZ in range(tCellMin[2], tCellMax[2] + 1):
+					for i in self.dCells.get((iX, iY, iZ), []):
+						if iFound is not None and i > iFound:
+							continue
+						lPnt = self.lPoints[i]
+						if abs(lPnt[0] - lPos[0]) <= fTolerance and abs(lPnt[1] - lPos[1]) <= fTolerance and abs(lPnt[2] - lPos[2]) <= fTolerance:
+							iFound = i
+		return iFound
+
+	def findClosestPoint(self, lPos):
+		'''
+		return the closest point index and the distance, (None, None) if the grid is empty
+		'''
+		iClosest = None
+		fDisClosest = None
+		tCell = self.getCell(lPos)
+		iRingMax = 0
+		for iAxis in range(3):
+			iRingMax = max(iRingMax, abs(tCell[iAxis] - self.lCellMin[iAxis]), abs(tCell[iAxis] - self.lCellMax[iAxis]))
+		for iRing in range(iRingMax + 1):
+			for tCellRing in self.__getRingCells(tCell, iRing):
+				for i in self.dCells.get(tCellRing, []):
+					lPnt = self.lPoints[i]
+					fDis = math.sqrt((lPnt[0] - lPos[0])**2 + (lPnt[1] - lPos[1])**2 + (lPnt[2] - lPos[2])**2)
+					if fDisClosest is None or fDis < fDisClosest or (fDis == fDisClosest and i < iClosest):
+						iClosest = i
+						fDisClosest = fDis
+			## points in the next ring are at least iRing cells away
+			if fDisClosest is not None and fDisClosest <= iRing * self.fCellSize:
+				break
+		return iClosest, fDisClosest
+
+	def __getRingCells(self, tCell, iRing):
+		if iRing == 0:
+			return [tCell]
+		lCells = []
+		for iX in range(-iRing, iRing + 1):
+			for iY in range(-iRing, iRing + 1):
+				if abs(iX) == iRing or abs(iY) == iRing:
+					lZ = range(-iRing, iRing + 1)
+				else:
+					lZ = [-iRing, iRing]
+				for iZ in lZ:
+					lCells.append((tCell[0] + iX, tCell[1] + iY, tCell[2] + iZ))
+		return lCells
+
+def getGridCellSize(lPoints, iPointsPerCell = 2):
+	'''
+	get a cell size giving roughly iPointsPerCell points per cell over the bounding box
+	'''
+	if not lPoints:
+		return 1.0
+	lMin = [min([lPnt[i] for lPnt in lPoints]) for i in range(3)]
+	lMax = [max([lPnt[i] for lPnt in lPoints]) for i in range(3)]
+	fVolume = 1.0
+	fSizeMax = 0
+	for i in range(3):
+		fSize = lMax[i] - lMin[i]
+		fSizeMax = max(fSizeMax, fSize)
+		if fSize > 0:
+			fVolume *= fSize
+	if fSizeMax == 0:
+		return 1.0
+	fCellSize = (fVolume * iPointsPerCell / float(len(lPoints))) ** (1 / 3.0)
+	return min(max(fCellSize, fSizeMax * 0.001), fSizeMax)
+
+def remapPoints(lPoints, lPointsBase, fTolerance = 0.00001, bClosest = True):
+	'''
+	find the base point index for each point
+
+	return lRemap, lUnmatched
+	lRemap: base point index of each point, points without a base point within
+			fTolerance get the closest base point if bClosest, otherwise None
+	lUnmatched: indices of points without a base point within fTolerance
+	'''
+	oGrid = oPointGrid(lPointsBase)
+	lRemap = []
+	lUnmatched = []
+	for i, lPos in enumerate(lPoints):
+		iBase = oGrid.findPoint(lPos, fTolerance = fTolerance)
+		if iBase is None:
+			lUnmatched.append(i)
+			if bClosest:
+				iBase, fDis = oGrid.findClosestPoint(lPos)
+		lRemap.append(iBase)
+	return lRemap, lUnmatched
+
+def convertFlatListToPoints(lFlat):
+	'''
+	convert [x0, y0, z0, x1, ...] to [[x0, y0, z0], [x1, ...], ...]
+	'''
+	lPoints = []
+	for i in range(0, len(lFlat) - 2, 3):
+		lPoints.append([float(lFlat[i]), float(lFlat[i + 1]), float(lFlat[i + 2])])
+	return lPoints
+
+def buildSymmetryMap(lPoints, iAxis = 0, iDirection = 1, fTolerance = 0.00001):
+	'''
+	pair each point on the source side with its mirrored point across the plane
+	perpendicular to iAxis (0: YZ, 1: XZ, 2: XY)
+
+	iDirection: 1 means positive side is the source, -1 means negative side
+	return bSymmetrical, lSource, lTarget, lMiddle
+	lSource[i] and lTarget[i] are a mirrored pair, lTarget[i] is None if the source point has no mirror,
+	target side points without a source are appended with lSource[i] as None
+	lMiddle: points on the mirror plane within fTolerance
+	'''
+	lSource = []
+	lTargetSide = []
+	lMiddle = []
+	for i, lPnt in enumerate(lPoints):
+		fAxis = lPnt[iAxis] * iDirection
+		if abs(fAxis) <= fTolerance:
+			lMiddle.append(i)
+		elif fAxis > 0:
+			lSource.append(i)
+		else:
+			lTargetSide.append(i)
+
+	oGrid = oPointGrid([lPoints[i] for i in lTargetSide])
+	bSymmetrical = True
+	lTarget = []
+	dMatched = {}
+	for i in lSource:
+		lPos = [lPoints[i][0], lPoints[i][1], lPoints[i][2]]
+		lPos[iAxis] = -lPos[iAxis]
+		iFound = oGrid.findPoint(lPos, fTolerance = fTolerance)
+		if iFound is None:
+			lTarget.append(None)
+			bSymmetrical = False
+		else:
+			iTarget = lTargetSide[iFound]
+			lTarget.append(iTarget)
+			dMatched[iTarget] = True
+
+	for i in lTargetSide:
+		if i not in dMatched:
+			lSource.append(None)
+			lTarget.append(i)
+			bSymmetrical = False
+
+	return bSymmetrical, lSource, lTarget, lMiddle
@@ -0,0 +1,204 @@
+## External Import
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+## libs Import
+import files
+import assetCatalog
+
+## Vars
+iThreads = 8
+sVersionFileName = 'assetInfo.version'
+sStatusUpToDate = 'Up to date'
+sStatusOutOfDate = 'Out of date'
+sStatusNotOnLocal = 'Not on local'
+
+## read cache, {sPath: ((mtime, size), value)}, a changed folder list or version file is re-read,
+## an unchanged one only costs a stat
+dCache = {}
+oCacheLock = threading.Lock()
+
+#### Functions
+def getFileInfoFromLocalAndServer(sPathLocal = None, sPathServer = None, fnCallback = None, iThreadCount = iThreads, bCatalog = True):
+	'''
+	compare the local and server workspaces, return
+	{sProject: {'status': , 'folders': {sAsset: {'status': , 'folders': {sType: {'status': , 'folders': {}}}}}}}
+
+	read from the local and server asset catalogs if bCatalog and both are available,
+	otherwise assets are compared on a thread pool, fnCallback(sProject, sStatusProject, sAsset, dAsset) is called
+	in the calling thread as soon as each asset is done (sAsset and dAsset are None for projects without assets)
+	'''
+	if not sPathLocal:
+		sPathLocal = files.sPathLocal
+	if not sPathServer:
+		sPathServer = files.sPathServer
+	if bCatalog and assetCatalog.ensureCatalog(sRoot = sPathLocal) and assetCatalog.ensureCatalog(sRoot = sPathServer):
+		return getFileInfoFromCatalogs(sPathLocal, sPathServer, fnCallback = fnCallback)
+
+	dAssetData = {}
+	lTasks = []
+	for sProject, sStatusProject in compareFolders(sPathLocal, sPathServer):
+		dAssetData[sProject] = {'status': sStatusProject, 'folders': {}}
+		sPathLocal_asset = os.path.join(sPathLocal, sProject, 'assets')
+		sPathServer_asset = os.path.join(sPathServer, sProject, 'assets')
+		lAssets = compareFolders(sPathLocal_asset, sPathServer_asset)
+		if not lAssets and fnCallback:
+			fnCallback(sProject, sStatusProject, None, None)
+		for sAsset, sStatusAsset in lAssets:
+			lTasks.append((sProject, sAsset, sStatusAsset, os.path.join(sPathLocal_asset, sAsset), os.path.join(sPathServer_asset, sAsset)))
+
+	if lTasks:
+		oPool = ThreadPool(max(1, min(iThreadCount, len(lTasks))))
+		try:
+			for sProject, sAsset, dAsset in oPool.imap_unordered(__getAssetInfo, lTasks):
+				dProject = dAssetData[sProject]
+				dProject['folders'][sAsset] = dAsset
+				dProject['status'] = mergeStatus(dProject['status'], dAsset['status'])
+				if fnCallback:
+					fnCallback(sProject, dProject['status'], sAsset, dAsset)
+		finally:
+			oPool.close()
+			oPool.join()
+
+	return dAssetData
+
+def getFileInfoFromCatalogs(sPathLocal, sPathServer, fnCallback = None):
+	'''
+	same as getFileInfoFromLocalAndServer, read from the local and server asset catalogs,
+	a few queries per project instead of reading every folder list and version file
+	'''
+	dAssetData = {}
+	for sProject, sStatusProject in compareLists(assetCatalog.getProjects(sRoot = sPathLocal), assetCatalog.getProjects(sRoot = sPathServer)):
+		dProject = {'status': sStatusProject, 'folders': {}}
+		dAssetData[sProject] = dProject
+		dTypes_local = __getCatalogVersions(sProject, sPathLocal)
+		dTypes_server = __getCatalogVersions(sProject, sPathServer)
+		lAssets = compareLists(assetCatalog.getAssets(sProject, sRoot = sPathLocal), assetCatalog.getAssets(sProject, sRoot = sPathServer))
+		if not lAssets and fnCallback:
+			fnCallback(sProject, sStatusProject, None, None)
+		for sAsset, sStatusAsset in lAssets:
+			dAsset = {'status': sStatusAsset, 'folders': {}}
+			dVersions_local = dTypes_local.get(sAsset, {})
+			dVersions_server = dTypes_server.get(sAsset, {})
+			for sType, sStatusType in compareLists(dVersions_local.keys(), dVersions_server.keys()):
+				sStatus = compareVersions(dVersions_local.get(sType, None), dVersions_server.get(sType, None))
+				dAsset['folders'][sType] = {'status': sStatus, 'folders': {}}
+				dAsset['status'] = mergeStatus(dAsset['status'], sStatus)
+			dProject['folders'][sAsset] = dAsset
+			dProject['status'] = mergeStatus(dProject['status'], dAsset['status'])
+			if fnCallback:
+				fnCallback(sProject, dProject['status'], sAsset, dAsset)
+	return dAssetData
+
+def compareFolders(sPathLocal, sPathServer):
+	'''
+	compare the folder lists, return [(sFolder, sStatus), ...]
+	'''
+	return compareLists(getFolderList(sPathLocal), getFolderList(sPathServer))
+
+def compareLists(lFolders_local, lFolders_server):
+	'''
+	compare the local and server folder names, return [(sFolder, sStatus), ...]
+	'''
+	lReturn = []
+	for sFolder in sorted(set(lFolders_local + lFolders_server)):
+		if sFolder in lFolders_local and sFolder in lFolders_server:
+			sStatus = sStatusUpToDate
+		elif sFolder in lFolders_local:
+			sStatus = sStatusOutOfDate
+		else:
+			sStatus = sStatusNotOnLocal
+		lReturn.append((sFolder, sStatus))
+	return lReturn
+
+def compareFileVersion(sPathLocal, sPathServer):
+	return compareVersions(getLatestVersion(sPathLocal), getLatestVersion(sPathServer))
+
+def compareVersions(iVersionLocal, iVersionServer):
+	'''
+	compare the latest versions, -1 if no version, None if the version file not exist
+	'''
+	if iVersionLocal is not None and iVersionServer is not None:
+		if iVersionLocal == iVersionServer:
+			sStatus = sStatusUpToDate
+		elif iVersionLocal > iVersionServer:
+			sStatus = sStatusOutOfDate
+		else:
+			sStatus = sStatusNotOnLocal
+	elif iVersionLocal is not None:
+		sStatus = sStatusOutOfDate
+	elif iVersionServer is not None:
+		sStatus = sStatusNotOnLocal
+	else:
+		sStatus = sStatusUpToDate
+	return sStatus
+
+def mergeStatus(sStatus, sStatusChild):
+	if sStatus == sStatusOutOfDate or sStatusChild == sStatusOutOfDate:
+		return sStatusOutOfDate
+	elif sStatus == sStatusNotOnLocal or sStatusChild == sStatusNotOnLocal:
+		return sStatusNotOnLocal
+	return sStatusUpToDate
+
+def getFolderList(sPath):
+	'''
+	cached folders.folderList, [] if not exist
+	'''
+	return __readCached(os.path.join(sPath, files.sFolderListName), __readFolderList, [])
+
+def getLatestVersion(sPath):
+	'''
+	cached latest version number in assetInfo.version, -1 if no version, None if the file not exist
+	'''
+	return __readCached(os.path.join(sPath, sVersionFileName), __readLatestVersion, None)
+
+def clearCache():
+	with oCacheLock:
+		dCache.clear()
+
+#### Sub Functions
+def __getAssetInfo(lTask):
+	sProject, sAsset, sStatusAsset, sPathLocal_type, sPathServer_type = lTask
+	dAsset = {'status': sStatusAsset, 'folders': {}}
+	for sType, sStatusType in compareFolders(sPathLocal_type, sPathServer_type):
+		sStatus = compareFileVersion(os.path.join(sPathLocal_type, sType), os.path.join(sPathServer_type, sType))
+		dAsset['folders'][sType] = {'status': sStatus, 'folders': {}}
+		dAsset['status'] = mergeStatus(dAsset['status'], sStatus)
+	return sProject, sAsset, dAsset
+
+def __getCatalogVersions(sProject, sRoot):
+	'''
+	{sAsset: {sType: iLatestVersion}} of the project in the catalog, -1 if no version, same as getLatestVersion
+	'''
+	dReturn = {}
+	for dType in assetCatalog.getAssetTypes(sProject, sRoot = sRoot):
+		iVersion = dType['iLatestVersion']
+		if iVersion is None:
+			iVersion = -1
+		dReturn.setdefault(dType['sAsset'], {})[dType['sType']] = iVersion
+	return dReturn
+
+def __readCached(sPath, fnRead, default):
+	try:
+		oStat = os.stat(sPath)
+	except OSError:
+		return default
+	tKey = (oStat.st_mtime, oStat.st_size)
+	with oCacheLock:
+		tCache = dCache.get(sPath, None)
+	if tCache and tCache[0] == tKey:
+		return tCache[1]
+	value = fnRead(sPath)
+	with oCacheLock:
+		dCache[sPath] = (tKey, value)
+	return value
+
+def __readFolderList(sPath):
+	return files.readJsonFile(sPath)
+
+def __readLatestVersion(sPath):
+	dAssetInfo = files.readJsonFile(sPath)
+	if dAssetInfo['versionInfo']:
+		return max([int(sKey) for sKey in dAssetInfo['versionInfo'].keys()])
+	return -1
@@ -5,51 +5,53 @@ import maya.OpenMaya as OpenMaya
 import os
 import json
 import time
+import math
 
 ## libs Import
 import files
 import maths
 import attributes
 import apiUtils
+import matrixMath
 import namingAPI.naming as naming
+import namingAPI.nameRegistry as nameRegistry
+
+## Vars
+## channels set by each transformSnap type, translate, rotate, scale
+dSnapTypes = {'parent': [True, True, False],
+			  'point': [True, False, False],
+			  'orient': [False, True, False],
+			  'scale': [False, False, True],
+			  'all': [True, True, True]}
 
 #### Functions
 def getNodeTransformInfo(sNode):
-	lPos = cmds.xform(sNode, q = True, rp = True, ws = True)
-	lRot = cmds.xform(sNode, q = True, ro = True, ws = True)
-	lScl = cmds.xform(sNode, q = True, s = True, ws = True)
-	return [lPos, lRot, lScl]
+	return getNodesTransformInfo([sNode])[0]
+
+def getNodesTransformInfo(lNodes):
+	'''
+	return [[lPos, lRot, lScl], ...] in world space, the rotate pivot, the rotation in the node's rotate order and the scale,
+	all the nodes are read in one api pass and decomposed together
+	'''
+	return [dSnapInfo['lTransformInfo'] for dSnapInfo in __getNodesSnapInfo(lNodes)]
 
 def getNodesAvgTransformInfo(lNodes, bCenterPivot = False):
+	lTransformInfos = getNodesTransformInfo(lNodes)
 	lTransformInfoAvg = []
 	for i in range(3):
-		lPos = [[],[],[]]
-		for sNode in lNodes:
-			lTransformInfo = getNodeTransformInfo(sNode)
-			for j, lTransformInfoEach in enumerate(lTransformInfo[i]):
-				lPos[j].append(lTransformInfoEach)
-		lPosAvg = []
-		for lPosEach in lPos:
-			fPosAvg = maths.getAvgValueFromList(lPosEach)
-			lPosAvg.append(fPosAvg)
-		lTransformInfoAvg.append(lPosAvg)
+		lTransformInfoAvg.append([maths.getAvgValueFromList(lValues) for lValues in zip(*[lTransformInfo[i] for lTransformInfo in lTransformInfos])])
 	if bCenterPivot:
-		lCp, lPos = getNodesPivotFromBoundingBox(lNodes)
+		lCp, lPos = getNodesPivotFromBoundingBox([lTransformInfo[0] for lTransformInfo in lTransformInfos], bPointInfo = True)
 		lTransformInfoAvg[0] = lCp
 	return lTransformInfoAvg
 
 def getNodesPivotFromBoundingBox(lNodes, bPointInfo = False):
-	lPos = [[], []]
-	for i in range(3):
-		lPosEach = []
-		for sNode in lNodes:
-			if not bPointInfo:
-				fTransformInfo = getNodeTransformInfo(sNode)[0][i]
-			else:
-				fTransformInfo = sNode[i]
-			lPosEach.append(fTransformInfo)
-		lPos[0].append(max(lPosEach))
-		lPos[1].append(min(lPosEach))
+	if bPointInfo:
+		lPnts = lNodes
+	else:
+		lPnts = [lTransformInfo[0] for lTransformInfo in getNodesTransformInfo(lNodes)]
+	lPnts = [lPnt[:3] for lPnt in lPnts]
+	lPos = [[max(lValues) for lValues in zip(*lPnts)], [min(lValues) for lValues in zip(*lPnts)]]
 	lCp = []
 	for i in range(3):
 		lCp.append((lPos[0][i] + lPos[1][i])*0.5)
@@ -57,59 +59,72 @@ def getNodesPivotFromBoundingBox(lNodes, bPointInfo = False):
 
 
 def setNodeTransform(sNode, lTransformInfo, bTranslate = True, bRotate = True, bScale = True, lSkipTranslate = None, lSkipRotate = None, lSkipScale = None):
-	lTransformInfoNode = getNodeTransformInfo(sNode)
-	if bTranslate:
-		if lSkipTranslate:
-			for i, sAxis in enumerate(['x', 'y', 'z']):
-				if sAxis in lSkipTranslate:
-					lTransformInfo[0][i] = lTransformInfoNode[0][i]
-		cmds.xform(sNode, t = lTransformInfo[0], ws = True)
-	if bRotate:
-		if lSkipRotate:
-			for i, sAxis in enumerate(['x', 'y', 'z']):
-				if sAxis in lSkipRotate:
-					lTransformInfo[1][i] = lTransformInfoNode[1][i]
-		cmds.xform(sNode, ro = lTransformInfo[1], ws = True)
-	if bScale:
-		if lSkipScale:
-			for i, sAxis in enumerate(['x', 'y', 'z']):
-				if sAxis in lSkipScale:
-					lTransformInfo[2][i] = lTransformInfoNode[2][i]
-		cmds.xform(sNode, s = lTransformInfo[2], ws = True)
+	snapNodesTransform([sNode], [lTransformInfo], bTranslate = bTranslate, bRotate = bRotate, bScale = bScale, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate, lSkipScale = lSkipScale)
+
+def snapNodesTransform(lNodes, lTransformInfos, bTranslate = True, bRotate = True, bScale = True, lSkipTranslate = None, lSkipRotate = None, lSkipScale = None):
+	'''
+	set each node to its world transform info, like cmds.xform(ws = True)
+	the nodes are read in one api pass, the local values are solved together and set in one undo chunk
+
+	lTransformInfos: [[lPos, lRot, lScl], ...] one per node, or one for all the nodes
+	lSkip: axes keeping the node's current world value, like ['x', 'z']
+	'''
+	if not lNodes:
+		return
+	if len(lTransformInfos) == 1:
+		lTransformInfos = lTransformInfos * len(lNodes)
+	lSnapInfos = __getNodesSnapInfo(lNodes)
+
+	lChannels = [[bTranslate, lSkipTranslate], [bRotate, lSkipRotate], [bScale, lSkipScale]]
+	lMatrices = []
+	for dSnapInfo, lTransformInfo in zip(lSnapInfos, lTransformInfos):
+		lTransformInfoTarget = []
+		for i, (bChannel, lSkip) in enumerate(lChannels):
+			lValues = list(dSnapInfo['lTransformInfo'][i])
+			if bChannel:
+				for j, sAxis in enumerate(['x', 'y', 'z']):
+					if not lSkip or sAxis not in lSkip:
+						lValues[j] = lTransformInfo[i][j]
+			lTransformInfoTarget.append(lValues)
+		lMatrices.append(matrixMath.composeMatrix(lTranslate = lTransformInfoTarget[0], lRotate = lTransformInfoTarget[1], lScale = lTransformInfoTarget[2], iRotateOrder = dSnapInfo['iRotateOrder']))
+	lMatricesLocal = matrixMath.getLocalMatrices(lMatrices, [dSnapInfo['lParentInverseMatrix'] for dSnapInfo in lSnapInfos])
+	lTransformInfosLocal = matrixMath.decomposeMatrices(lMatricesLocal, lRotateOrders = [dSnapInfo['iRotateOrder'] for dSnapInfo in lSnapInfos])
+
+	cmds.undoInfo(openChunk = True)
+	try:
+		for dSnapInfo, lTransformInfoLocal in zip(lSnapInfos, lTransformInfosLocal):
+			lTranslate, lRotate, lScale = lTransformInfoLocal
+			if bRotate:
+				lRotate = __removeRotateAxisAndOrient(lRotate, dSnapInfo)
+			for sAttr, bChannel, lValues in [['translate', bTranslate, lTranslate], ['rotate', bRotate, lRotate], ['scale', bScale, lScale]]:
+				if not bChannel:
+					continue
+				for j, sAxis in enumerate(['X', 'Y', 'Z']):
+					cmds.setAttr('%s.%s%s' %(dSnapInfo['sNode'], sAttr, sAxis), lValues[j])
+	finally:
+		cmds.undoInfo(closeChunk = True)
 
 def transformSnap(lNodes, sType = 'parent', sSnapType = 'oneToAll', lSkipTranslate = None, lSkipRotate = None, lSkipScale = None, bCenterPivot = True):
 	if sSnapType == 'oneToAll':
-		sDriver = lNodes[0]
+		lDrivers = lNodes[:1]
 		lDriven = lNodes[1:]
-		lTransformInfoDriver = getNodeTransformInfo(sDriver)
-		for sDriven in lDriven:
-			if sType == 'parent':
-				transformSnapParent(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate)
-			elif sType == 'point':
-				transformSnapPoint(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate)
-			elif sType == 'orient':
-				transformSnapOrient(lTransformInfoDriver, sDriven, lSkipRotate = lSkipRotate)
-			elif sType == 'scale':
-				transformSnapScale(lTransformInfoDriver, sDriven, lSkipScale = lSkipScale)
-			elif sType == 'all':
-				transformSnapAll(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate, lSkipScale = lSkipScale)
+		lTransformInfoDriver = getNodeTransformInfo(lDrivers[0])
 	elif sSnapType == 'allToOne':
 		lDrivers = lNodes[:-1]
-		sDriven = lNodes[-1]
+		lDriven = lNodes[-1:]
 		lTransformInfoDriver = getNodesAvgTransformInfo(lDrivers, bCenterPivot = bCenterPivot)
-		if sType == 'parent':
-			transformSnapParent(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate)
-		elif sType == 'point':
-			transformSnapPoint(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate)
-		elif sType == 'orient':
-			transformSnapOrient(lTransformInfoDriver, sDriven, lSkipRotate = lSkipRotate)
-		elif sType == 'scale':
-			transformSnapScale(lTransformInfoDriver, sDriven, lSkipScale = lSkipScale)
-		elif sType == 'all':
-			transformSnapAll(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate, lSkipScale = lSkipScale)
+	else:
+		return
+	lChannels = dSnapTypes.get(sType)
+	if not lChannels:
+		raise RuntimeError('%s is not a snap type, types are %s' %(sType, ', '.join(sorted(dSnapTypes.keys()))))
+	bTranslate, bRotate, bScale = lChannels
+	snapNodesTransform(lDriven, [lTransformInfoDriver], bTranslate = bTranslate, bRotate = bRotate, bScale = bScale,
+					   lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate, lSkipScale = lSkipScale)
 
 
 def createTransformNode(sName, lLockHideAttrs = [], sParent = None, iRotateOrder = 0, bVis = True, sPos = None, bInheritsTransform = True):
+	nameRegistry.checkName(sName)
 	cmds.group(empty  = True, name = sName)
 	cmds.setAttr('%s.ro' %sName, iRotateOrder)
 	cmds.setAttr('%s.v' %sName, bVis)
@@ -168,59 +183,72 @@ def getBoundingBoxInfo(sNode):
 	return fWidth, fHeight, fDepth
 
 def convertPointTransformFromObjectToWorld(lTranslate, sParent):
-	mMatrixPnt = apiUtils.createMMatrixFromTransformInfo(lTranslate = lTranslate)
-	mMatrixParent = apiUtils.createMMatrixFromTransformNode(sParent, sSpace = 'world')
-	mMatrixPntWorld = mMatrixPnt * mMatrixParent
-	lTransformInfo = apiUtils.decomposeMMatrix(mMatrixPntWorld)
-	return lTransformInfo[0]
+	lMatrixParent = cmds.getAttr('%s.worldMatrix[0]' %sParent)
+	return matrixMath.transformPoints([lTranslate], lMatrixParent)[0]
 
 def convertPointTransformFromWorldToObject(lTranslate, sParent):
-	mMatrixPnt = apiUtils.createMMatrixFromTransformInfo(lTranslate = lTranslate)
-	mMatrixParent = apiUtils.createMMatrixFromTransformNode(sParent, sSpace = 'world')
-	mMatrixPntWorld = mMatrixPnt * mMatrixParent.inverse()
-	lTransformInfo = apiUtils.decomposeMMatrix(mMatrixPntWorld)
-	return lTransformInfo[0]
+	lMatrixParent = cmds.getAttr('%s.worldMatrix[0]' %sParent)
+	return matrixMath.transformPoints([lTranslate], matrixMath.inverseMatrix(lMatrixParent))[0]
 
 #### Sub Functions
 def transformSnapPoint(lTransformInfoDriver, sDriven, lSkipTranslate = None):
-	lPos = lTransformInfoDriver[0]
-
-	lTransformInfoDriven = getNodeTransformInfo(sDriven)
-	if lSkipTranslate:
-		for i, sAxis in enumerate(['x', 'y', 'z']):
-			if sAxis in lSkipTranslate:
-				lPos[i] = lTransformInfoDriven[0][i]
-
-	cmds.xform(sDriven, t = lPos, ws = True)
+	snapNodesTransform([sDriven], [lTransformInfoDriver], bRotate = False, bScale = False, lSkipTranslate = lSkipTranslate)
 
 def transformSnapOrient(lTransformInfoDriver, sDriven, lSkipRotate = None):
-	lRot = lTransformInfoDriver[1]
-
-	lTransformInfoDriven = getNodeTransformInfo(sDriven)
-	if lSkipRotate:
-		for i, sAxis in enumerate(['x', 'y', 'z']):
-			if sAxis in lSkipRotate:
-				lRot[i] = lTransformInfoDriven[1][i]
-
-	cmds.xform(sDriven, ro = lRot, ws = True)
+	snapNodesTransform([sDriven], [lTransformInfoDriver], bTranslate = False, bScale = False, lSkipRotate = lSkipRotate)
 
 def transformSnapScale(lTransformInfoDriver, sDriven, lSkipScale = None):
-	lScl = lTransformInfoDriver[2]
-
-	lTransformInfoDriven = getNodeTransformInfo(sDriven)
-	if lSkipScale:
-		for i, sAxis in enumerate(['x', 'y', 'z']):
-			if sAxis in lSkipScale:
-				lScl[i] = lTransformInfoDriven[2][i]
-
-	cmds.xform(sDriven, s = lScl, ws = True)
+	snapNodesTransform([sDriven], [lTransformInfoDriver], bTranslate = False, bRotate = False, lSkipScale = lSkipScale)
 
 def transformSnapParent(lTransformInfoDriver, sDriven, lSkipTranslate = None, lSkipRotate = None):
-	transformSnapPoint(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate)
-	transformSnapOrient(lTransformInfoDriver, sDriven, lSkipRotate = lSkipRotate)
+	snapNodesTransform([sDriven], [lTransformInfoDriver], bScale = False, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate)
 
 def transformSnapAll(lTransformInfoDriver, sDriven, lSkipTranslate = None, lSkipRotate = None, lSkipScale = None):
-	transformSnapParent(lTransformInfoDriver, sDriven, lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate)
-	transformSnapScale(lTransformInfoDriver, sDriven, lSkipScale = lSkipScale)
-
-
+	snapNodesTransform([sDriven], [lTransformInfoDriver], lSkipTranslate = lSkipTranslate, lSkipRotate = lSkipRotate, lSkipScale = lSkipScale)
+
+def __getNodesSnapInfo(lNodes):
+	'''
+	return a dict per node, its world transform info, parent inverse matrix, rotate order, rotate axis and joint orient,
+	the world matrices are decomposed in one batch
+	'''
+	lSnapInfos = []
+	lMatrices = []
+	for sNode in lNodes:
+		## one selection list per name, a shared list drops repeated names and shifts the indices
+		mSel = OpenMaya.MSelectionList()
+		mSel.add(sNode)
+		mDagPath = OpenMaya.MDagPath()
+		mSel.getDagPath(0, mDagPath)
+		mObj = mDagPath.node()
+		mFnNode = OpenMaya.MFnDependencyNode(mObj)
+		mPnt = OpenMaya.MFnTransform(mDagPath).rotatePivot(OpenMaya.MSpace.kWorld)
+		dSnapInfo = {'mObj': mObj,
+					 'sNode': mDagPath.fullPathName(),
+					 'lPos': [mPnt.x, mPnt.y, mPnt.z],
+					 'lParentInverseMatrix': apiUtils.convertMMatrixToList(mDagPath.exclusiveMatrixInverse()),
+					 'iRotateOrder': mFnNode.findPlug('rotateOrder', False).asInt(),
+					 'lRotateAxis': [math.degrees(mFnNode.findPlug('rotateAxis' + sAxis, False).asDouble()) for sAxis in ['X', 'Y', 'Z']],
+					 'lJointOrient': None}
+		if mObj.hasFn(OpenMaya.MFn.kJoint):
+			dSnapInfo['lJointOrient'] = [math.degrees(mFnNode.findPlug('jointOrient' + sAxis, False).asDouble()) for sAxis in ['X', 'Y', 'Z']]
+		lSnapInfos.append(dSnapInfo)
+		lMatrices.append(apiUtils.convertMMatrixToList(mDagPath.inclusiveMatrix()))
+	lTransformInfos = matrixMath.decomposeMatrices(lMatrices, lRotateOrders = [dSnapInfo['iRotateOrder'] for dSnapInfo in lSnapInfos])
+	for dSnapInfo, lTransformInfo in zip(lSnapInfos, lTransformInfos):
+		dSnapInfo['lTransformInfo'] = [dSnapInfo['lPos'], lTransformInfo[1], lTransformInfo[2]]
+	return lSnapInfos
+
+def __removeRotateAxisAndOrient(lRotate, dSnapInfo):
+	'''
+	the local matrix rotation is rotateAxis * rotate * jointOrient, return the rotate part
+	'''
+	bRotateAxis = any([abs(fValue) > 1e-8 for fValue in dSnapInfo['lRotateAxis']])
+	bJointOrient = dSnapInfo['lJointOrient'] and any([abs(fValue) > 1e-8 for fValue in dSnapInfo['lJointOrient']])
+	if not bRotateAxis and not bJointOrient:
+		return lRotate
+	lMatrix = matrixMath.composeMatrix(lRotate = lRotate, iRotateOrder = dSnapInfo['iRotateOrder'])
+	if bRotateAxis:
+		lMatrix = matrixMath.multMatrix(matrixMath.inverseMatrix(matrixMath.composeMatrix(lRotate = dSnapInfo['lRotateAxis'])), lMatrix)
+	if bJointOrient:
+		lMatrix = matrixMath.multMatrix(lMatrix, matrixMath.inverseMatrix(matrixMath.composeMatrix(lRotate = dSnapInfo['lJointOrient'])))
+	return matrixMath.decomposeMatrix(lMatrix, iRotateOrder = dSnapInfo['iRotateOrder'])[1]
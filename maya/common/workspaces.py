@@ -3,10 +3,12 @@ import maya.cmds as cmds
 import maya.mel as mel
 import os
 import json
-from shutil import copyfile, rmtree, copytree
 import time
 ## libs Import
 import files
+import assetCatalog
+import fileSync
+import saveQueue
 reload(files)
 
 ## Vars
@@ -36,6 +38,7 @@ def createProject(sName):
 	for sFolder in files.lProjectFolders:
 		files.createFolder(os.path.join(sDirectory, sFolder))
 		writeFolderListFile(sDirectory, sFolder)
+	assetCatalog.addProject(sName)
 	setProject(sDirectory)
 	return sDirectory
 
@@ -60,6 +63,7 @@ def createAsset(sAsset, sProject = None):
 	## create asset folder
 	sAssetDir, sAssetWipDir = getAssetDirectory(sProject = sProject, sAsset = sAsset)
 	files.createFolder(sAssetDir)
+	assetCatalog.addAsset(sProject, sAsset)
 	setProject(sAssetDir)
 
 def createAssetType(sAsset, sProject = None, sType = 'model'):
@@ -94,24 +98,36 @@ def createAssetType(sAsset, sProject = None, sType = 'model'):
 			files.createFolder(sWipDir)
 
 	createVersionFile(sAsset, sType, sProject, sAssetDir)
+	assetCatalog.updateAssetType(sProject, sAsset, sType)
 
 
 			
 
-def saveAsset(sAsset, sType, sProject, sTag = None, sComment = None):
+def saveAsset(sAsset, sType, sProject, sTag = None, sComment = None, bBackground = True):
+	'''
+	save the scene, then the wip copy, backup pruning and version bookkeeping run as a save job,
+	on the saveQueue worker thread if bBackground, the job journal makes it resumable
+	'''
 	fStartTime = time.time()
 
 	sDirectory, sWipDirectory = getAssetDirectory(sProject = sProject, sAsset = sAsset, sType = sType)
 
+	# a failed save job would reuse or overwrite this version, it has to be resumed or discarded first
+	lFailedJobs = saveQueue.getFailedJobs(sDirectory = sDirectory)
+	if lFailedJobs:
+		raise RuntimeError('save job %s did not finish, resume or discard it before saving %s again' %(lFailedJobs[0]['sName'], sDirectory))
+
 	# check if wip folder exists, create folder if not exists
 	files.createFolder(sWipDirectory)
 
-	# check if versionInfo file exists, create one if not
-	if not os.path.isfile(os.path.join(sDirectory, 'assetInfo.version')):
-		createVersionFile(sAsset, sType, sProject, sDirectory)
-		cmds.warning('assetInfo.version did not exist, created the file')
-
-	dAssetInfo = files.readJsonFile(os.path.join(sDirectory, 'assetInfo.version'))
+	# a queued save is not written yet, continue from its asset info
+	dAssetInfo = saveQueue.getPendingAssetInfo(sDirectory)
+	if dAssetInfo is None:
+		# check if versionInfo file exists, create one if not
+		if not os.path.isfile(os.path.join(sDirectory, 'assetInfo.version')):
+			createVersionFile(sAsset, sType, sProject, sDirectory)
+			cmds.warning('assetInfo.version did not exist, created the file')
+		dAssetInfo = files.readJsonFile(os.path.join(sDirectory, 'assetInfo.version'))
 
 	dVersions = dAssetInfo['versionInfo']
 	lVersions = []
@@ -140,25 +156,37 @@ def saveAsset(sAsset, sType, sProject, sTag = None, sComment = None):
 	if sType == 'model':
 		cmds.file(rename = os.path.join(sDirectory, '%s%s' %(sFileName, sFileType)))
 		cmds.file(save = True, f = True)
-
-	if iVersions >= iBackup:
-		iMin = str(min(lVersions))
-		sBackUpName = dVersions[iMin]['sVersionName']
-		dVersions.pop(iMin, None)       
-		os.remove(os.path.join(sWipDirectory, '%s%s' %(sBackUpName, sFileType)))
-
-	dVersionCurrent = {iVersionCurrent: {'sVersionName': sFileName, 'sComment': sComment, 'sFileType': sFileType}}
-	dVersions.update(dVersionCurrent)
-	files.writeJsonFile(os.path.join(sDirectory, 'assetInfo.version'), dAssetInfo)
-
-	if sType == 'model':
-		copyfile(os.path.join(sDirectory, '%s%s'%(sFileName, sFileType)), os.path.join(sWipDirectory, '%s%s'%(sFileName, sFileType)))
 	elif sType == 'rig':
 		cmds.file(rename = os.path.join(sWipDirectory, '%s%s' %(sFileName, sFileType)))
 		cmds.file(save = True, f = True)
 
-	if os.path.exists(os.path.join(sDirectory, sFileDelete)):
-		os.remove(os.path.join(sDirectory, sFileDelete))
+	lSteps = []
+	if sType == 'model':
+		lSteps.append(['copy', os.path.join(sDirectory, '%s%s'%(sFileName, sFileType)), os.path.join(sWipDirectory, '%s%s'%(sFileName, sFileType))])
+
+	lBackUpFiles = []
+	if iVersions >= iBackup:
+		iMin = str(min(lVersions))
+		sBackUpName = dVersions[iMin]['sVersionName']
+		dVersions.pop(iMin, None)
+		lBackUpFiles.append(os.path.join(sWipDirectory, '%s%s' %(sBackUpName, sFileType)))
+
+	# keys are strings once written to json
+	dVersions[str(iVersionCurrent)] = {'sVersionName': sFileName, 'sComment': sComment, 'sFileType': sFileType}
+
+	# version file goes before removing any file, an interrupted job never points to a removed file
+	lSteps.append(['writeJson', os.path.join(sDirectory, 'assetInfo.version'), dAssetInfo])
+	for sBackUpFile in lBackUpFiles:
+		lSteps.append(['remove', sBackUpFile])
+	if sFileDelete != '%s%s' %(sFileName, sFileType):
+		lSteps.append(['remove', os.path.join(sDirectory, sFileDelete)])
+	lSteps.append(['catalog', sProject, sAsset, sType, dAssetInfo])
+
+	dJob = saveQueue.createJob('%s_%s_v%03d' %(sAsset, sType, iVersionCurrent), lSteps, sDirectory = sDirectory, iVersion = iVersionCurrent, sVersionName = sFileName)
+	if bBackground:
+		saveQueue.addJob(dJob, sDirectory = sDirectory, dAssetInfo = dAssetInfo)
+	else:
+		saveQueue.runJob(dJob)
 
 	setProject(sDirectory)
 
@@ -195,6 +223,7 @@ def loadAsset(sProject, sAsset, sType, iVersion = 0, sLoadType = 'open', sNamesp
 
 def renameProject(sProject, sName):
 	fStartTime = time.time()
+	saveQueue.waitForJobs()
 	# rename version file's sProject
 	lVersionFiles = getVersionFiles(sProject)
 	if lVersionFiles:
@@ -207,6 +236,7 @@ def renameProject(sProject, sName):
 
 	# write file list
 	writeFolderListFile(sPathLocal, sName, sReplace = sProject)
+	assetCatalog.renameProject(sProject, sName)
 
 	fEndTime = time.time()
 	print 'renamed %s to %s, took %f seconds' %(sProject, sName, fEndTime - fStartTime)
@@ -214,9 +244,11 @@ def renameProject(sProject, sName):
 
 def renameAsset(sProject, sAsset, sName):
 	fStartTime = time.time()
+	saveQueue.waitForJobs()
 
 	#rename asset
 	sDirectory, sWipDirectory = getAssetDirectory(sProject = sProject, sAsset = sAsset)
+	lVersionFiles = getVersionFiles(sProject, sAsset = sAsset)
 	for sVersionFile in lVersionFiles:
 		sDirectoryAsset = os.path.dirname(sVersionFile)
 		sWipDirectoryAsset = os.path.join(sDirectoryAsset, 'wipFiles')
@@ -248,6 +280,7 @@ def renameAsset(sProject, sAsset, sName):
 	# write file list
 	sDirectory, sWipDirectory = getAssetDirectory(sProject = sProject)
 	writeFolderListFile(sDirectory, sName, sReplace = sAsset)
+	assetCatalog.renameAsset(sProject, sAsset, sName)
 
 	fEndTime = time.time()
 	print 'renamed %s to %s, took %f seconds' %(sAsset, sName, fEndTime - fStartTime)
@@ -258,6 +291,7 @@ def checkCurrentSceneModified():
 
 def syncAsset(sProject, sAsset, sType, sMode = 'server'):
 	fStartTime = time.time()
+	saveQueue.waitForJobs()
 
 	if sMode == 'server':
 		sPathSync = sPathServer
@@ -282,10 +316,13 @@ def syncAsset(sProject, sAsset, sType, sMode = 'server'):
 			sPathSourceType = os.path.join(sPathSourceAsset, sAsset)
 			syncFolder(sPathType, sPathSourceType, sType)
 			if os.path.exists(os.path.join(sPathType, sType)):
-				rmtree(os.path.join(sPathType, sType))
-
 				sPathTypeSync, sPathTemp = getAssetDirectory(sProject = sProject, sAsset = sAsset, sType = sType, sMode = sModeSource)
-				copytree(sPathTypeSync, os.path.join(sPathType, sType))
+				fileSync.syncFolder(sPathTypeSync, os.path.join(sPathType, sType))
+			assetCatalog.updateAssetType(sProject, sAsset, sType, sRoot = sPathSync)
+		else:
+			assetCatalog.addAsset(sProject, sAsset, sRoot = sPathSync)
+	else:
+		assetCatalog.addProject(sProject, sRoot = sPathSync)
 
 	fEndTime = time.time()
 	sSyncName = ''
@@ -382,9 +419,11 @@ def writeFolderListFile(sPath, sName, sReplace = None, bRemove = False):
 	files.writeJsonFile(sFolderListPath, lFolders)
 
 def deleteWorkspaceFolderFromPath(sPath, sFolder):
+	saveQueue.waitForJobs()
 	sFolderListPath = os.path.join(sPath, sFolderListName)
 	writeFolderListFile(sPath, sFolder, bRemove = True)
 	files.deleteFolderFromPath(os.path.join(sPath, sFolder))
+	assetCatalog.removeFolder(os.path.join(sPath, sFolder))
 
 def getFoldersFromFolderList(sPath, bCreate = False):
 	sFolderListPath = os.path.join(sPath, sFolderListName)
@@ -396,8 +435,25 @@ def getFoldersFromFolderList(sPath, bCreate = False):
 		lFolders = files.readJsonFile(sFolderListPath)
 	return lFolders
 
+def getWorkspaceFolders(sPath):
+	'''
+	the folders under a workspace path from the asset catalog, read from the folder list file if the path is not cataloged
+	'''
+	lFolders = None
+	if assetCatalog.ensureCatalog():
+		lFolders = assetCatalog.getFolders(sPath)
+	if lFolders is None:
+		lFolders = getFoldersFromFolderList(sPath)
+	return lFolders
+
 def getVersionFiles(sProject, sAsset = None, sType = None):
 	lReturn = []
+	if assetCatalog.ensureCatalog():
+		for dType in assetCatalog.getAssetTypes(sProject, sAsset = sAsset, sType = sType):
+			sVersionFilePath = os.path.join(sPathLocal, dType['sPath'], 'assetInfo.version')
+			if os.path.exists(sVersionFilePath):
+				lReturn.append(sVersionFilePath)
+		return lReturn
 	sDir, sTemp = getAssetDirectory(sProject = sProject, sAsset = sAsset, sType = sType)
 	if sAsset and sType:
 		sVersionFilePath = os.path.join(sDir, 'assetInfo.version')
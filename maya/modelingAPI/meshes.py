@@ -2,10 +2,19 @@
 import maya.cmds as cmds
 import maya.mel as mel
 import maya.OpenMaya as OpenMaya
+import os
+import hashlib
 
 ## libs Import
 import common.apiUtils as apiUtils
 import common.debug as debug
+import common.spatialIndex as spatialIndex
+import common.files as files
+
+## Vars
+dSymmetryAxis = {'YZ': 0, 'XZ': 1, 'XY': 2}
+sSymmetryCacheFolder = 'meshSymmetryMaps'
+
 #### Functions
 
 def getShape(sNode, bIntermediate = False):
@@ -47,26 +56,25 @@ def getMeshVtxPntArray(sMesh, sSpace = 'object'):
 	mFnMesh.getPoints(mVtxPntArray, mSpace)
 	return mVtxPntArray
 
-def remapVtxIdToMesh(sTargetMesh, sBaseMesh = None, lVtxPosBase = None, fTolerance = 0.00001):
-	lComponents = []
+def remapVtxIdToMesh(sTargetMesh, sBaseMesh = None, lVtxPosBase = None, fTolerance = 0.00001, bClosest = True):
+	'''
+	find the base vertex id for each target vertex by position
+
+	return lComponents, lUnmatched
+	lComponents: base vertex id of each target vertex, vertices without a base vertex within
+				 fTolerance get the closest base vertex if bClosest, otherwise None
+	lUnmatched: target vertex ids without a base vertex within fTolerance
+	'''
 	mVtxPntArrayTargt = getMeshVtxPntArray(sTargetMesh)
+	lVtxPosTarget = apiUtils.convertMPointArrayToList(mVtxPntArrayTargt)
 	if not lVtxPosBase:
 		mVtxPntArrayBase = getMeshVtxPntArray(sBaseMesh)
 		lVtxPosBase = apiUtils.convertMPointArrayToList(mVtxPntArrayBase)
 
-	for i in range(mVtxPntArrayTargt.length()):
-		fPntX = mVtxPntArrayTargt[i].x
-		fPntY = mVtxPntArrayTargt[i].y
-		fPntZ = mVtxPntArrayTargt[i].z
-
-		for j, lPntBase in enumerate(lVtxPosBase):
-			bPntX = (lPntBase[0] >= fPntX - fTolerance and lPntBase[0] <= fPntX + fTolerance)
-			bPntY = (lPntBase[1] >= fPntY - fTolerance and lPntBase[1] <= fPntY + fTolerance)
-			bPntZ = (lPntBase[2] >= fPntZ - fTolerance and lPntBase[2] <= fPntZ + fTolerance)
-			if bPntX and bPntY and bPntZ:
-				lComponents.append(j)
-				break
-	return lComponents
+	lComponents, lUnmatched = spatialIndex.remapPoints(lVtxPosTarget, lVtxPosBase, fTolerance = fTolerance, bClosest = bClosest)
+	if lUnmatched:
+		cmds.warning('%d vertices of %s have no matched vertex within tolerance %s' %(len(lUnmatched), sTargetMesh, fTolerance))
+	return lComponents, lUnmatched
 
 def getMeshesFromGrp(sGrp):
 	lMeshes = []
@@ -137,165 +145,84 @@ def getClosestVtxInMesh(lPos, sMesh):
 
 
 def meshSymmetrical(sMesh, sBaseMesh, sAxis = 'YZ', iDirection = 1, fTolerance = 0.00001, sSymmtrical = 'world', bMirrorMesh = True, bCheck = False):
-	if sSymmtrical == 'world' or sSymmtrical == 'object':
-		bSymmetrical, lPnts_source, lPnts_target, lPnts_middle = __meshVtxSymRemap(sBaseMesh, sAxis = sAxis, iDirection = iDirection, fTolerance = fTolerance, sSpace = sSymmtrical)
-	else:
-		pass
-
 	if sSymmtrical == 'world':
 		sSpace = 'world'
 		mSpace = OpenMaya.MSpace.kWorld 
 	else:
 		sSpace = 'object'
 		mSpace = OpenMaya.MSpace.kObject
-		
+
+	bSymmetrical, lPnts_source, lPnts_target, lPnts_middle = getMeshSymmetryMap(sBaseMesh, sAxis = sAxis, iDirection = iDirection, fTolerance = fTolerance, sSpace = sSpace)
+	iAxis = dSymmetryAxis[sAxis]
+
 	lPnts_nonSym = []
 	mVtxPntArray = getMeshVtxPntArray(sMesh, sSpace = sSpace)
 	mFnMesh = __setMFnMesh(sMesh)
-	iLength_sym = len(lPnts_source)
-	if not bCheck:
-		for i, iVtx in enumerate(lPnts_source):
-			print 'symmetrical check %f' %((i + 1)/float(iLength_sym))
-			if iVtx:
-				fPntX = mVtxPntArray[iVtx].x
-				fPntY = mVtxPntArray[iVtx].y
-				fPntZ = mVtxPntArray[iVtx].z
-
-				iVtx_mirror = lPnts_target[i]
-				if iVtx_mirror != None:
-					fPntX_target = mVtxPntArray[iVtx_mirror].x
-					fPntY_target = mVtxPntArray[iVtx_mirror].y
-					fPntZ_target = mVtxPntArray[iVtx_mirror].z
-
-					fPntX_source = fPntX
-					fPntY_source = fPntY
-					fPntZ_source = fPntZ
-
-					if sAxis == 'YZ':
-						fPntX_source = -fPntX
-					elif sAxis == 'XZ':
-						fPntY_source = -fPntY
-					else:
-						fPntZ_source = -fPntZ
-
-					mVtxPntArray[iVtx_mirror].x = fPntX_source
-					mVtxPntArray[iVtx_mirror].y = fPntY_source
-					mVtxPntArray[iVtx_mirror].z = fPntZ_source
-
-	else:
-		for i, iVtx in enumerate(lPnts_source):
-			print 'symmetrical check %f' %((i + 1)/float(iLength_sym))
-			if iVtx:
-				fPntX = mVtxPntArray[iVtx].x
-				fPntY = mVtxPntArray[iVtx].y
-				fPntZ = mVtxPntArray[iVtx].z
-
-				iVtx_mirror = lPnts_target[i]
-				if iVtx_mirror != None:
-					fPntX_target = mVtxPntArray[iVtx_mirror].x
-					fPntY_target = mVtxPntArray[iVtx_mirror].y
-					fPntZ_target = mVtxPntArray[iVtx_mirror].z
-
-					fPntX_source = fPntX
-					fPntY_source = fPntY
-					fPntZ_source = fPntZ
-
-					if sAxis == 'YZ':
-						fPntX_source = -fPntX
-					elif sAxis == 'XZ':
-						fPntY_source = -fPntY
-					else:
-						fPntZ_source = -fPntZ
-
-					bPntX = (fPntX_source >= fPntX_target - fTolerance and fPntX_source <= fPntX_target + fTolerance)
-					bPntY = (fPntY_source >= fPntY_target - fTolerance and fPntY_source <= fPntY_target + fTolerance)
-					bPntZ = (fPntZ_source >= fPntZ_target - fTolerance and fPntZ_source <= fPntZ_target + fTolerance)
-
-					if not bPntX or not bPntY or not bPntZ:
-						lPnts_nonSym.append(iVtx)
-
-						mVtxPntArray[iVtx_mirror].x = fPntX_source
-						mVtxPntArray[iVtx_mirror].y = fPntY_source
-						mVtxPntArray[iVtx_mirror].z = fPntZ_source
+	for iVtx, iVtx_mirror in zip(lPnts_source, lPnts_target):
+		if iVtx is None or iVtx_mirror is None:
+			continue
+		mPnt = mVtxPntArray[iVtx]
+		lPnt_source = [mPnt.x, mPnt.y, mPnt.z]
+		lPnt_source[iAxis] = -lPnt_source[iAxis]
+
+		if bCheck:
+			mPnt_target = mVtxPntArray[iVtx_mirror]
+			lPnt_target = [mPnt_target.x, mPnt_target.y, mPnt_target.z]
+			bSym = True
+			for i in range(3):
+				if abs(lPnt_source[i] - lPnt_target[i]) > fTolerance:
+					bSym = False
+					break
+			if bSym:
+				continue
+			lPnts_nonSym.append(iVtx)
+
+		mVtxPntArray.set(OpenMaya.MPoint(lPnt_source[0], lPnt_source[1], lPnt_source[2]), iVtx_mirror)
 
 	if bMirrorMesh:
 		mFnMesh.setPoints(mVtxPntArray, mSpace)
 
 	return lPnts_nonSym
 
-#### Sub Functions
-def __setMFnMesh(sMesh):
-	mDagPath, mComponents = apiUtils.setDagPath(sMesh)
-	mFnMesh = OpenMaya.MFnMesh(mDagPath)
-	return mFnMesh
-
-def __meshVtxSymRemap(sMesh, sAxis = 'YZ', iDirection = 1, fTolerance = 0.00001, sSpace = 'world'):
+def getMeshSymmetryMap(sMesh, sAxis = 'YZ', iDirection = 1, fTolerance = 0.00001, sSpace = 'world', bCache = True):
+	'''
+	return bSymmetrical, lPnts_source, lPnts_target, lPnts_middle
+	the map is cached on disk, keyed by the mesh topology and point positions
+	'''
 	mVtxPntArray = getMeshVtxPntArray(sMesh, sSpace = sSpace)
+	lVtxPos = apiUtils.convertMPointArrayToList(mVtxPntArray)
 
-	lPnts_source = []
-	lPnts_middle = []
-	lPnts_target = []
-	lPnts_temp = []
-	bSymmetrical = True
-
-	iLength = mVtxPntArray.length()
-	for i in range(iLength):
-
-		print 'initialize mesh %f' %((i+1)/float(iLength))
-
-		fPntX = mVtxPntArray[i].x
-		fPntY = mVtxPntArray[i].y
-		fPntZ = mVtxPntArray[i].z
-
-		if sAxis == 'YZ':
-			fAxis = fPntX
-		elif sAxis == 'XZ':
-			fAxis = fPntY
-		else:
-			fAxis = fPntZ
-
-		if fAxis == 0:
-			lPnts_middle.append(i)
-		elif iDirection == 1:
-			if fAxis > 0:
-				lPnts_source.append(i)
-			else:
-				lPnts_temp.append(i)
-		elif iDirection == -1:
-			if fAxis < 0:
-				lPnts_source.append(i)
-			else:
-				lPnts_temp.append(i)
-
-	iLength_remap = len(lPnts_source)
-	for i, iVtx in enumerate(lPnts_source):
-
-		print'remap mesh vtx %f' %((i+1)/float(iLength_remap))
-
-		fPntX = mVtxPntArray[iVtx].x
-		fPntY = mVtxPntArray[iVtx].y
-		fPntZ = mVtxPntArray[iVtx].z
-
-		if sAxis == 'YZ':
-			lPos = [-fPntX, fPntY, fPntZ]
-		elif sAxis == 'XZ':
-			lPos = [fPntX, -fPntY, fPntZ]
-		else:
-			lPos = [-fPntX, fPntY, -fPntZ]
+	sCachePath = None
+	if bCache:
+		sHash = __getMeshHash(sMesh, lVtxPos, '%s_%d_%s' %(sAxis, iDirection, repr(fTolerance)))
+		sCacheDir = os.path.join(cmds.internalVar(userTmpDir = True), sSymmetryCacheFolder)
+		sCachePath = os.path.join(sCacheDir, '%s.json' %sHash)
+		if os.path.isfile(sCachePath):
+			return tuple(files.readJsonFile(sCachePath))
 
-		bSymmetrical_pnt = False
-		iVtxClst, lPosClst, fDisClst = getClosestVtxInMesh(lPos, sMesh)
+	lSymmetryMap = spatialIndex.buildSymmetryMap(lVtxPos, iAxis = dSymmetryAxis[sAxis], iDirection = iDirection, fTolerance = fTolerance)
 
-		if fDisClst > -fTolerance and fDisClst < fTolerance:
-			lPnts_target.append(iVtxClst)
-		else:
-			lPnts_target.append(None)
-			bSymmetrical = False
+	if sCachePath:
+		if not os.path.exists(sCacheDir):
+			os.makedirs(sCacheDir)
+		files.writeJsonFile(sCachePath, lSymmetryMap)
+	return lSymmetryMap
 
-	for j in lPnts_temp:
-		if j not in lPnts_target:
-			lPnts_target.append(j)
-			lPnts_source.append(None)
-			bSymmetrical = False
+#### Sub Functions
+def __setMFnMesh(sMesh):
+	mDagPath, mComponents = apiUtils.setDagPath(sMesh)
+	mFnMesh = OpenMaya.MFnMesh(mDagPath)
+	return mFnMesh
 
-	return bSymmetrical, lPnts_source, lPnts_target, lPnts_middle
\ No newline at end of file
+def __getMeshHash(sMesh, lVtxPos, sExtra = ''):
+	mFnMesh = __setMFnMesh(sMesh)
+	mPolyCounts = OpenMaya.MIntArray()
+	mPolyConnects = OpenMaya.MIntArray()
+	mFnMesh.getVertices(mPolyCounts, mPolyConnects)
+	oHash = hashlib.md5()
+	oHash.update(sExtra)
+	for mIntArray in [mPolyCounts, mPolyConnects]:
+		oHash.update(','.join([str(mIntArray[i]) for i in range(mIntArray.length())]))
+		oHash.update(';')
+	oHash.update(','.join(['%.6f,%.6f,%.6f' %(lPnt[0], lPnt[1], lPnt[2]) for lPnt in lVtxPos]))
+	return oHash.hexdigest()
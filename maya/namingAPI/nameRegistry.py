@@ -0,0 +1,219 @@
+## External Import
+import maya.cmds as cmds
+import maya.OpenMaya as OpenMaya
+
+## libs Import
+import naming
+
+## Vars
+## registry of the scene node short names, seeded with one cmds.ls,
+## then kept up to date by node added/removed/renamed callbacks
+dNames = {}
+dFamilies = {}
+## current name of the nodes seen by the callbacks, {MObjectHandle hash: sName},
+## a node may be added under a temp name and renamed right after
+dNodes = {}
+dState = {'bSeeded': False}
+lCallbackIds = []
+## functions called on a new or opened scene, for other modules' scene caches
+lSceneChangedCallbacks = []
+
+class oNameIndex(object):
+	'''
+	index and suffix counts of all the names of one (type, side, part)
+	'''
+	def __init__(self):
+		super(oNameIndex, self).__init__()
+		self.dNames = {}
+		self.dIndices = {}
+		self.iIndexMax = 0
+		self.dSuffixMax = {}
+
+	def add(self, sName, iIndex, iSuffix):
+		self.dNames[sName] = (iIndex, iSuffix)
+		iIndex = iIndex or 0
+		self.dIndices[iIndex] = self.dIndices.get(iIndex, 0) + 1
+		self.iIndexMax = max(self.iIndexMax, iIndex)
+		if iSuffix:
+			self.dSuffixMax[iIndex] = max(self.dSuffixMax.get(iIndex, 0), iSuffix)
+
+	def remove(self, sName):
+		iIndex, iSuffix = self.dNames.pop(sName)
+		iIndex = iIndex or 0
+		self.dIndices[iIndex] -= 1
+		if not self.dIndices[iIndex]:
+			self.dIndices.pop(iIndex)
+			if iIndex == self.iIndexMax:
+				self.iIndexMax = max(self.dIndices.keys() + [0])
+		if iSuffix and iSuffix == self.dSuffixMax.get(iIndex, 0):
+			lSuffix = [tName[1] for tName in self.dNames.values() if (tName[0] or 0) == iIndex and tName[1]]
+			self.dSuffixMax[iIndex] = max(lSuffix + [0])
+
+#### Functions
+def seed(bForce = False):
+	'''
+	index all the node names in the scene, install the callbacks on the first call
+	'''
+	if dState['bSeeded'] and not bForce:
+		return
+	dNames.clear()
+	dFamilies.clear()
+	dNodes.clear()
+	for sNode in cmds.ls(shortNames = True) or []:
+		__add(sNode.split('|')[-1])
+	if not lCallbackIds:
+		__addCallbacks()
+	dState['bSeeded'] = True
+
+def reset():
+	'''
+	drop the registry, the next query seeds it again
+	'''
+	dNames.clear()
+	dFamilies.clear()
+	dNodes.clear()
+	dState['bSeeded'] = False
+
+def addSceneChangedCallback(fnCallback):
+	'''
+	call fnCallback() before a new or opened scene, a reloaded module's callback replaces the one registered before
+	'''
+	for fnCallbackEach in list(lSceneChangedCallbacks):
+		if getattr(fnCallbackEach, '__module__', None) == getattr(fnCallback, '__module__', None) and getattr(fnCallbackEach, '__name__', None) == getattr(fnCallback, '__name__', None):
+			lSceneChangedCallbacks.remove(fnCallbackEach)
+	lSceneChangedCallbacks.append(fnCallback)
+
+def removeCallbacks():
+	for iCallbackId in lCallbackIds:
+		OpenMaya.MMessage.removeCallback(iCallbackId)
+	del lCallbackIds[:]
+	reset()
+
+def exists(sName):
+	'''
+	memory version of cmds.objExists for node names, paths and plugs still ask maya
+	'''
+	if '|' in sName or '.' in sName:
+		return cmds.objExists(sName)
+	seed()
+	return sName in dNames
+
+def isUnique(sName):
+	seed()
+	return dNames.get(sName, 0) < 2
+
+def checkName(sName):
+	'''
+	raise if a node with the short name exists, call it before creating a node
+	'''
+	if exists(sName):
+		raise RuntimeError('%s already exists in the scene' %sName)
+
+def getNextIndex(sType = None, sSide = None, sPart = None):
+	'''
+	next index after the biggest one used by (type, side, part)
+	'''
+	seed()
+	oIndex = dFamilies.get(__getFamilyKey(sType, sSide, sPart), None)
+	if oIndex:
+		return oIndex.iIndexMax + 1
+	return 1
+
+def getNextSuffix(sType = None, sSide = None, sPart = None, iIndex = None):
+	'''
+	next suffix after the biggest one used by (type, side, part, index)
+	'''
+	seed()
+	oIndex = dFamilies.get(__getFamilyKey(sType, sSide, sPart), None)
+	if oIndex:
+		return oIndex.dSuffixMax.get(iIndex or 0, 0) + 1
+	return 1
+
+def getNames(sPart, sType = None, sSide = None):
+	'''
+	all the names of the part, filtered by type and side if given
+	'''
+	seed()
+	sTypeKey = naming.getKeyFromNamePart(sType, 'type')
+	sSideKey = naming.getKeyFromNamePart(sSide, 'side')
+	lNames = []
+	for tKey, oIndex in dFamilies.items():
+		if tKey[2] != sPart or (sType and tKey[0] != sTypeKey) or (sSide and tKey[1] != sSideKey):
+			continue
+		lNames += oIndex.dNames.keys()
+	lNames.sort()
+	return lNames
+
+def getDuplicatedNames():
+	seed()
+	return sorted([sName for sName, iCount in dNames.items() if iCount > 1])
+
+#### Sub Functions
+def __getFamilyKey(sType, sSide, sPart):
+	return (naming.getKeyFromNamePart(sType, 'type'), naming.getKeyFromNamePart(sSide, 'side'), sPart)
+
+def __add(sName):
+	dNames[sName] = dNames.get(sName, 0) + 1
+	oParts = __parse(sName)
+	if oParts:
+		tKey = (oParts.sType, oParts.sSide, oParts.sPart)
+		if tKey not in dFamilies:
+			dFamilies[tKey] = oNameIndex()
+		if sName not in dFamilies[tKey].dNames:
+			dFamilies[tKey].add(sName, oParts.iIndex, oParts.iSuffix)
+
+def __remove(sName):
+	iCount = dNames.get(sName, 0)
+	if iCount > 1:
+		dNames[sName] = iCount - 1
+		return
+	dNames.pop(sName, None)
+	oParts = __parse(sName)
+	if oParts:
+		tKey = (oParts.sType, oParts.sSide, oParts.sPart)
+		if tKey in dFamilies and sName in dFamilies[tKey].dNames:
+			dFamilies[tKey].remove(sName)
+			if not dFamilies[tKey].dNames:
+				dFamilies.pop(tKey)
+
+def __parse(sName):
+	try:
+		return naming.parse(sName)
+	except (RuntimeError, ValueError):
+		return None
+
+def __addCallbacks():
+	lCallbackIds.append(OpenMaya.MDGMessage.addNodeAddedCallback(__nodeAdded, 'dependNode'))
+	lCallbackIds.append(OpenMaya.MDGMessage.addNodeRemovedCallback(__nodeRemoved, 'dependNode'))
+	lCallbackIds.append(OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), __nameChanged))
+	## a new or opened scene is seeded again on the next query, instead of one callback per loaded node
+	for iMessage in [OpenMaya.MSceneMessage.kBeforeNew, OpenMaya.MSceneMessage.kBeforeOpen]:
+		lCallbackIds.append(OpenMaya.MSceneMessage.addCallback(iMessage, __sceneChanged))
+
+def __nodeAdded(mObj, clientData):
+	if dState['bSeeded']:
+		sName = OpenMaya.MFnDependencyNode(mObj).name()
+		dNodes[OpenMaya.MObjectHandle(mObj).hashCode()] = sName
+		__add(sName)
+
+def __nodeRemoved(mObj, clientData):
+	if dState['bSeeded']:
+		sName = dNodes.pop(OpenMaya.MObjectHandle(mObj).hashCode(), None)
+		if sName is None:
+			sName = OpenMaya.MFnDependencyNode(mObj).name()
+		__remove(sName)
+
+def __nameChanged(mObj, sNamePrevious, clientData):
+	if dState['bSeeded']:
+		iHash = OpenMaya.MObjectHandle(mObj).hashCode()
+		sNamePrevious = dNodes.get(iHash, sNamePrevious)
+		if sNamePrevious:
+			__remove(sNamePrevious)
+		sName = OpenMaya.MFnDependencyNode(mObj).name()
+		dNodes[iHash] = sName
+		__add(sName)
+
+def __sceneChanged(clientData):
+	reset()
+	for fnCallback in list(lSceneChangedCallbacks):
+		fnCallback()
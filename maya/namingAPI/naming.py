@@ -1,5 +1,122 @@
 import namingDict
 reload(namingDict)
+
+iNameCacheSize = 50000
+
+class oLruCache(object):
+	'''
+	approximate lru cache with two dict generations,
+	hits in the old generation are promoted, the old generation is dropped when the new one is full
+	'''
+	def __init__(self, iSize = iNameCacheSize):
+		super(oLruCache, self).__init__()
+		self.iSize = iSize
+		self.dCache = {}
+		self.dCacheOld = {}
+		self.iHit = 0
+		self.iMiss = 0
+
+	def get(self, key, default = None):
+		if key in self.dCache:
+			self.iHit += 1
+			return self.dCache[key]
+		if key in self.dCacheOld:
+			self.iHit += 1
+			value = self.dCacheOld[key]
+			self.set(key, value)
+			return value
+		self.iMiss += 1
+		return default
+
+	def set(self, key, value):
+		if len(self.dCache) >= self.iSize:
+			self.dCacheOld = self.dCache
+			self.dCache = {}
+		self.dCache[key] = value
+
+	def clear(self):
+		self.dCache = {}
+		self.dCacheOld = {}
+		self.iHit = 0
+		self.iMiss = 0
+
+class oNameParts(tuple):
+	'''
+	immutable parsed name, (sType, sSide, sRes, sPart, iIndex, iSuffix) with short name keys,
+	safe to share between oName objects and the parse cache
+	'''
+	__slots__ = ()
+
+	def __new__(cls, sType = None, sSide = None, sRes = None, sPart = None, iIndex = None, iSuffix = None):
+		return tuple.__new__(cls, (sType, sSide, sRes, sPart, iIndex, iSuffix))
+
+	@property
+	def sType(self):
+		return self[0]
+
+	@property
+	def sSide(self):
+		return self[1]
+
+	@property
+	def sRes(self):
+		return self[2]
+
+	@property
+	def sPart(self):
+		return self[3]
+
+	@property
+	def iIndex(self):
+		return self[4]
+
+	@property
+	def iSuffix(self):
+		return self[5]
+
+	@property
+	def sName(self):
+		return compose(*self)
+
+	def __repr__(self):
+		return 'oNameParts(sType=%r, sSide=%r, sRes=%r, sPart=%r, iIndex=%r, iSuffix=%r)' %self
+
+class oNameFamily(object):
+	'''
+	all the names derived from one (side, part, index), templates are in namingDict.dNameFamilies
+	names are attributes, like oFamily.sZero, numbered names are tuples, like oFamily.lStacks
+	'''
+	__slots__ = ('sFamily', 'sSide', 'sPart', 'iIndex', 'dNames')
+
+	def __init__(self, sFamily, sSide, sPart, iIndex, dNames):
+		self.sFamily = sFamily
+		self.sSide = sSide
+		self.sPart = sPart
+		self.iIndex = iIndex
+		self.dNames = dNames
+
+	def __getattr__(self, sKey):
+		try:
+			return self.dNames[sKey]
+		except KeyError:
+			raise AttributeError('name family %s has no %s' %(self.sFamily, sKey))
+
+	def getNames(self):
+		'''
+		return all the names as a flat list
+		'''
+		lNames = []
+		for sKey in sorted(self.dNames.keys()):
+			if isinstance(self.dNames[sKey], tuple):
+				lNames += self.dNames[sKey]
+			else:
+				lNames.append(self.dNames[sKey])
+		return lNames
+
+oParseCache = oLruCache()
+oComposeCache = oLruCache()
+oFamilyCache = oLruCache(iSize = 5000)
+
 class oName(object):
 	'''
 	a naming wrapper
@@ -92,101 +209,167 @@ class oName(object):
 
 	@property
 	def sName(self):
-		sName = self.composeName(self.__sType, self.__sSide, self.__sRes, self.sPart, self.iIndex, self.iSuffix)
+		sName = compose(self.__sType, self.__sSide, self.__sRes, self.sPart, self.iIndex, self.iSuffix)
 		return sName
 
+	@property
+	def oParts(self):
+		'''
+		immutable snapshot of the current name parts
+		'''
+		return oNameParts(self.__sType, self.__sSide, self.__sRes, self.sPart, self.iIndex, self.iSuffix)
+
 	def composeName(self, sType, sSide, sRes, sPart, iIndex, iSuffix):
-		if not sPart:
-			raise RuntimeError('The name entered is invalid')
-		elif not sType:
-			if sSide or sRes or iIndex or iSuffix:
-				raise RuntimeError('The name entered is invalid')
-		elif not sRes and not sSide:
-			raise RuntimeError('The name entered is invalid')
-		sName = ''
-		for sNamePart in [sType, sSide, sRes, sPart]:
-			if sNamePart:
-				sName += '%s_' %sNamePart
-		for iNum in [iIndex, iSuffix]:
-			if iNum:
-				sName += '%03d_' %iNum
-		return sName[:-1]
+		return compose(sType, sSide, sRes, sPart, iIndex, iSuffix)
 
 	def decomposeName(self, sName):
-		lNameParts = sName.split('_')
-		if len(lNameParts) > 1:
-			self.__sType = getKeyFromNamePart(lNameParts[0], 'type')
-			if len(lNameParts) == 6:			
-				self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-				self.__sRes = getKeyFromNamePart(lNameParts[2], 'resolution')
-				self.sPart = lNameParts[3]
-				self.iIndex = int(lNameParts[4])
-				self.iSuffix = int(lNameParts[5])
-			elif len(lNameParts) == 5:
-				if lNameParts[4].isdigit() and lNameParts[3].isdigit():
-					self.iIndex = int(lNameParts[3])
-					self.iSuffix = int(lNameParts[4])
-					self.sPart = lNameParts[2]
-					self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-					if self.sSide:
-						self.__sRes = None 
-					else:
-						self.__sRes = getKeyFromNamePart(lNameParts[1], 'resolution')
-				else:
-					self.iIndex = int(lNameParts[4])
-					self.sPart = lNameParts[3]
-					self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-					self.__sRes = getKeyFromNamePart(lNameParts[2], 'resolution')
-					self.iSuffix = None
-
-			elif len(lNameParts) == 4:
-				self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-				self.iSuffix = None
-				if lNameParts[3].isdigit():
-					self.iIndex = int(lNameParts[3])
-					self.sPart = lNameParts[2]
-					self.__sRes = None
-				else:
-					self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-					self.__sRes = getKeyFromNamePart(lNameParts[2], 'resolution')
-					self.sPart = lNameParts[3]
-					self.iIndex = None
-
-			elif len(lNameParts) == 3:
-				self.sPart = lNameParts[2]
-				self.iIndex = None
-				self.iSuffix = None
-				self.__sSide = getKeyFromNamePart(lNameParts[1], 'side')
-				if self.__sSide:
-					self.__sRes = None 
-				else:
-					self.__sRes = getKeyFromNamePart(lNameParts[1], 'resolution')
-			else:
-				raise RuntimeError('name is not valid')
-		else:
-			self.sPart = lNameParts[0]
-			self.__sType = None
-			self.__sSide = None
-			self.__sRes = None
-			self.iIndex = None
-			self.iSuffix = None
-		
+		self.__sType, self.__sSide, self.__sRes, self.sPart, self.iIndex, self.iSuffix = parse(sName)
+
 
 # functions
+def parse(sName):
+	'''
+	split the name into oNameParts, cached
+	'''
+	oParts = oParseCache.get(sName)
+	if oParts is None:
+		oParts = oNameParts(*__decomposeName(sName))
+		oParseCache.set(sName, oParts)
+	return oParts
+
+def compose(sType, sSide, sRes, sPart, iIndex, iSuffix):
+	'''
+	join the name parts into a name, cached, name part keys should be the short names
+	'''
+	tKey = (sType, sSide, sRes, sPart, iIndex, iSuffix)
+	sName = oComposeCache.get(tKey)
+	if sName is None:
+		sName = __composeName(sType, sSide, sRes, sPart, iIndex, iSuffix)
+		oComposeCache.set(tKey, sName)
+	return sName
+
+def getNameFamily(sFamily, sSide = 'middle', sPart = None, iIndex = None, iCount = 0):
+	'''
+	return the oNameFamily, cached
+	iCount: how many numbered names, like the stack count of a control
+	'''
+	tKey = (sFamily, sSide, sPart, iIndex, iCount)
+	oFamily = oFamilyCache.get(tKey)
+	if oFamily is None:
+		sSideKey = getKeyFromNamePart(sSide, 'side')
+		dNames = {}
+		for sKey, sType, sPartFormat in dNameFamilyTemplates[sFamily]:
+			dNames[sKey] = compose(sType, sSideKey, None, sPartFormat %sPart, iIndex, None)
+		for sKey, sType, sPartFormat in dNameFamilyTemplatesNumbered.get(sFamily, []):
+			dNames[sKey] = tuple([compose(sType, sSideKey, None, sPartFormat %sPart, iIndex, i + 1) for i in range(iCount)])
+		oFamily = oNameFamily(sFamily, sSideKey, sPart, iIndex, dNames)
+		oFamilyCache.set(tKey, oFamily)
+	return oFamily
+
+def getNameFamilyRenames(oFamily, oFamilyNew):
+	'''
+	return [(sName, sNameNew), ...] to rename a family to another one,
+	numbered names are paired up to the shorter count
+	'''
+	lRenames = []
+	for sKey in sorted(oFamily.dNames.keys()):
+		if sKey not in oFamilyNew.dNames:
+			continue
+		if isinstance(oFamily.dNames[sKey], tuple):
+			lRenames += zip(oFamily.dNames[sKey], oFamilyNew.dNames[sKey])
+		else:
+			lRenames.append((oFamily.dNames[sKey], oFamilyNew.dNames[sKey]))
+	return [tRename for tRename in lRenames if tRename[0] != tRename[1]]
+
+def clearNameCache():
+	oParseCache.clear()
+	oComposeCache.clear()
+	oFamilyCache.clear()
+
+def getNameCacheStats():
+	return {'parse': {'iHit': oParseCache.iHit, 'iMiss': oParseCache.iMiss},
+			'compose': {'iHit': oComposeCache.iHit, 'iMiss': oComposeCache.iMiss}}
+
 def getKeyFromNamePart(sNamePart, sKeyType):
-	if namingDict.dNameConvension[sKeyType].has_key(sNamePart):
-		sKey = namingDict.dNameConvension[sKeyType][sNamePart]
-	elif namingDict.dNameConvensionInverse[sKeyType].has_key(sNamePart):
-		sKey = sNamePart
-	else:
-		sKey = None
-	return sKey
+	return namingDict.dNameKeys[sKeyType].get(sNamePart, None)
 
 def getFullNameFromKey(sKey, sKeyType):
-	if namingDict.dNameConvensionInverse[sKeyType].has_key(sKey):
-		sName = namingDict.dNameConvensionInverse[sKeyType][sKey]
-	elif namingDict.dNameConvension[sKeyType].has_key(sKey):
-		sName = sKey
-	else:
-		sName = None
-	return sName
\ No newline at end of file
+	return namingDict.dNameFullNames[sKeyType].get(sKey, None)
+
+# sub functions
+def __compileNameFamilies(dFamilies):
+	'''
+	convert the family templates to [(sKey, sType, sPartFormat), ...] with short type names
+	'''
+	dTemplates = {}
+	for sFamily, dFamily in dFamilies.items():
+		lTemplates = []
+		for sKey in sorted(dFamily.keys()):
+			sType, sPartFormat = dFamily[sKey]
+			sTypeKey = getKeyFromNamePart(sType, 'type')
+			if not sTypeKey:
+				raise RuntimeError('name family %s: %s is not a valid type' %(sFamily, sType))
+			lTemplates.append((sKey, sTypeKey, sPartFormat))
+		dTemplates[sFamily] = lTemplates
+	return dTemplates
+
+def __composeName(sType, sSide, sRes, sPart, iIndex, iSuffix):
+	if not sPart:
+		raise RuntimeError('The name entered is invalid')
+	elif not sType:
+		if sSide or sRes or iIndex or iSuffix:
+			raise RuntimeError('The name entered is invalid')
+	elif not sRes and not sSide:
+		raise RuntimeError('The name entered is invalid')
+	sName = ''
+	for sNamePart in [sType, sSide, sRes, sPart]:
+		if sNamePart:
+			sName += '%s_' %sNamePart
+	for iNum in [iIndex, iSuffix]:
+		if iNum:
+			sName += '%03d_' %iNum
+	return sName[:-1]
+
+def __decomposeName(sName):
+	'''
+	return sType, sSide, sRes, sPart, iIndex, iSuffix
+
+	names are type_[side]_[res]_part_[index]_[suffix], one or two side/res tokens,
+	the trailing digits are taken as index and suffix as long as the token count allows
+	'''
+	lNameParts = sName.split('_')
+	iParts = len(lNameParts)
+	if iParts == 1:
+		return None, None, None, lNameParts[0], None, None
+	if iParts < 3 or iParts > 6:
+		raise RuntimeError('name is not valid')
+
+	iDigits = 0
+	for iCount in [2, 1]:
+		if 0 < iParts - 2 - iCount < 3 and all([sNamePart.isdigit() for sNamePart in lNameParts[-iCount:]]):
+			iDigits = iCount
+			break
+	iMiddle = iParts - 2 - iDigits
+	if iMiddle > 2:
+		raise RuntimeError('name is not valid')
+
+	sSide = None
+	sRes = None
+	for i, sNamePart in enumerate(lNameParts[1 : 1 + iMiddle]):
+		sCategory, sKey = namingDict.dNameTokens.get(sNamePart, (None, None))
+		if sCategory is None:
+			## full names are not unique between categories, go by the slot, side comes before resolution
+			for sCategory in [['side', 'resolution'], ['resolution', 'side']][i]:
+				sKey = namingDict.dNameKeys[sCategory].get(sNamePart, None)
+				if sKey:
+					break
+		if sCategory == 'side' and not sSide:
+			sSide = sKey
+		elif sCategory == 'resolution' and not sRes:
+			sRes = sKey
+
+	lNums = [int(sNamePart) for sNamePart in lNameParts[iParts - iDigits:]] + [None, None]
+	return namingDict.dNameKeys['type'].get(lNameParts[0], None), sSide, sRes, lNameParts[1 + iMiddle], lNums[0], lNums[1]
+
+dNameFamilyTemplates = __compileNameFamilies(namingDict.dNameFamilies)
+dNameFamilyTemplatesNumbered = __compileNameFamilies(namingDict.dNameFamiliesNumbered)
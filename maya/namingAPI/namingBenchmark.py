@@ -0,0 +1,64 @@
+## External Import
+import random
+import time
+
+## libs Import
+import naming
+import namingDict
+
+## Vars
+iNames = 50000
+iUniqueNames = 6000
+lParts = ['arm', 'leg', 'spine', 'neck', 'head', 'finger', 'thumb', 'toe', 'clavicle', 'hip', 'jaw', 'tail']
+lTypes = ['joint', 'control', 'zero', 'passer', 'multMatrix', 'group', 'bindJoint', 'ikHandle', 'locator', 'blendColors']
+lSides = ['left', 'right', 'middle']
+
+#### Functions
+## a rig build re-creates the same names many times, the workload draws iNames names from iUniqueNames,
+## with the name part mix of the limb and twist joint modules
+def getWorkload(iCount = iNames, iUnique = iUniqueNames, iSeed = 0):
+	oRandom = random.Random(iSeed)
+	lUnique = []
+	for i in range(iUnique):
+		sType = namingDict.dNameConvension['type'][oRandom.choice(lTypes)]
+		sSide = namingDict.dNameConvension['side'][oRandom.choice(lSides)]
+		sPart = '%s%s' %(oRandom.choice(lParts), oRandom.choice(['', 'Twist', 'Fk', 'Ik', 'OutputMatrixLocal']))
+		iIndex = oRandom.randint(1, 20)
+		iSuffix = oRandom.choice([None, None, oRandom.randint(1, 5)])
+		lUnique.append((sType, sSide, None, sPart, iIndex, iSuffix))
+	return [oRandom.choice(lUnique) for i in range(iCount)]
+
+def runBenchmark(iCount = iNames, iRepeat = 3):
+	'''
+	print names per second for oName round trips, and for parse/compose if the module has them
+	'''
+	lWorkload = getWorkload(iCount = iCount)
+	lNames = [naming.oName(sType = sType, sSide = sSide, sRes = sRes, sPart = sPart, iIndex = iIndex, iSuffix = iSuffix).sName for sType, sSide, sRes, sPart, iIndex, iSuffix in lWorkload]
+
+	dResults = {}
+	dResults['oName(sName).sName'] = __timeIt(lambda: [naming.oName(sName).sName for sName in lNames], iRepeat)
+	dResults['oName(**kwargs).sName'] = __timeIt(lambda: [naming.oName(sType = sType, sSide = sSide, sRes = sRes, sPart = sPart, iIndex = iIndex, iSuffix = iSuffix).sName for sType, sSide, sRes, sPart, iIndex, iSuffix in lWorkload], iRepeat)
+	if hasattr(naming, 'parse'):
+		dResults['parse'] = __timeIt(lambda: [naming.parse(sName) for sName in lNames], iRepeat)
+		dResults['compose'] = __timeIt(lambda: [naming.compose(*tParts) for tParts in lWorkload], iRepeat)
+		dResults['parse, cold cache'] = __timeIt(lambda: [naming.parse(sName) for sName in lNames], iRepeat, fnSetup = naming.clearNameCache)
+
+	for sKey in sorted(dResults.keys()):
+		print '%-24s %10.0f names/s' %(sKey, iCount / dResults[sKey])
+	return dResults
+
+#### Sub Functions
+def __timeIt(fnRun, iRepeat, fnSetup = None):
+	fBest = None
+	for i in range(iRepeat):
+		if fnSetup:
+			fnSetup()
+		fStartTime = time.time()
+		fnRun()
+		fTime = time.time() - fStartTime
+		if fBest is None or fTime < fBest:
+			fBest = fTime
+	return fBest
+
+if __name__ == '__main__':
+	runBenchmark()
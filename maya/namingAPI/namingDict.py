@@ -101,6 +101,51 @@ for sKey in dNameConvension.keys():
 	dInverse = {sKey: {v: k for k, v in dNameConvension[sKey].iteritems()}}
 	dNameConvensionInverse.update(dInverse)
 
+## compiled lookup tables, built at import, any collision fails the import
+class oFrozenDict(dict):
+	'''
+	read only dict for the compiled lookup tables
+	'''
+	def __readOnly(self, *args, **kwargs):
+		raise TypeError('naming lookup tables are read only')
+	__setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __readOnly
+
+def compileNameConvension(dConvension):
+	'''
+	return dNameKeys, dNameFullNames, dNameTokens
+
+	dNameKeys: {sCategory: {sFullName or sKey: sKey}}, one probe for getKeyFromNamePart
+	dNameFullNames: {sCategory: {sKey or sFullName: sFullName}}, one probe for getFullNameFromKey
+	dNameTokens: {sKey: (sCategory, sKey)}, short keys are the tokens names are made of,
+				 so they must be unique across all categories,
+				 full names are only looked up with a known category and may repeat between categories
+	'''
+	dNameKeys = {}
+	dNameFullNames = {}
+	dNameTokens = {}
+	for sCategory in sorted(dConvension.keys()):
+		dKeys = {}
+		dFullNames = {}
+		for sFullName in sorted(dConvension[sCategory].keys()):
+			sKey = dConvension[sCategory][sFullName]
+			if sKey in dFullNames:
+				raise RuntimeError('naming collision: %s and %s are both %s in %s' %(dFullNames[sKey], sFullName, sKey, sCategory))
+			dFullNames[sKey] = sFullName
+			if sKey in dNameTokens:
+				raise RuntimeError('naming collision: %s is used by %s and %s' %(sKey, dNameTokens[sKey][0], sCategory))
+			dNameTokens[sKey] = (sCategory, sKey)
+		for sFullName, sKey in dConvension[sCategory].items():
+			if sFullName in dFullNames and dFullNames[sFullName] != sFullName:
+				raise RuntimeError('naming collision: %s is a name of %s and a key of %s in %s' %(sFullName, sKey, dFullNames[sFullName], sCategory))
+			dKeys[sFullName] = sKey
+			dKeys[sKey] = sKey
+			dFullNames[sFullName] = sFullName
+		dNameKeys[sCategory] = oFrozenDict(dKeys)
+		dNameFullNames[sCategory] = oFrozenDict(dFullNames)
+	return oFrozenDict(dNameKeys), oFrozenDict(dNameFullNames), oFrozenDict(dNameTokens)
+
+dNameKeys, dNameFullNames, dNameTokens = compileNameConvension(dNameConvension)
+
 dSpaceDict = {
 				'fk': 0,
 				'ik': 1,
@@ -117,4 +162,42 @@ dSpaceDict = {
 dSpaceDictInverse = {}
 for sKey in dSpaceDictInverse.keys():
 	dInverse = {sKey: {v: k for k, v in dSpaceDict[sKey].iteritems()}}
-	dSpaceDictInverse.update(dInverse)
\ No newline at end of file
+	dSpaceDictInverse.update(dInverse)
+## name families, all the node names derived from one (side, part, index)
+## {sFamily: {sKey: (sType, sPartFormat)}}, sPartFormat is formatted with the part name
+dNameFamilies = {
+	'control': {
+		'sZero': ('zero', '%s'),
+		'sPasser': ('passer', '%s'),
+		'sSpace': ('space', '%s'),
+		'sCtrl': ('control', '%s'),
+		'sSub': ('control', '%sSub'),
+		'sOutput': ('group', '%sOutput'),
+		'sInverseMatrixOutputLocal': ('inverseMatrix', '%sInverseMatrixOutputLocal'),
+		'sInverseMatrixOutputWorld': ('inverseMatrix', '%sInverseMatrixOutputWorld'),
+		'sMultMatrixOutputLocal': ('multMatrix', '%sMatrixOutputLocal'),
+		'sMultMatrixOutputWorld': ('multMatrix', '%sMatrixOutputWorld'),
+		'sMultMatrixStacks': ('multMatrix', '%sStacksMatrixOutput'),
+	},
+
+	'component': {
+		'sComponentMaster': ('rigComponent', '%s'),
+		'sComponentRigNodesWorld': ('rigNodesWorld', '%s'),
+		'sComponentSubComponents': ('subComponents', '%s'),
+		'sComponentInherits': ('inherits', '%s'),
+		'sComponentXform': ('xform', '%s'),
+		'sComponentPasser': ('passer', '%s'),
+		'sComponentSpace': ('space', '%s'),
+		'sComponentControls': ('controls', '%s'),
+		'sComponentRigNodesLocal': ('rigNodesLocal', '%s'),
+		'sMultMatrixInput': ('multMatrix', '%sInputMatrix'),
+		'sDecomposeMatrixInput': ('decomposeMatrix', '%sInputMatrix'),
+	},
+}
+
+## numbered names of a family, the suffix is 1 to the count, {sFamily: {sKey: (sType, sPartFormat)}}
+dNameFamiliesNumbered = {
+	'control': {
+		'lStacks': ('stack', '%s'),
+	},
+}
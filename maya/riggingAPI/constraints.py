@@ -4,11 +4,12 @@ import maya.mel as mel
 
 ## lib import
 import namingAPI.naming as naming
+import namingAPI.nameRegistry as nameRegistry
 import common.transforms as transforms
 import common.attributes as attributes
 import modelingAPI.meshes as meshes
 import modelingAPI.surfaces as surfaces
-import common.apiUtils as apiUtils
+import common.matrixMath as matrixMath
 ## functions
 def constraint(lNodes, sType = 'parent', sConstraintType = 'oneToAll', bMaintainOffset = False, lSkipTranslate = None, lSkipRotate = None, lSkipScale = None, bForce = False):
 	if not lSkipTranslate:
@@ -33,14 +34,13 @@ def constraint(lNodes, sType = 'parent', sConstraintType = 'oneToAll', bMaintain
 def follicleConstraint(sGeo, lNodes, sType = 'parent', bMaintainOffset = True, lSkipTranslate = None, lSkipRotate = None, bForce = False):
 	oName = naming.oName(sGeo)
 	sGrpFollicle = naming.oName(sType = 'grp', sSide = oName.sSide, sPart = '%sFollicle' %oName.sPart, iIndex = oName.iIndex).sName
-	if not cmds.objExists(sGrpFollicle):
+	if not nameRegistry.exists(sGrpFollicle):
 		transforms.createTransformNode(sGrpFollicle, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'])
 		cmds.addAttr(sGrpFollicle, ln = 'follicleCount', at = 'long', dv = 0)
 		cmds.setAttr('%s.follicleCount' %sGrpFollicle, lock = True)
 	sGeoShape = meshes.getShape(sGeo)
 
 	lFollicles = []
-	iFollicle = cmds.getAttr('%s.follicleCount' %sGrpFollicle)
 	for i, sNode in enumerate(lNodes):
 		lPos_node = cmds.xform(sNode, q = True, t = True, ws = True)
 		if cmds.objectType(sGeoShape) == 'mesh':
@@ -55,7 +55,9 @@ def follicleConstraint(sGeo, lNodes, sType = 'parent', bMaintainOffset = True, l
 		## create follicle
 		sFollicleShape = cmds.createNode('follicle')
 		sFollicleTrans = cmds.listRelatives(sFollicleShape, p = True)[0]
-		sFollicle = naming.oName(sType = 'follicle', sSide = oName.sSide, sPart = '%sFollicle' %oName.sPart, iIndex = oName.iIndex, iSuffix = iFollicle + i + 1).sName
+		iSuffix = nameRegistry.getNextSuffix(sType = 'follicle', sSide = oName.sSide, sPart = '%sFollicle' %oName.sPart, iIndex = oName.iIndex)
+		sFollicle = naming.oName(sType = 'follicle', sSide = oName.sSide, sPart = '%sFollicle' %oName.sPart, iIndex = oName.iIndex, iSuffix = iSuffix).sName
+		nameRegistry.checkName(sFollicle)
 		cmds.rename(sFollicleTrans, sFollicle)
 		sFollicleShape = cmds.listRelatives(sFollicle, s = True)[0]
 
@@ -77,7 +79,8 @@ def follicleConstraint(sGeo, lNodes, sType = 'parent', bMaintainOffset = True, l
 
 	## update follicle count
 	cmds.setAttr('%s.follicleCount' %sGrpFollicle, lock = False)
-	cmds.setAttr('%s.follicleCount' %sGrpFollicle, iFollicle + len(lNodes), lock = True)
+	iFollicle = nameRegistry.getNextSuffix(sType = 'follicle', sSide = oName.sSide, sPart = '%sFollicle' %oName.sPart, iIndex = oName.iIndex) - 1
+	cmds.setAttr('%s.follicleCount' %sGrpFollicle, iFollicle, lock = True)
 
 	return sGrpFollicle, lFollicles
 
@@ -238,8 +241,7 @@ def matrixConnectJnt(sDrvNode, sDrivenJnt, sDrvAttr, lSkipTranslate = [], lSkipR
 		fOrientX = cmds.getAttr('%s.jointOrientX' %sDrivenJnt)
 		fOrientY = cmds.getAttr('%s.jointOrientY' %sDrivenJnt)
 		fOrientZ = cmds.getAttr('%s.jointOrientZ' %sDrivenJnt)
-		mMatrix = apiUtils.createMMatrixFromTransformInfo(lRotate = [fOrientX, fOrientY, fOrientZ])
-		lMatrixInverse = apiUtils.convertMMatrixToList(mMatrix.inverse())
+		lMatrixInverse = matrixMath.inverseMatrix(matrixMath.composeMatrix(lRotate = [fOrientX, fOrientY, fOrientZ]))
 		cmds.setAttr('%s.matrixIn[1]' %sMultMatrix, lMatrixInverse, type = 'matrix')
 		sDecomposeMatrixRotScale = naming.oName(sType = 'decomposeMatrix', sSide = oNameDriven.sSide, sPart = '%sRotScale' %oNameDriven.sPart, iIndex = oNameDriven.iIndex).sName
 		cmds.createNode('decomposeMatrix', name = sDecomposeMatrixRotScale)
@@ -1,32 +1,4 @@
-dCtrlShapes = {
-				'cube': {
-							'lCtrlPnts': [(-0.5, -0.5, -0.5), (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, -0.5, -0.5), (-0.5, -0.5, -0.5), (-0.5, 0.5, -0.5), (0.5, 0.5, -0.5), (0.5, -0.5, -0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5), (-0.5, 0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5), (-0.5, -0.5, 0.5)],
-							'lKnots': [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 14.0, 15.0],
-							'bPeriodic': False,
-							'iDegree': 1,
-						},
-
-				'square':{
-							'lCtrlPnts': [(-0.5, 0.0, -0.5), (-0.5, 0.0, 0.5), (0.5, 0.0, 0.5), (0.5, 0.0, -0.5), (-0.5, 0.0, -0.5)],
-							'lKnots': [0.0, 1.0, 2.0, 3.0, 4.0],
-							'bPeriodic': False,
-							'iDegree': 1,
-						},
-
-				'circle':{
-							'lCtrlPnts': [(0.3918058124456125, 0, -0.3918058124456119), (0, 0, -0.554097093777194), (-0.39180581244561213, 0, -0.39180581244561213), (-0.554097093777194, 0, 0), (-0.39180581244561224, 0, 0.391805812445612), (0, 0, 0.5540970937771941), (0.3918058124456119, 0, 0.3918058124456122), (0.554097093777194, 0, 0), (0.3918058124456125, 0, -0.3918058124456119), (0, 0, -0.554097093777194), (-0.39180581244561213, 0, -0.39180581244561213)],
-							'lKnots': [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-							'bPeriodic': True,
-							'iDegree': 3,
-						},
-
-				'triangle': {
-								'lCtrlPnts': [(0, 0, 0.498253282310647), (0.4315, 0, -0.2491266411553236), (-0.4315, 0, -0.2491266411553236), (0, 0.0, 0.498253282310647)],
-								'lKnots': [0.0, 1.0, 2.0, 3.0],
-								'bPeriodic': False,
-								'iDegree': 1,
-							},
-				}
+## control shapes are in controlShapeLibrary, loaded from the controlShapes folder
 
 dColors = {
 			'None': 0,
@@ -0,0 +1,204 @@
+## External Import
+import os
+import array
+
+## libs Import
+import common.files as files
+
+## Vars
+## shape files are json, {'iVersion': 1, 'iDegree': 3, 'bPeriodic': True, 'lCtrlPnts': [[x, y, z], ...], 'lKnots': optional},
+## one file per shape, the file name is the shape name
+iFormatVersion = 1
+sShapeSuffix = '.json'
+sPathShapes = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'controlShapes')
+## studio shape folders, separated by os.pathsep, a shape in a later folder overrides the same name before it
+sEnvShapePath = 'RIG_CONTROL_SHAPE_PATH'
+iVariantCacheSize = 2000
+
+## axis the shape's +y is turned to, ((source axis, sign), ...) for x, y, z
+dAxes = {
+			'x': ((1, 1), (0, -1), (2, 1)),
+			'y': ((0, 1), (1, 1), (2, 1)),
+			'z': ((0, 1), (2, -1), (1, 1)),
+			'-x': ((1, -1), (0, 1), (2, 1)),
+			'-y': ((0, 1), (1, -1), (2, -1)),
+			'-z': ((0, 1), (2, 1), (1, -1)),
+		}
+
+dShapes = {}
+lShapeDirectories = []
+dVariantCache = {}
+dState = {'bLoaded': False}
+
+class oCtrlShape(object):
+	'''
+	a library shape, cvs and knots kept as flat double arrays
+	'''
+	__slots__ = ('sName', 'iDegree', 'bPeriodic', 'aPnts', 'aKnots', 'sPath')
+
+	def __init__(self, sName, lCtrlPnts, iDegree = 1, bPeriodic = False, lKnots = None, sPath = None):
+		self.sName = sName
+		self.iDegree = iDegree
+		self.bPeriodic = bool(bPeriodic)
+		self.aPnts = array.array('d', [fPos for lCtrlPnt in lCtrlPnts for fPos in lCtrlPnt[:3]])
+		iCtrlPnts = len(lCtrlPnts)
+		if not lKnots:
+			lKnots = getCanonicalKnots(iCtrlPnts, iDegree, bPeriodic = bPeriodic)
+		elif len(lKnots) != iCtrlPnts + iDegree - 1:
+			raise RuntimeError('control shape %s has %d knots, %d cvs of degree %d need %d' %(sName, len(lKnots), iCtrlPnts, iDegree, iCtrlPnts + iDegree - 1))
+		self.aKnots = array.array('d', lKnots)
+		self.sPath = sPath
+
+	@property
+	def iCtrlPnts(self):
+		return len(self.aPnts) / 3
+
+#### Functions
+def getCanonicalKnots(iCtrlPnts, iDegree, bPeriodic = False):
+	'''
+	return the maya knot vector, cv count + degree - 1 knots
+	open curves are clamped uniform, periodic curves have the degree overlapping cvs included in the count
+	'''
+	if iCtrlPnts <= iDegree:
+		raise RuntimeError('%d cvs are not enough for a degree %d curve' %(iCtrlPnts, iDegree))
+	if bPeriodic:
+		return [float(i) for i in range(1 - iDegree, iCtrlPnts)]
+	iSpans = iCtrlPnts - iDegree
+	return [0.0] * (iDegree - 1) + [float(i) for i in range(iSpans + 1)] + [float(iSpans)] * (iDegree - 1)
+
+def getShapeDirectories():
+	'''
+	return the shape folders in loading order, the shipped one, then the env var ones, then the registered ones
+	'''
+	lDirectories = [sPathShapes]
+	sEnvPath = os.environ.get(sEnvShapePath, '')
+	lDirectories += [sPath for sPath in sEnvPath.split(os.pathsep) if sPath]
+	lDirectories += lShapeDirectories
+	return lDirectories
+
+def loadShapes(bForce = False):
+	'''
+	load all the shape files, skip the files with a newer format version
+	'''
+	if dState['bLoaded'] and not bForce:
+		return
+	dShapesFile = {}
+	for sDirectory in getShapeDirectories():
+		if not os.path.isdir(sDirectory):
+			continue
+		for sFile in sorted(os.listdir(sDirectory)):
+			if not sFile.endswith(sShapeSuffix):
+				continue
+			sPath = os.path.join(sDirectory, sFile)
+			try:
+				dShape = files.readJsonFile(sPath)
+			except ValueError:
+				print 'control shape file %s is corrupted, skipped' %sPath
+				continue
+			if dShape.get('iVersion', 1) > iFormatVersion:
+				print 'control shape file %s is version %d, only %d is supported, skipped' %(sPath, dShape['iVersion'], iFormatVersion)
+				continue
+			sName = sFile[:-len(sShapeSuffix)]
+			dShapesFile[sName] = oCtrlShape(sName, dShape['lCtrlPnts'], iDegree = dShape['iDegree'], bPeriodic = dShape['bPeriodic'], lKnots = dShape.get('lKnots', None), sPath = sPath)
+	## shapes registered in memory are kept over a reload
+	for sName, oShape in dShapes.items():
+		if oShape.sPath is None:
+			dShapesFile[sName] = oShape
+	dShapes.clear()
+	dShapes.update(dShapesFile)
+	dVariantCache.clear()
+	dState['bLoaded'] = True
+
+def registerShapeDirectory(sDirectory):
+	'''
+	add a shape folder and reload the library
+	'''
+	sDirectory = os.path.abspath(sDirectory)
+	if sDirectory not in lShapeDirectories:
+		lShapeDirectories.append(sDirectory)
+	loadShapes(bForce = True)
+
+def registerShape(sName, lCtrlPnts, iDegree = 1, bPeriodic = False, lKnots = None):
+	'''
+	add a shape to the library for this session, saveShape writes it to a shape folder
+	'''
+	loadShapes()
+	dShapes[sName] = oCtrlShape(sName, lCtrlPnts, iDegree = iDegree, bPeriodic = bPeriodic, lKnots = lKnots)
+	__clearVariants(sName)
+
+def saveShape(sName, lCtrlPnts, iDegree = 1, bPeriodic = False, lKnots = None, sDirectory = None):
+	'''
+	write the shape file, to the last studio folder if no folder is given,
+	the knots are only written when they are not the canonical ones,
+	the shape saved replaces the one registered in memory under the same name,
+	a folder not in the library yet is registered
+	'''
+	oShape = oCtrlShape(sName, lCtrlPnts, iDegree = iDegree, bPeriodic = bPeriodic, lKnots = lKnots)
+	if not sDirectory:
+		sDirectory = getShapeDirectories()[-1]
+	if not os.path.exists(sDirectory):
+		os.makedirs(sDirectory)
+	sPath = os.path.join(sDirectory, sName + sShapeSuffix)
+	dShape = {'iVersion': iFormatVersion, 'iDegree': iDegree, 'bPeriodic': bool(bPeriodic),
+			  'lCtrlPnts': [list(lCtrlPnt[:3]) for lCtrlPnt in lCtrlPnts]}
+	lKnots = list(oShape.aKnots)
+	if lKnots != getCanonicalKnots(oShape.iCtrlPnts, iDegree, bPeriodic = bPeriodic):
+		dShape['lKnots'] = lKnots
+	files.writeJsonFile(sPath, dShape)
+	dShapes.pop(sName, None)
+	if os.path.abspath(sDirectory) not in [os.path.abspath(sPathDirectory) for sPathDirectory in getShapeDirectories()]:
+		registerShapeDirectory(sDirectory)
+	else:
+		loadShapes(bForce = True)
+	return sPath
+
+def listShapes():
+	loadShapes()
+	return sorted(dShapes.keys())
+
+def getShape(sName):
+	loadShapes()
+	if sName not in dShapes:
+		raise RuntimeError('control shape %s is not in the library, shapes are %s' %(sName, ', '.join(sorted(dShapes.keys()))))
+	return dShapes[sName]
+
+def getShapeInfo(sName, fSize = 1, sAxis = 'y', lOffset = None, fThickness = None):
+	'''
+	return the shape info of a shape variant, same keys as controls.getCtrlShapeInfo's curve part,
+	the cvs are sized, turned from +y to the axis, then offset, variants are cached
+
+	fThickness: the curve's lineWidth, None keeps maya's default
+	'''
+	if sAxis not in dAxes:
+		raise RuntimeError('%s is not a valid shape axis, use one of %s' %(sAxis, ', '.join(sorted(dAxes.keys()))))
+	if lOffset:
+		tOffset = (float(lOffset[0]), float(lOffset[1]), float(lOffset[2]))
+	else:
+		tOffset = (0.0, 0.0, 0.0)
+	tKey = (sName, float(fSize), sAxis, tOffset, fThickness)
+	dShapeInfo = dVariantCache.get(tKey, None)
+	if dShapeInfo is None:
+		oShape = getShape(sName)
+		tAxis = dAxes[sAxis]
+		aPnts = oShape.aPnts
+		lCtrlPnts = []
+		for i in range(0, len(aPnts), 3):
+			lCtrlPnts.append(tuple([aPnts[i + iAxis] * iSign * fSize + tOffset[j] for j, (iAxis, iSign) in enumerate(tAxis)]))
+		dShapeInfo = {'lCtrlPnts': tuple(lCtrlPnts),
+					  'lKnots': tuple(oShape.aKnots),
+					  'iDegree': oShape.iDegree,
+					  'bPeriodic': oShape.bPeriodic,
+					  'fLineWidth': fThickness}
+		if len(dVariantCache) >= iVariantCacheSize:
+			dVariantCache.clear()
+		dVariantCache[tKey] = dShapeInfo
+	return dict(dShapeInfo)
+
+def clearCache():
+	dVariantCache.clear()
+
+#### Sub Functions
+def __clearVariants(sName):
+	for tKey in dVariantCache.keys():
+		if tKey[0] == sName:
+			dVariantCache.pop(tKey)
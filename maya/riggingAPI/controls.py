@@ -5,15 +5,25 @@ import maya.OpenMaya as OpenMaya
 ## libs Import
 import common.apiUtils as apiUtils
 reload(apiUtils)
+import common.matrixMath as matrixMath
 import common.files as files
 import namingAPI.naming as naming
+import namingAPI.nameRegistry as nameRegistry
 import common.transforms as transforms
 reload(transforms)
 import common.attributes as attributes
 import common.maths as maths
 import controlShapeDict
+import controlShapeLibrary
 reload(transforms)
 reload(naming)
+
+## Vars
+## modifiers of the createMany calls, undoCreateMany reverts the last one,
+## cleared on a new or opened scene, the modifiers hold the mObjects of their nodes
+lCreateManyHistory = []
+iCreateManyHistorySize = 20
+
 #### Functions
 def getCtrlShape(sCtrl):
 	'''
@@ -53,14 +63,15 @@ def addCtrlShape(lCtrls, sCtrlShape, bVis = True, dCtrlShapeInfo = None, bTop =
 			bOverride = False
 			iOverrideType = 0
 			iColor = 0
-		sCrv = cmds.curve(p=lCtrlPnts, k=lKnots, d=iDegree, per = bPeriodic)
-		sCrvShape = getCtrlShape(sCrv)
-		cmds.rename(sCrvShape, sCtrlShape)
+		## build the shape node under the first control and set the curve data in one setAttr, no temp curve, undoable
+		sCtrlShape = cmds.createNode('nurbsCurve', name = sCtrlShape, parent = lCtrls[0])
+		__setCtrlCurveData(sCtrlShape, lCtrlPnts, lKnots, iDegree, bPeriodic)
 		cmds.setAttr('%s.overrideEnabled' %sCtrlShape, bOverride)
 		cmds.setAttr('%s.overrideDisplayType' %sCtrlShape, iOverrideType)
 		cmds.setAttr('%s.overrideColor' %sCtrlShape, iColor)
-	else:
-		sCrv = None
+		if dCtrlShapeInfo and dCtrlShapeInfo.get('fLineWidth', None) is not None and cmds.attributeQuery('lineWidth', node = sCtrlShape, exists = True):
+			cmds.setAttr('%s.lineWidth' %sCtrlShape, dCtrlShapeInfo['fLineWidth'])
+		lCtrls = lCtrls[1:]
 
 	if not bVis:
 		cmds.setAttr('%s.v' %sCtrlShape, lock = False)
@@ -70,25 +81,32 @@ def addCtrlShape(lCtrls, sCtrlShape, bVis = True, dCtrlShapeInfo = None, bTop =
 		cmds.parent(sCtrlShape, sCtrl, add = True, s = True)
 	if bTop:
 		cmds.reorder(sCtrlShape, f = True)
-	if sCrv:
-		cmds.delete(sCrv)
 
 def scaleCtrlShape(sCtrl, fScale = 1, sPivot = 'transform'):
 	'''
 	scale the shape node in the control's transform space
 	'''
+	transformCtrlShape(sCtrl, [fScale, 0, 0, 0, 0, fScale, 0, 0, 0, 0, fScale, 0, 0, 0, 0, 1], sPivot = sPivot)
+
+def transformCtrlShape(sCtrl, lMatrix, sPivot = 'transform'):
+	'''
+	transform all the shape node's cvs by the matrix in the control's transform space
+
+	lMatrix: 16 floats matrix, applied as one matrix operation over the cv array
+	sPivot: 'transform' uses the control's pivot, 'boundingBox' uses the cvs' bounding box center
+	'''
 	sCtrlShape = getCtrlShape(sCtrl)
 	if sCtrlShape:
-		lCtrlPnts = __getCtrlShapeControlPoints(sCtrlShape)
+		mFnCrv = OpenMaya.MFnNurbsCurve(apiUtils.setMObj(sCtrlShape))
+		mPntArray = OpenMaya.MPointArray()
+		mFnCrv.getCVs(mPntArray, OpenMaya.MSpace.kObject)
+		lCtrlPnts = apiUtils.convertMPointArrayToList(mPntArray)
 		if sPivot == 'transform':
-			lPosPivot = cmds.xform(sCtrl, q = True, t = True, ws = True)
+			lPivot = None
 		else:
-			lPosPivot = transforms.getNodesPivotFromBoundingBox(lCtrlPnts, bPointInfo = True)[0]
-		for i, lCtrlPntPos in enumerate(lCtrlPnts):
-			vCtrlPnt = maths.vector(lPosPivot, lCtrlPntPos)
-			vCtrlPnt = maths.vectorScale(vCtrlPnt, fScale)
-			lCtrlPntPosUpdate = maths.getPointFromVectorAndPoint(lPosPivot, vCtrlPnt)
-			cmds.setAttr('%s.controlPoints[%d]' %(sCtrlShape, i), lCtrlPntPosUpdate[0], lCtrlPntPosUpdate[1], lCtrlPntPosUpdate[2])
+			lPivot = transforms.getNodesPivotFromBoundingBox(lCtrlPnts, bPointInfo = True)[0]
+		lCtrlPnts = matrixMath.transformPoints(lCtrlPnts, lMatrix, lPivot = lPivot)
+		__setCtrlPnts(sCtrlShape, lCtrlPnts)
 
 def mirrorCtrlShape(sCtrl):
 	'''
@@ -115,22 +133,141 @@ def mirrorCtrlShape(sCtrl):
 			iColor = None
 		dCtrlShapeInfo = getCtrlShapeInfo(sCtrl)
 
-		lCtrlPnts = dCtrlShapeInfo[sCtrl]['lCtrlPnts']
-		lCtrlPntsMirror = []
-		for lCtrlPnt in lCtrlPnts:
-			lCtrlPntWorld = transforms.convertPointTransformFromObjectToWorld(lCtrlPnt, sCtrl)
-			lCtrlPntWorld[0] = -1 * lCtrlPntWorld[0]
-			lCtrlPntMirror = transforms.convertPointTransformFromWorldToObject(lCtrlPntWorld, sCtrlMirror)
-			lCtrlPntsMirror.append(lCtrlPntMirror)
-		dCtrlShapeInfo[sCtrl]['lCtrlPnts'] = lCtrlPntsMirror
+		## object space of the control to world, mirror on x, then to the object space of the mirror control
+		mMatrixMirror = apiUtils.convertListToMMatrix([-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])
+		mMatrix = apiUtils.createMMatrixFromTransformNode(sCtrl) * mMatrixMirror * apiUtils.createMMatrixFromTransformNode(sCtrlMirror).inverse()
+		dCtrlShapeInfo[sCtrl]['lCtrlPnts'] = matrixMath.transformPoints(dCtrlShapeInfo[sCtrl]['lCtrlPnts'], apiUtils.convertMMatrixToList(mMatrix))
 
 		dCtrlShapeInfo[sCtrl]['sCtrlShape'] = sCtrlShapeMirror
 		dCtrlShapeInfo[sCtrl]['iColor'] = iColor
 
 		buildCtrlShape(sCtrlMirror, dCtrlShapeInfo[sCtrl], bColor = True, bTop = True)
 
+def mirrorAllCtrlShapes(sSide = 'left'):
+	'''
+	mirror all the control shapes of the side to the other side
+
+	one object to mirrored object matrix per control pair, all the cvs are transformed in one batch,
+	shapes with the same curve topology are updated in place, the others are rebuilt in one modifier pass
+	return the mirrored controls
+
+	sSide: 'left' or 'right', sides like leftFront are mirrored to rightFront
+	'''
+	dSidesMirror = {'left': 'right', 'right': 'left'}
+	if sSide not in dSidesMirror:
+		raise RuntimeError('%s is not a mirrorable side, use left or right' %sSide)
+	sTypeCtrl = naming.getKeyFromNamePart('control', 'type')
+
+	## every transform with a curve shape is a control candidate, kept as dag paths, short names can be non-unique
+	lCtrlPairs = []
+	dCtrls = {}
+	mIter = OpenMaya.MItDependencyNodes(OpenMaya.MFn.kNurbsCurve)
+	while not mIter.isDone():
+		mFnShape = OpenMaya.MFnDagNode(mIter.thisNode())
+		for i in range(mFnShape.parentCount()):
+			mDagPath = OpenMaya.MDagPath()
+			OpenMaya.MDagPath.getAPathTo(mFnShape.parent(i), mDagPath)
+			dCtrls[mDagPath.fullPathName()] = mDagPath
+		mIter.next()
+	for sCtrlPath in sorted(dCtrls.keys()):
+		mDagPath = dCtrls[sCtrlPath]
+		sCtrl = sCtrlPath.split('|')[-1]
+		try:
+			oParts = naming.parse(sCtrl)
+		except RuntimeError:
+			continue
+		if oParts.sType != sTypeCtrl or not oParts.sSide:
+			continue
+		sSideKey = naming.getFullNameFromKey(oParts.sSide, 'side')
+		if not sSideKey or not sSideKey.startswith(sSide):
+			continue
+		sSideMirror = naming.getKeyFromNamePart(sSideKey.replace(sSide, dSidesMirror[sSide], 1), 'side')
+		if not sSideMirror:
+			continue
+		sCtrlMirror = naming.compose(oParts.sType, sSideMirror, oParts.sRes, oParts.sPart, oParts.iIndex, oParts.iSuffix)
+		if not nameRegistry.exists(sCtrlMirror):
+			continue
+		## resolved one by one, a missing or non-unique mirror name skips the pair only
+		mDagPathMirror = __getDagPath(sCtrlMirror)
+		if mDagPathMirror is not None:
+			lCtrlPairs.append((mDagPath, mDagPathMirror))
+	if not lCtrlPairs:
+		return []
+
+	## read the source curves and the world matrices
+	mMatrixMirror = apiUtils.convertListToMMatrix([-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])
+	lMirrors = []
+	llCtrlPnts = []
+	llMatrix = []
+	for mDagPath, mDagPathMirror in lCtrlPairs:
+		mObjShape = __getCtrlCurveShape(mDagPath)
+		if mObjShape is None:
+			continue
+		mFnCrv = OpenMaya.MFnNurbsCurve(mObjShape)
+		mPntArray = OpenMaya.MPointArray()
+		mFnCrv.getCVs(mPntArray, OpenMaya.MSpace.kObject)
+		mKnots = OpenMaya.MDoubleArray()
+		mFnCrv.getKnots(mKnots)
+		llCtrlPnts.append(apiUtils.convertMPointArrayToList(mPntArray))
+		mMatrix = mDagPath.inclusiveMatrix() * mMatrixMirror * mDagPathMirror.inclusiveMatrixInverse()
+		llMatrix.append(apiUtils.convertMMatrixToList(mMatrix))
+		lMirrors.append((mDagPathMirror.partialPathName(), mDagPathMirror, mKnots, mFnCrv.degree(), mFnCrv.form()))
+
+	llCtrlPntsMirror = matrixMath.transformPointsBatch(llCtrlPnts, llMatrix)
+
+	## write in place, or queue the rebuild
+	mDagMod = OpenMaya.MDagModifier()
+	lRebuilds = []
+	for (sCtrlMirror, mDagPathMirror, mKnots, iDegree, iForm), lCtrlPnts in zip(lMirrors, llCtrlPntsMirror):
+		mPntArray = apiUtils.convertListToMPointArray(lCtrlPnts)
+		mObjShapeMirror = __getCtrlCurveShape(mDagPathMirror)
+		if mObjShapeMirror is not None:
+			mFnCrvMirror = OpenMaya.MFnNurbsCurve(mObjShapeMirror)
+			mKnotsMirror = OpenMaya.MDoubleArray()
+			mFnCrvMirror.getKnots(mKnotsMirror)
+			if mFnCrvMirror.degree() == iDegree and mFnCrvMirror.form() == iForm and mFnCrvMirror.numCVs() == mPntArray.length() \
+				and apiUtils.convertMDoubleArrayToList(mKnotsMirror) == apiUtils.convertMDoubleArrayToList(mKnots):
+				mFnCrvMirror.setCVs(mPntArray, OpenMaya.MSpace.kObject)
+				mFnCrvMirror.updateCurve()
+				continue
+			sCtrlShapeMirror = mFnCrvMirror.name()
+			iColor = mFnCrvMirror.findPlug('overrideColor', False).asInt()
+			iOverrideType = mFnCrvMirror.findPlug('overrideDisplayType', False).asInt()
+			if mFnCrvMirror.hasAttribute('lineWidth'):
+				fLineWidth = mFnCrvMirror.findPlug('lineWidth', False).asFloat()
+			else:
+				fLineWidth = None
+			mDagMod.deleteNode(mObjShapeMirror)
+		else:
+			sCtrlShapeMirror = '%sShape' %sCtrlMirror.split('|')[-1]
+			iColor = __getCtrlColor(None, naming.parse(sCtrlMirror.split('|')[-1]).sSide)
+			iOverrideType = 0
+			fLineWidth = None
+		mObjShapeNew = mDagMod.createNode('nurbsCurve', mDagPathMirror.node())
+		mDagMod.renameNode(mObjShapeNew, sCtrlShapeMirror)
+		mObjData = OpenMaya.MFnNurbsCurveData().create()
+		OpenMaya.MFnNurbsCurve().create(mPntArray, mKnots, iDegree, iForm, False, False, mObjData)
+		lRebuilds.append((mObjShapeNew, mObjData, iColor, iOverrideType, fLineWidth))
+
+	if lRebuilds:
+		mDagMod.doIt()
+		mDgMod = OpenMaya.MDGModifier()
+		for mObjShapeNew, mObjData, iColor, iOverrideType, fLineWidth in lRebuilds:
+			mDgMod.newPlugValue(__getPlug(mObjShapeNew, 'cached'), mObjData)
+			mDgMod.newPlugValueBool(__getPlug(mObjShapeNew, 'overrideEnabled'), True)
+			mDgMod.newPlugValueInt(__getPlug(mObjShapeNew, 'overrideDisplayType'), iOverrideType)
+			mDgMod.newPlugValueInt(__getPlug(mObjShapeNew, 'overrideColor'), iColor)
+			if fLineWidth is not None and OpenMaya.MFnDependencyNode(mObjShapeNew).hasAttribute('lineWidth'):
+				mDgMod.newPlugValueFloat(__getPlug(mObjShapeNew, 'lineWidth'), fLineWidth)
+		mDgMod.doIt()
+		## the rebuilt shape node goes on top of the other shape nodes, like buildCtrlShape with bTop
+		for tRebuild in lRebuilds:
+			cmds.reorder(OpenMaya.MFnDagNode(tRebuild[0]).fullPathName(), front = True)
+
+	return [tMirror[0] for tMirror in lMirrors]
+
 def matchSubCtrlShape(sCtrl, fScale = 0.8, sPivot = 'transform'):
-	oCtrl = oControl(sCtrl)
+	oCtrl = oControl.get(sCtrl)
 	sSubCtrl = oCtrl.sSub
 	if sSubCtrl:
 		sSubCtrlShape = getCtrlShape(sSubCtrl)
@@ -147,6 +284,8 @@ class oControl(object):
 
 	control's hierarchy: sZero/sPasser/sStack01/.../sName/sSub
 
+	the fields are resolved on first access, use oControl.get(sCtrl) to share one wrapper per control in a build
+
 	property:
 	sName: return the control's name
 	sSide: return the control's side
@@ -168,8 +307,44 @@ class oControl(object):
 	iStacks: set how many stacks the control has
 	bSub: set if the control has a sub control or not
 	'''
+	## build scoped wrapper cache {sCtrl: oControl}, cleared when a new build starts
+	dInstances = {}
+	dStats = {'iInstances': 0, 'iCacheHits': 0, 'iGetAttrs': 0}
+
 	def __init__(self, sCtrl):
-		self.__getCtrlInfo(sCtrl)
+		oControl.dStats['iInstances'] += 1
+		self.__sName = sCtrl
+		self.__clearInfo()
+
+	@classmethod
+	def get(cls, sCtrl, bRefresh = False):
+		'''
+		return the cached wrapper of the control, create it on the first call
+		bRefresh: replace the cached wrapper, for a control just created with a reused name
+		'''
+		oCtrl = cls.dInstances.get(sCtrl, None)
+		if oCtrl is not None and not bRefresh and nameRegistry.exists(sCtrl):
+			cls.dStats['iCacheHits'] += 1
+			return oCtrl
+		oCtrl = cls(sCtrl)
+		cls.dInstances[sCtrl] = oCtrl
+		return oCtrl
+
+	@classmethod
+	def clearCache(cls):
+		cls.dInstances.clear()
+
+	@classmethod
+	def getCacheStats(cls):
+		'''
+		return the wrapper counts, instances created, cache hits and the control info getAttr calls
+		'''
+		return dict(cls.dStats)
+
+	@classmethod
+	def resetCacheStats(cls):
+		for sKey in cls.dStats.keys():
+			cls.dStats[sKey] = 0
 
 	@property
 	def sName(self):
@@ -177,51 +352,51 @@ class oControl(object):
 
 	@property
 	def sSide(self):
-		return self.__sSide
+		return self.__getParts().sSide
 
 	@property
 	def sPart(self):
-		return self.__sPart
+		return self.__getParts().sPart
 
 	@property
 	def iIndex(self):
-		return self.__iIndex
+		return self.__getParts().iIndex
 
 	@property
 	def sZero(self):
-		return self.__sZero
+		return self.__getFamily().sZero
 
 	@property
 	def sPasser(self):
-		return self.__sPasser
+		return self.__getFamily().sPasser
 
 	@property
 	def sSpace(self):
-		return self.__sSpace
+		return self.__getFamily().sSpace
 
 	@property
 	def lStacks(self):
-		return self.__lStacks
+		return list(self.__getFamily(bStacks = True).lStacks)
 
 	@property
 	def iStacks(self):
-		return self.__iStacks
+		return self.__getAttr('iStacks')
 
 	@property
 	def sSub(self):
-		return self.__sSub
+		return self.__getAttr('sSub') or None
 
 	@property
 	def bSub(self):
-		return self.__bSub
+		return bool(self.__getAttr('sSub'))
 
 	@property
 	def sOutput(self):
-		return self.__sOutput
+		return self.__getAttr('sOutput')
 
 	@property
 	def sSideKey(self):
-		sKey = getFullNameFromKey(self.__sSide, 'side')
+		sKey = naming.getFullNameFromKey(self.sSide, 'side')
 		return sKey
 
 	@property
@@ -263,144 +438,120 @@ class oControl(object):
 	def sSide(self, sKey):
 		if sKey:
 			sName = naming.getKeyFromNamePart(sKey, 'side')
-			self.__sSide = sName
-			self.__renameCtrl()
+			self.__renameCtrl(sSide = sName)
 
 	@sPart.setter
 	def sPart(self, sKey):
 		if sKey:
-			self.__sPartt = sKey
-			self.__renameCtrl()
+			self.__renameCtrl(sPart = sKey)
 
 	@iIndex.setter
 	def iIndex(self, iKey):
 		if iKey:
-			self.__iIndex = iKey
-			self.__renameCtrl()
+			self.__renameCtrl(iIndex = iKey)
 
 	@iStacks.setter
 	def iStacks(self, iKey):
 		if iKey < 1:
 			iKey = 1
-		if self.__iStacks != iKey:
+		if self.iStacks != iKey:
 			self.__updateStacks(iKey)
 
 	@bSub.setter
 	def bSub(self, bKey):
-		if self.__bSub != bool(bKey):
+		if self.bSub != bool(bKey):
 			self.__updateSub()
 
-	def __getCtrlInfo(self, sCtrl):
-		self.__sName = sCtrl
-
-		oCtrlName = naming.oName(sCtrl)
-
-		self.__sSide = oCtrlName.sSide
-		self.__sPart = oCtrlName.sPart
-		self.__iIndex = oCtrlName.iIndex
-		self.__iSuffix = oCtrlName.iSuffix
-
-		self.__sOutput = cmds.getAttr('%s.sOutput' %sCtrl)
-
-		sSub = cmds.getAttr('%s.sSub' %sCtrl)
-		if sSub:
-			self.__sSub = sSub
-			self.__bSub = True
+	def __clearInfo(self):
+		self.__oParts = None
+		self.__dAttrs = {}
+
+	def __getParts(self):
+		if self.__oParts is None:
+			self.__oParts = naming.parse(self.__sName)
+		return self.__oParts
+
+	def __getAttr(self, sAttr):
+		if sAttr not in self.__dAttrs:
+			oControl.dStats['iGetAttrs'] += 1
+			self.__dAttrs[sAttr] = cmds.getAttr('%s.%s' %(self.__sName, sAttr))
+		return self.__dAttrs[sAttr]
+
+	def __getFamily(self, bStacks = False):
+		'''
+		the name family is cached by naming, only the stack names need the iStacks getAttr
+		'''
+		oParts = self.__getParts()
+		if bStacks:
+			iStacks = self.iStacks
 		else:
-			self.__sSub = None
-			self.__bSub = False
-
-		iStacks = cmds.getAttr('%s.iStacks' %sCtrl)
-		self.__lStacks = []
-		for i in range(iStacks):
-			sStack = naming.oName(sType = 'stack', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex, iSuffix = i + 1).sName
-			self.__lStacks.append(sStack)
-		self.__iStacks = iStacks
-
-		self.__sSpace = naming.oName(sType = 'space', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName		
-		self.__sPasser = naming.oName(sType = 'passer', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-		self.__sZero = naming.oName(sType = 'zero', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-
-		self.__sMultMatrixOutputLocal = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sMatrixOutputLocal' %self.__sPart, iIndex = self.__iIndex).sName
-		self.__sMultMatrixOutputWorld = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sMatrixOutputWorld' %self.__sPart, iIndex = self.__iIndex).sName
-		self.__sMultMatrixStacks = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sStacksMatrixOutput' %self.__sPart, iIndex = self.__iIndex).sName
-	
-
-	def __renameCtrl(self):
-		sZero = naming.oName(sType = 'zero', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sZero, sZero)
-		sPasser = naming.oName(sType = 'passer', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sPasser, sPasser)
-		sSpace = naming.oName(sType = 'space', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sSpace, sSpace)
-		lStacks = []
-		for i in range(len(self.__lStacks)):
-			sStack = naming.oName(sType = 'stack', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex, iSuffix = i + 1).sName
-			cmds.rename(self.__lStacks[i], sStack)
-			lStacks.append(sStack)
-		sCtrl = naming.oName(sType = 'ctrl', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sName, sCtrl)
-		if self.__sSub:
-			sSub = naming.oName(sType = 'ctrl', sSide = self.__sSide, sPart = '%sSub' %self.__sPart, iIndex = self.__iIndex).sName
-			cmds.rename(self.__sSub, sSub)
-			cmds.setAttr('%s.sSub' %sCtrl, lock = False)
-			cmds.setAttr('%s.sSub' %sCtrl, sSub, type = 'string', lock = True)
-
-		sMultMatrixOutputLocal = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sMatrixOutputLocal' %self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sMultMatrixOutputLocal, sMultMatrixOutputLocal)
-
-		sMultMatrixOutputWorld = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sMatrixOutputWorld' %self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sMultMatrixOutputWorld, sMultMatrixOutputWorld)
-
-		sMultMatrixStacks = naming.oName(sType = 'multMatrix', sSide = self.__sSide, sPart = '%sStacksMatrixOutput' %self.__sPart, iIndex = self.__iIndex).sName
-		cmds.rename(self.__sMultMatrixStacks, sMultMatrixStacks)
-
-		self.__getCtrlInfo(sCtrl)
+			iStacks = 0
+		return naming.getNameFamily('control', sSide = oParts.sSide, sPart = oParts.sPart, iIndex = oParts.iIndex, iCount = iStacks)
+
+	def __renameCtrl(self, sSide = None, sPart = None, iIndex = None):
+		oFamily = self.__getFamily(bStacks = True)
+		oFamilyNew = naming.getNameFamily('control', sSide = sSide or self.sSide, sPart = sPart or self.sPart, iIndex = iIndex or self.iIndex, iCount = self.iStacks)
+		bSub = self.bSub
+		for sName, sNameNew in naming.getNameFamilyRenames(oFamily, oFamilyNew):
+			if cmds.objExists(sName):
+				cmds.rename(sName, sNameNew)
+		sCtrl = oFamilyNew.sCtrl
+		for sAttr, sValue in [('sSub', bSub and oFamilyNew.sSub), ('sOutput', oFamilyNew.sOutput)]:
+			if sValue:
+				cmds.setAttr('%s.%s' %(sCtrl, sAttr), lock = False)
+				cmds.setAttr('%s.%s' %(sCtrl, sAttr), sValue, type = 'string', lock = True)
+
+		if oControl.dInstances.get(self.__sName, None) is self:
+			oControl.dInstances.pop(self.__sName)
+			oControl.dInstances[sCtrl] = self
+		self.__sName = sCtrl
+		self.__clearInfo()
 
 	def __updateStacks(self, iKey):
-		if iKey < self.__iStacks:
-			lChilds = cmds.listRelatives(self.__lStacks[-1], c = True, type = 'transform')
-			cmds.parent(lChilds, self.__lStacks[iKey - 1])
-			cmds.delete(self.__lStacks[iKey:])
+		iStacks = self.iStacks
+		lStacks = self.lStacks
+		if iKey < iStacks:
+			lChilds = cmds.listRelatives(lStacks[-1], c = True, type = 'transform')
+			cmds.parent(lChilds, lStacks[iKey - 1])
+			cmds.delete(lStacks[iKey:])
 		else:
-			sParentStack = self.__lStacks[-1]
-			lChilds = cmds.listRelatives(self.__lStacks[-1], c = True, type = 'transform')
-			for i in range(self.__iStacks, iKey):
-				sStack = naming.oName(sType = 'stack', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex, iSuffix = i + 1).sName
+			sParentStack = lStacks[-1]
+			lChilds = cmds.listRelatives(lStacks[-1], c = True, type = 'transform')
+			oFamily = naming.getNameFamily('control', sSide = self.sSide, sPart = self.sPart, iIndex = self.iIndex, iCount = iKey)
+			for sStack in oFamily.lStacks[iStacks:]:
 				sStack = transforms.createTransformNode(sStack, sParent = sParentStack)
-				transforms.transformSnap([sParentStack], [sStack])
+				transforms.transformSnap([sParentStack, sStack])
 				sParentStack = sStack
 			cmds.parent(lChilds, sParentStack)
 		cmds.setAttr('%s.iStacks' %self.__sName, lock = False)
 		cmds.setAttr('%s.iStacks' %self.__sName, iKey, lock = True)
 		cmds.select(self.__sName)
 
-		cmds.delete(self.__sMultMatrixStacks)
-		cmds.createNode('multMatrix', name = self.__sMultMatrixStacks)
-		for i in range(iKey):
-			iNum = iKey - i
-			sStack = naming.oName(sType = 'stack', sSide = self.__sSide, sPart = self.__sPart, iIndex = self.__iIndex, iSuffix = iNum).sName
-			cmds.connectAttr('%s.matrix' %sStack, '%s.matrixIn[%d]' %(self.__sMultMatrixStacks, i))
-		cmds.connectAttr('%s.matrixSum' %self.__sMultMatrixStacks, '%s.matrixIn[2]' %self.__sMultMatrixOutputLocal)
+		sMultMatrixStacks = self.__getFamily().sMultMatrixStacks
+		cmds.delete(sMultMatrixStacks)
+		cmds.createNode('multMatrix', name = sMultMatrixStacks)
+		oFamily = naming.getNameFamily('control', sSide = self.sSide, sPart = self.sPart, iIndex = self.iIndex, iCount = iKey)
+		for i, sStack in enumerate(reversed(oFamily.lStacks)):
+			cmds.connectAttr('%s.matrix' %sStack, '%s.matrixIn[%d]' %(sMultMatrixStacks, i))
+		cmds.connectAttr('%s.matrixSum' %sMultMatrixStacks, '%s.matrixIn[2]' %self.__getFamily().sMultMatrixOutputLocal)
 
-		self.__getCtrlInfo(self.__sName)
+		self.__clearInfo()
 
 	def __updateSub(self):
 		cmds.setAttr('%s.sSub' %self.__sName, lock = False)
-		if self.__bSub:
-			lChilds = cmds.listRelatives(self.__sSub, c = True, type = 'transform')
+		if self.bSub:
+			lChilds = cmds.listRelatives(self.sSub, c = True, type = 'transform')
 			print lChilds
 			if lChilds:
 				cmds.parent(lChilds, self.__sName)
-			cmds.delete(self.__sSub)
+			cmds.delete(self.sSub)
 			cmds.setAttr('%s.sSub' %self.__sName, '', type = 'string', lock = True)
 			cmds.deleteAttr('%s.subCtrlVis' %self.__sName)
 		else:
 			cmds.addAttr(self.__sName, ln = 'subCtrlVis', at = 'long', keyable = False, min = 0, max = 1, dv = 0)
 			cmds.setAttr('%s.subCtrlVis' %self.__sName, channelBox = True)
-			sSub = naming.oName(sType = 'ctrl', sSide = self.__sSide, sPart = '%sSub' %self.__sPart, iIndex = self.__iIndex).sName
-			sSub = transforms.createTransformNode(sSub, sParent = self.__sName)
-			transforms.transformSnap([self.__sName], [sSub])
+			sSub = transforms.createTransformNode(self.__getFamily().sSub, sParent = self.__sName)
+			transforms.transformSnap([self.__sName, sSub])
 			attributes.connectAttrs(['%s.subCtrlVis' %self.__sName], ['%s.v' %sSub], bForce = True)
 			for sAttr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v']:
 				if cmds.getAttr('%s.%s' %(self.__sName, sAttr), lock = True):
@@ -410,7 +561,7 @@ class oControl(object):
 			scaleCtrlShape(sSub, fScale = 0.9)
 			cmds.setAttr('%s.sSub' %self.__sName, sSub, type = 'string', lock = True)
 		cmds.select(self.__sName)
-		self.__getCtrlInfo(self.__sName)
+		self.__clearInfo()
 
 
 
@@ -418,7 +569,7 @@ class oControl(object):
 		
 
 #------------ create controller functions -----------
-def create(sPart, sSide = 'middle', iIndex = None, bSub = False, iStacks = 1, sParent = None, sPos = None, iRotateOrder = 0, sShape = 'cube', fSize = 1, sColor = None, lLockHideAttrs = []):
+def create(sPart, sSide = 'middle', iIndex = None, bSub = False, iStacks = 1, sParent = None, sPos = None, iRotateOrder = 0, sShape = 'cube', fSize = 1, sColor = None, lLockHideAttrs = [], sShapeAxis = 'y', lShapeOffset = None, fShapeThickness = None):
 	'''
 	create control function
 
@@ -432,77 +583,62 @@ def create(sPart, sSide = 'middle', iIndex = None, bSub = False, iStacks = 1, sP
 	sParent: where the control should be parented
 	sPos: where the control would be snapped to
 	iRotateOrder: set the control's rotateOrder
-	sShape: control's shape
+	sShape: control's shape, a shape name in controlShapeLibrary
 	fSize: control's shape's size
 	sColor: control's shape color string/index
 	lLockHideAttrs: list of attributes should be locked and hidden
+	sShapeAxis: the axis the shape's +y is turned to
+	lShapeOffset: shape's offset from the control's pivot
+	fShapeThickness: shape's line width
 	'''
+	oFamily = naming.getNameFamily('control', sSide = sSide, sPart = sPart, iIndex = iIndex, iCount = iStacks)
+
 	## zero grp
-	sZero = naming.oName(sType = 'zero', sSide = sSide, sPart = sPart, iIndex = iIndex).sName
-	sZero = transforms.createTransformNode(sZero, sParent = sParent, iRotateOrder = iRotateOrder)
+	sZero = transforms.createTransformNode(oFamily.sZero, sParent = sParent, iRotateOrder = iRotateOrder)
 
 	## passer grp
-	sPasser = naming.oName(sType = 'passer', sSide = sSide, sPart = sPart, iIndex = iIndex).sName
-	sPasser = transforms.createTransformNode(sPasser, sParent = sZero, iRotateOrder = iRotateOrder)
+	sPasser = transforms.createTransformNode(oFamily.sPasser, sParent = sZero, iRotateOrder = iRotateOrder)
 
 	## passer grp
-	sSpace = naming.oName(sType = 'space', sSide = sSide, sPart = sPart, iIndex = iIndex).sName
-	sSpace = transforms.createTransformNode(sSpace, sParent = sPasser, iRotateOrder = iRotateOrder)
+	sSpace = transforms.createTransformNode(oFamily.sSpace, sParent = sPasser, iRotateOrder = iRotateOrder)
 
 	## stacks grp
 	sParentStack = sSpace
-	for i in range(iStacks):
-		sStack = naming.oName(sType = 'stack', sSide = sSide, sPart = sPart, iIndex = iIndex, iSuffix = i + 1).sName
+	for sStack in oFamily.lStacks:
 		sStack = transforms.createTransformNode(sStack, sParent = sParentStack, iRotateOrder = iRotateOrder)
 		sParentStack = sStack
 
 	## ctrl
-	oCtrl = naming.oName(sType = 'ctrl', sSide = sSide, sPart = sPart, iIndex = iIndex)
-	sCtrl = oCtrl.sName
-	sCtrl = transforms.createTransformNode(sCtrl, lLockHideAttrs = lLockHideAttrs, sParent = sParentStack, iRotateOrder = iRotateOrder)
+	sCtrl = transforms.createTransformNode(oFamily.sCtrl, sParent = sParentStack, iRotateOrder = iRotateOrder)
 
 	## output
-	sOutput = naming.oName(sType = 'grp', sSide = sSide, sPart = '%sOutput' %sPart, iIndex = iIndex).sName
-	sOutput = transforms.createTransformNode(sOutput, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sCtrl, iRotateOrder = iRotateOrder)
+	sOutput = transforms.createTransformNode(oFamily.sOutput, sParent = sCtrl, iRotateOrder = iRotateOrder)
 
 	## sub Ctrl
 	if bSub:
 		cmds.addAttr(sCtrl, ln = 'subCtrlVis', at = 'long', keyable = False, min = 0, max = 1, dv = 0)
 		cmds.setAttr('%s.subCtrlVis' %sCtrl, channelBox = True)
-		sSub = naming.oName(sType = 'ctrl', sSide = sSide, sPart = '%sSub' %sPart, iIndex = iIndex).sName
-		sSub = transforms.createTransformNode(sSub, lLockHideAttrs = lLockHideAttrs, sParent = sCtrl, iRotateOrder = iRotateOrder)
-		attributes.connectAttrs(['%s.subCtrlVis' %sCtrl], ['%s.v' %sSub], bForce = True)
-		attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = sSub, sDriven = sOutput, bForce = True)
+		sSub = transforms.createTransformNode(oFamily.sSub, sParent = sCtrl, iRotateOrder = iRotateOrder)
+		lEdges = [('%s.subCtrlVis' %sCtrl, '%s.v' %sSub, True)]
+		for sAttr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz']:
+			lEdges.append(('%s.%s' %(sSub, sAttr), '%s.%s' %(sOutput, sAttr), True))
+		attributes.connectAttrsBatch(lEdges)
+
+	## lock and hide, after the connections
+	attributes.applyAttrProfile([sOutput], 'lockedGroup')
+	lCtrlNodes = [sCtrl]
+	if bSub:
+		lCtrlNodes.append(sSub)
+	attributes.applyAttrProfile(lCtrlNodes, lLockHideAttrs)
 
 	## add shape
-	if sColor:
-		if isinstance(sColor, basestring):
-			iColor = controlShapeDict.dColors[sColor]
-		else:
-			iColor = sColor
-	else:
-		if 'm' in oCtrl.sSide:
-			iColor = controlShapeDict.dColors['yellow']
-		elif 'l' in oCtrl.sSide:
-			iColor = controlShapeDict.dColors['blue']
-		else:
-			iColor = controlShapeDict.dColors['red']
-
-	dCtrlShapeInfo = {
-						'lCtrlPnts': controlShapeDict.dCtrlShapes[sShape]['lCtrlPnts'],
-						'lKnots': controlShapeDict.dCtrlShapes[sShape]['lKnots'],
-						'bPeriodic': controlShapeDict.dCtrlShapes[sShape]['bPeriodic'],
-						'iDegree': controlShapeDict.dCtrlShapes[sShape]['iDegree'],
-						'bOverride': True,
-						'iOverrideType': 0,
-						'iColor': iColor
-						}
+	iColor = __getCtrlColor(sColor, oFamily.sSide)
 
+	dCtrlShapeInfo = __getLibraryShapeInfo(sShape, fSize, iColor, sShapeAxis = sShapeAxis, lShapeOffset = lShapeOffset, fShapeThickness = fShapeThickness)
 	addCtrlShape([sCtrl], '%sShape' %sCtrl, bVis = True, dCtrlShapeInfo = dCtrlShapeInfo)
-	scaleCtrlShape(sCtrl, fScale = fSize)
 	if bSub:
+		dCtrlShapeInfo = __getLibraryShapeInfo(sShape, fSize * 0.9, iColor, sShapeAxis = sShapeAxis, lShapeOffset = lShapeOffset, fShapeThickness = fShapeThickness)
 		addCtrlShape([sSub], '%sShape' %sSub, bVis = True, dCtrlShapeInfo = dCtrlShapeInfo)
-		scaleCtrlShape(sSub, fScale = fSize * 0.9)
 
 	if sPos:
 		transforms.transformSnap([sPos, sZero])
@@ -524,17 +660,17 @@ def create(sPart, sSide = 'middle', iIndex = None, bSub = False, iStacks = 1, sP
 	cmds.addAttr(sCtrl, ln = 'matrixOutputWorld', at = 'matrix')
 	cmds.addAttr(sCtrl, ln = 'inverseMatrixOutputWorld', at = 'matrix')
 
-	sInverseMatrixOutputLocal = cmds.createNode('inverseMatrix', name = naming.oName(sType = 'inverseMatrix', sSide = sSide, sPart = '%sInverseMatrixOutputLocal' %sPart, iIndex = iIndex).sName)
+	sInverseMatrixOutputLocal = cmds.createNode('inverseMatrix', name = oFamily.sInverseMatrixOutputLocal)
 	cmds.connectAttr('%s.matrixOutputLocal' %sCtrl, '%s.inputMatrix' %sInverseMatrixOutputLocal)
 	cmds.connectAttr('%s.outputMatrix' %sInverseMatrixOutputLocal, '%s.inverseMatrixOutputLocal' %sCtrl)
 
-	sInverseMatrixOutputWorld = cmds.createNode('inverseMatrix', name = naming.oName(sType = 'inverseMatrix', sSide = sSide, sPart = '%sInverseMatrixOutputWorld' %sPart, iIndex = iIndex).sName)
+	sInverseMatrixOutputWorld = cmds.createNode('inverseMatrix', name = oFamily.sInverseMatrixOutputWorld)
 	cmds.connectAttr('%s.matrixOutputWorld' %sCtrl, '%s.inputMatrix' %sInverseMatrixOutputWorld)
 	cmds.connectAttr('%s.outputMatrix' %sInverseMatrixOutputWorld, '%s.inverseMatrixOutputWorld' %sCtrl)
 
-	sMultMatrixLocal = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = sSide, sPart = '%sMatrixOutputLocal' %sPart, iIndex = iIndex).sName)
-	sMultMatrixWorld = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = sSide, sPart = '%sMatrixOutputWorld' %sPart, iIndex = iIndex).sName)
-	sMultMatrixStacks = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = sSide, sPart = '%sStacksMatrixOutput' %sPart, iIndex = iIndex).sName)
+	sMultMatrixLocal = cmds.createNode('multMatrix', name = oFamily.sMultMatrixOutputLocal)
+	sMultMatrixWorld = cmds.createNode('multMatrix', name = oFamily.sMultMatrixOutputWorld)
+	sMultMatrixStacks = cmds.createNode('multMatrix', name = oFamily.sMultMatrixStacks)
 
 	cmds.connectAttr('%s.matrix' %sOutput, '%s.matrixIn[0]' %sMultMatrixLocal)
 	cmds.connectAttr('%s.matrix' %sCtrl, '%s.matrixIn[1]' %sMultMatrixLocal)
@@ -543,18 +679,216 @@ def create(sPart, sSide = 'middle', iIndex = None, bSub = False, iStacks = 1, sP
 	cmds.connectAttr('%s.matrix' %sPasser, '%s.matrixIn[4]' %sMultMatrixLocal)
 	cmds.connectAttr('%s.matrixSum' %sMultMatrixLocal, '%s.matrixOutputLocal' %sCtrl)
 
-	for i in range(iStacks):
-		iNum = iStacks - i
-		sStack = naming.oName(sType = 'stack', sSide = sSide, sPart = sPart, iIndex = iIndex, iSuffix = iNum).sName
+	for i, sStack in enumerate(reversed(oFamily.lStacks)):
 		cmds.connectAttr('%s.matrix' %sStack, '%s.matrixIn[%d]' %(sMultMatrixStacks, i))
 
 	cmds.connectAttr('%s.matrixSum' %sMultMatrixLocal, '%s.matrixIn[0]' %sMultMatrixWorld)
 	cmds.connectAttr('%s.matrix' %sZero, '%s.matrixIn[1]' %sMultMatrixWorld)
 	cmds.connectAttr('%s.matrixSum' %sMultMatrixWorld, '%s.matrixOutputWorld' %sCtrl)
 
-	oCtrl = oControl(sCtrl)
+	oCtrl = oControl.get(sCtrl, bRefresh = True)
 	return oCtrl
 
+def createMany(lSpecs):
+	'''
+	create a list of controls in one modifier pass, same hierarchy, metadata, shape and matrix outputs as create
+
+	return a list of control wrappers
+
+	lSpecs: a list of dicts with the create keyword arguments, sPart is required,
+			sParent and sPos can be a control created earlier in the list
+
+	the api modifiers are not on maya's undo queue, undoCreateMany removes the last batch
+	'''
+	lSpecs = [__getCtrlSpec(dSpec) for dSpec in lSpecs]
+
+	## check the names before touching the scene
+	lNamesBatch = []
+	for dSpec in lSpecs:
+		oFamily = dSpec['oFamily']
+		lNames = [oFamily.sZero, oFamily.sPasser, oFamily.sSpace, oFamily.sCtrl, '%sShape' %oFamily.sCtrl, oFamily.sOutput,
+				  oFamily.sInverseMatrixOutputLocal, oFamily.sInverseMatrixOutputWorld,
+				  oFamily.sMultMatrixOutputLocal, oFamily.sMultMatrixOutputWorld, oFamily.sMultMatrixStacks]
+		lNames += list(oFamily.lStacks)
+		if dSpec['bSub']:
+			lNames += [oFamily.sSub, '%sShape' %oFamily.sSub]
+		for sName in lNames:
+			nameRegistry.checkName(sName)
+		lNamesBatch += lNames
+	if len(set(lNamesBatch)) != len(lNamesBatch):
+		lDuplicated = sorted(set([sName for sName in lNamesBatch if lNamesBatch.count(sName) > 1]))
+		raise RuntimeError('createMany has duplicated names: %s' %', '.join(lDuplicated))
+
+	## dag nodes
+	mDagMod = OpenMaya.MDagModifier()
+	dObjects = {}
+	lTransforms = []
+	lShapes = []
+	for dSpec in lSpecs:
+		oFamily = dSpec['oFamily']
+		iRotateOrder = dSpec['iRotateOrder']
+		mObjParent = OpenMaya.MObject.kNullObj
+		if dSpec['sParent'] in dObjects:
+			mObjParent = dObjects[dSpec['sParent']]
+		elif dSpec['sParent'] and nameRegistry.exists(dSpec['sParent']):
+			mObjParent = apiUtils.setMObj(dSpec['sParent'])
+
+		lHierarchy = [(oFamily.sZero, []), (oFamily.sPasser, []), (oFamily.sSpace, [])]
+		lHierarchy += [(sStack, []) for sStack in oFamily.lStacks]
+		lHierarchy.append((oFamily.sCtrl, dSpec['lLockHideAttrs']))
+		for sName, profile in lHierarchy:
+			mObjParent = __createNodeMod(mDagMod, 'transform', sName, dObjects, mObjParent = mObjParent)
+			lTransforms.append((sName, iRotateOrder, profile))
+		__createNodeMod(mDagMod, 'transform', oFamily.sOutput, dObjects, mObjParent = dObjects[oFamily.sCtrl])
+		lTransforms.append((oFamily.sOutput, iRotateOrder, 'lockedGroup'))
+
+		lShapeCtrls = [(oFamily.sCtrl, dSpec['fSize'])]
+		if dSpec['bSub']:
+			__createNodeMod(mDagMod, 'transform', oFamily.sSub, dObjects, mObjParent = dObjects[oFamily.sCtrl])
+			lTransforms.append((oFamily.sSub, iRotateOrder, dSpec['lLockHideAttrs']))
+			lShapeCtrls.append((oFamily.sSub, dSpec['fSize'] * 0.9))
+		for sCtrl, fSize in lShapeCtrls:
+			sCtrlShape = '%sShape' %sCtrl
+			__createNodeMod(mDagMod, 'nurbsCurve', sCtrlShape, dObjects, mObjParent = dObjects[sCtrl])
+			lShapes.append((sCtrlShape, __getLibraryShapeInfo(dSpec['sShape'], fSize, __getCtrlColor(dSpec['sColor'], oFamily.sSide),
+															  sShapeAxis = dSpec['sShapeAxis'], lShapeOffset = dSpec['lShapeOffset'], fShapeThickness = dSpec['fShapeThickness'])))
+	mDagMod.doIt()
+
+	## dg nodes and control info attrs
+	mDgMod = OpenMaya.MDGModifier()
+	for dSpec in lSpecs:
+		oFamily = dSpec['oFamily']
+		for sName, sNodeType in [(oFamily.sInverseMatrixOutputLocal, 'inverseMatrix'), (oFamily.sInverseMatrixOutputWorld, 'inverseMatrix'),
+								 (oFamily.sMultMatrixOutputLocal, 'multMatrix'), (oFamily.sMultMatrixOutputWorld, 'multMatrix'),
+								 (oFamily.sMultMatrixStacks, 'multMatrix')]:
+			__createNodeMod(mDgMod, sNodeType, sName, dObjects)
+
+		mObjCtrl = dObjects[oFamily.sCtrl]
+		mFnTyped = OpenMaya.MFnTypedAttribute()
+		mFnNumeric = OpenMaya.MFnNumericAttribute()
+		mFnMatrix = OpenMaya.MFnMatrixAttribute()
+		if dSpec['bSub']:
+			mAttr = mFnNumeric.create('subCtrlVis', 'subCtrlVis', OpenMaya.MFnNumericData.kLong, 0)
+			mFnNumeric.setMin(0)
+			mFnNumeric.setMax(1)
+			mFnNumeric.setKeyable(False)
+			mFnNumeric.setChannelBox(True)
+			mDgMod.addAttribute(mObjCtrl, mAttr)
+		mDgMod.addAttribute(mObjCtrl, mFnTyped.create('sOutput', 'sOutput', OpenMaya.MFnData.kString))
+		mDgMod.addAttribute(mObjCtrl, mFnNumeric.create('iStacks', 'iStacks', OpenMaya.MFnNumericData.kLong, dSpec['iStacks']))
+		mDgMod.addAttribute(mObjCtrl, mFnTyped.create('sSub', 'sSub', OpenMaya.MFnData.kString))
+		for sAttr in ['matrixOutputLocal', 'inverseMatrixOutputLocal', 'matrixOutputWorld', 'inverseMatrixOutputWorld']:
+			mDgMod.addAttribute(mObjCtrl, mFnMatrix.create(sAttr, sAttr))
+	mDgMod.doIt()
+
+	## plug values and connections
+	mDgModConnect = OpenMaya.MDGModifier()
+	for sName, iRotateOrder, profile in lTransforms:
+		if iRotateOrder:
+			mDgModConnect.newPlugValueInt(__getPlug(dObjects[sName], 'rotateOrder'), iRotateOrder)
+	for sCtrlShape, dCtrlShapeInfo in lShapes:
+		mObjShape = dObjects[sCtrlShape]
+		mDgModConnect.newPlugValue(__getPlug(mObjShape, 'cached'), __createCtrlShapeData(dCtrlShapeInfo))
+		mDgModConnect.newPlugValueBool(__getPlug(mObjShape, 'overrideEnabled'), True)
+		mDgModConnect.newPlugValueInt(__getPlug(mObjShape, 'overrideColor'), dCtrlShapeInfo['iColor'])
+		if dCtrlShapeInfo['fLineWidth'] is not None and OpenMaya.MFnDependencyNode(mObjShape).hasAttribute('lineWidth'):
+			mDgModConnect.newPlugValueDouble(__getPlug(mObjShape, 'lineWidth'), dCtrlShapeInfo['fLineWidth'])
+
+	for dSpec in lSpecs:
+		oFamily = dSpec['oFamily']
+		dObjs = dict([(sName, dObjects[sName]) for sName in [oFamily.sZero, oFamily.sPasser, oFamily.sSpace, oFamily.sCtrl, oFamily.sOutput,
+															 oFamily.sInverseMatrixOutputLocal, oFamily.sInverseMatrixOutputWorld,
+															 oFamily.sMultMatrixOutputLocal, oFamily.sMultMatrixOutputWorld, oFamily.sMultMatrixStacks]])
+		mObjCtrl = dObjs[oFamily.sCtrl]
+		lConnections = []
+		if dSpec['bSub']:
+			lConnections.append((dObjects[oFamily.sCtrl], 'subCtrlVis', None, dObjects[oFamily.sSub], 'visibility', None))
+			for sAttr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz']:
+				lConnections.append((dObjects[oFamily.sSub], sAttr, None, dObjs[oFamily.sOutput], sAttr, None))
+
+		lConnections += [(mObjCtrl, 'matrixOutputLocal', None, dObjs[oFamily.sInverseMatrixOutputLocal], 'inputMatrix', None),
+						 (dObjs[oFamily.sInverseMatrixOutputLocal], 'outputMatrix', None, mObjCtrl, 'inverseMatrixOutputLocal', None),
+						 (mObjCtrl, 'matrixOutputWorld', None, dObjs[oFamily.sInverseMatrixOutputWorld], 'inputMatrix', None),
+						 (dObjs[oFamily.sInverseMatrixOutputWorld], 'outputMatrix', None, mObjCtrl, 'inverseMatrixOutputWorld', None)]
+
+		for i, sNode in enumerate([oFamily.sOutput, oFamily.sCtrl, oFamily.sMultMatrixStacks, oFamily.sSpace, oFamily.sPasser]):
+			if sNode == oFamily.sMultMatrixStacks:
+				lConnections.append((dObjs[sNode], 'matrixSum', None, dObjs[oFamily.sMultMatrixOutputLocal], 'matrixIn', i))
+			else:
+				lConnections.append((dObjs[sNode], 'matrix', None, dObjs[oFamily.sMultMatrixOutputLocal], 'matrixIn', i))
+		lConnections.append((dObjs[oFamily.sMultMatrixOutputLocal], 'matrixSum', None, mObjCtrl, 'matrixOutputLocal', None))
+
+		for i, sStack in enumerate(reversed(oFamily.lStacks)):
+			lConnections.append((dObjects[sStack], 'matrix', None, dObjs[oFamily.sMultMatrixStacks], 'matrixIn', i))
+
+		lConnections += [(dObjs[oFamily.sMultMatrixOutputLocal], 'matrixSum', None, dObjs[oFamily.sMultMatrixOutputWorld], 'matrixIn', 0),
+						 (dObjs[oFamily.sZero], 'matrix', None, dObjs[oFamily.sMultMatrixOutputWorld], 'matrixIn', 1),
+						 (dObjs[oFamily.sMultMatrixOutputWorld], 'matrixSum', None, mObjCtrl, 'matrixOutputWorld', None)]
+
+		for mObjDriver, sDriverAttr, iDriverIndex, mObjDriven, sDrivenAttr, iDrivenIndex in lConnections:
+			mDgModConnect.connect(__getPlug(mObjDriver, sDriverAttr, iIndex = iDriverIndex), __getPlug(mObjDriven, sDrivenAttr, iIndex = iDrivenIndex))
+
+		## write control info
+		mDgModConnect.newPlugValueString(__getPlug(mObjCtrl, 'sOutput'), oFamily.sOutput)
+		if dSpec['bSub']:
+			mDgModConnect.newPlugValueString(__getPlug(mObjCtrl, 'sSub'), oFamily.sSub)
+		else:
+			mDgModConnect.newPlugValueString(__getPlug(mObjCtrl, 'sSub'), '')
+	mDgModConnect.doIt()
+
+	## snap, in the list order, so a control parented under an earlier one snaps after it
+	for dSpec in lSpecs:
+		if dSpec['sPos']:
+			mDagPathPos = apiUtils.setDagPath(dSpec['sPos'])[0]
+			mDagPathZero = OpenMaya.MDagPath.getAPathTo(dObjects[dSpec['oFamily'].sZero])
+			mFnPos = OpenMaya.MFnTransform(mDagPathPos)
+			mFnZero = OpenMaya.MFnTransform(mDagPathZero)
+			mQuaternion = OpenMaya.MQuaternion()
+			mFnPos.getRotation(mQuaternion, OpenMaya.MSpace.kWorld)
+			mFnZero.setTranslation(OpenMaya.MVector(mFnPos.rotatePivot(OpenMaya.MSpace.kWorld)), OpenMaya.MSpace.kWorld)
+			mFnZero.setRotation(mQuaternion, OpenMaya.MSpace.kWorld)
+
+	## lock and hide, after all the plug values are set, one attribute profile pass per profile
+	dProfileNodes = {}
+	for sName, iRotateOrder, profile in lTransforms:
+		if profile:
+			dProfileNodes.setdefault(attributes.getAttrProfile(profile), []).append(dObjects[sName])
+	lPlugsLocked = []
+	for oProfile, lObjs in dProfileNodes.items():
+		lPlugsLocked += attributes.applyAttrProfile(lObjs, oProfile)
+	for dSpec in lSpecs:
+		for sAttr in ['sOutput', 'iStacks', 'sSub']:
+			mPlug = __getPlug(dObjects[dSpec['oFamily'].sCtrl], sAttr)
+			mPlug.setLocked(True)
+			lPlugsLocked.append(mPlug)
+
+	lCreateManyHistory.append(([mDagMod, mDgMod, mDgModConnect], lPlugsLocked))
+	del lCreateManyHistory[:-iCreateManyHistorySize]
+
+	lCtrls = [oControl.get(dSpec['oFamily'].sCtrl, bRefresh = True) for dSpec in lSpecs]
+	return lCtrls
+
+def undoCreateMany():
+	'''
+	remove the controls created by the last createMany call, return False if there is nothing to undo
+	'''
+	if not lCreateManyHistory:
+		return False
+	lModifiers, lPlugsLocked = lCreateManyHistory.pop()
+	for mPlug in lPlugsLocked:
+		mPlug.setLocked(False)
+	for mModifier in reversed(lModifiers):
+		mModifier.undoIt()
+	return True
+
+def clearCreateManyHistory():
+	'''
+	drop the createMany modifiers, called on a new or opened scene, their nodes are gone
+	'''
+	del lCreateManyHistory[:]
+
+nameRegistry.addSceneChangedCallback(clearCreateManyHistory)
+
 #------------ create controller functions end -----------
 	
 
@@ -579,27 +913,7 @@ def getCtrlShapeInfo(sCtrl):
 					 }
 	'''
 	sCtrlShape = getCtrlShape(sCtrl)
-	
-	lCtrlPnts = __getCtrlShapeControlPoints(sCtrlShape)
-	lKnots = __getCtrlShapeKnots(sCtrlShape)
-	bPeriodic = bool(cmds.getAttr('%s.form' %sCtrlShape))
-	iDegree = cmds.getAttr('%s.degree' %sCtrlShape)
-	bOverride = cmds.getAttr('%s.overrideEnabled' %sCtrlShape)
-	iOverrideType = cmds.getAttr('%s.overrideDisplayType' %sCtrlShape)
-	iColor = cmds.getAttr('%s.overrideColor' %sCtrlShape)
-
-	dCtrlShapeInfo = {sCtrl:
-						{
-							'sCtrlShape': sCtrlShape,
-							'lCtrlPnts': lCtrlPnts,
-							'lKnots': lKnots,
-							'bPeriodic': bPeriodic,
-							'iDegree': iDegree,
-							'bOverride': bOverride,
-							'iOverrideType': iOverrideType,
-							'iColor': iColor
-						}
-					 }
+	dCtrlShapeInfo = {sCtrl: readCtrlShape(sCtrlShape)}
 
 	return dCtrlShapeInfo
 
@@ -613,6 +927,51 @@ def getCtrlShapeInfoFromList(lCtrls):
 		dCtrlShapeInfo.update(dCtrlShapeInfoEach)
 	return dCtrlShapeInfo
 
+def readCtrlShape(sCtrlShape):
+	'''
+	read the shape node's cvs, knots, degree, form and override state through one MFnNurbsCurve
+	return the shape info dictionary, same keys as getCtrlShapeInfo
+	'''
+	mFnCrv = OpenMaya.MFnNurbsCurve(apiUtils.setMObj(sCtrlShape))
+	mPntArray = OpenMaya.MPointArray()
+	mFnCrv.getCVs(mPntArray, OpenMaya.MSpace.kObject)
+	mKnots = OpenMaya.MDoubleArray()
+	mFnCrv.getKnots(mKnots)
+	dCtrlShapeInfo = {
+						'sCtrlShape': sCtrlShape,
+						'lCtrlPnts': apiUtils.convertMPointArrayToList(mPntArray),
+						'lKnots': apiUtils.convertMDoubleArrayToList(mKnots),
+						'bPeriodic': mFnCrv.form() != OpenMaya.MFnNurbsCurve.kOpen,
+						'iDegree': mFnCrv.degree(),
+						'bOverride': mFnCrv.findPlug('overrideEnabled', False).asBool(),
+						'iOverrideType': mFnCrv.findPlug('overrideDisplayType', False).asInt(),
+						'iColor': mFnCrv.findPlug('overrideColor', False).asInt()
+						}
+	return dCtrlShapeInfo
+
+def writeCtrlShape(sCtrlShape, dCtrlShapeInfo, bColor = True):
+	'''
+	write the shape info to the shape node in place, all the cvs in one setAttr call, undoable
+	return False if the degree, form, knots or cv count differ, the shape node needs a rebuild then
+
+	bColor: either override the color or not
+	'''
+	mFnCrv = OpenMaya.MFnNurbsCurve(apiUtils.setMObj(sCtrlShape))
+	mKnots = OpenMaya.MDoubleArray()
+	mFnCrv.getKnots(mKnots)
+	if mFnCrv.degree() != dCtrlShapeInfo['iDegree'] or (mFnCrv.form() != OpenMaya.MFnNurbsCurve.kOpen) != bool(dCtrlShapeInfo['bPeriodic']):
+		return False
+	if mFnCrv.numCVs() != len(dCtrlShapeInfo['lCtrlPnts']) or apiUtils.convertMDoubleArrayToList(mKnots) != list(dCtrlShapeInfo['lKnots']):
+		return False
+	__setCtrlPnts(sCtrlShape, dCtrlShapeInfo['lCtrlPnts'])
+	cmds.setAttr('%s.overrideEnabled' %sCtrlShape, bool(dCtrlShapeInfo['bOverride']))
+	cmds.setAttr('%s.overrideDisplayType' %sCtrlShape, dCtrlShapeInfo['iOverrideType'])
+	if bColor and dCtrlShapeInfo['iColor'] is not None:
+		cmds.setAttr('%s.overrideColor' %sCtrlShape, dCtrlShapeInfo['iColor'])
+	if dCtrlShapeInfo.get('fLineWidth', None) is not None and mFnCrv.hasAttribute('lineWidth'):
+		cmds.setAttr('%s.lineWidth' %sCtrlShape, dCtrlShapeInfo['fLineWidth'])
+	return True
+
 def saveCtrlShapeInfo(lCtrls, sPath):
 	'''
 	save control shape info as a json file to the path
@@ -631,6 +990,11 @@ def buildCtrlShape(sCtrl, dCtrlShapeInfo, bColor = True, bTop = False):
 	'''
 	if cmds.objExists(sCtrl):
 		sCtrlShape = getCtrlShape(sCtrl)
+		## same curve topology, update the shape node in place
+		if sCtrlShape and sCtrlShape == dCtrlShapeInfo['sCtrlShape'] and writeCtrlShape(sCtrlShape, dCtrlShapeInfo, bColor = bColor):
+			if bTop:
+				cmds.reorder(sCtrlShape, f = True)
+			return
 		if sCtrlShape:
 			iColor = cmds.getAttr('%s.overrideColor' %sCtrlShape)
 			cmds.delete(sCtrlShape)
@@ -641,6 +1005,22 @@ def buildCtrlShape(sCtrl, dCtrlShapeInfo, bColor = True, bTop = False):
 		if not bColor and iColor:
 			cmds.setAttr('%s.overrideColor' %sCtrlShape, iColor)
 
+def applyLibraryShape(sCtrl, sShape, fSize = 1, sShapeAxis = 'y', lShapeOffset = None, fShapeThickness = None, sColor = None, bTop = True):
+	'''
+	replace the control's shape node with a controlShapeLibrary shape variant,
+	updated in place if the curve topology is the same
+
+	sColor: shape color string/index, keep the current color if None
+	'''
+	sCtrlShape = getCtrlShape(sCtrl)
+	if sCtrlShape and not sColor:
+		iColor = cmds.getAttr('%s.overrideColor' %sCtrlShape)
+	else:
+		iColor = __getCtrlColor(sColor, naming.parse(sCtrl).sSide or 'm')
+	dCtrlShapeInfo = __getLibraryShapeInfo(sShape, fSize, iColor, sShapeAxis = sShapeAxis, lShapeOffset = lShapeOffset, fShapeThickness = fShapeThickness)
+	dCtrlShapeInfo['sCtrlShape'] = sCtrlShape or '%sShape' %sCtrl
+	buildCtrlShape(sCtrl, dCtrlShapeInfo, bColor = True, bTop = bTop)
+
 def buildCtrlShapesFromCtrlShapeInfo(sPath):
 	'''
 	build controls shapes from given json file
@@ -652,21 +1032,115 @@ def buildCtrlShapesFromCtrlShapeInfo(sPath):
 #------------ save & load ctrlShape functions end -----------
 
 #### Sub Functions
-def __getCtrlShapeControlPoints(sCtrlShape):
-	iCtrlPnts = cmds.getAttr('%s.controlPoints' %sCtrlShape, s = 1)
-	lCtrlPnts = []
-	for i in range(0, iCtrlPnts):
-		lCtrlPntEach = cmds.getAttr('%s.controlPoints[%d]' %(sCtrlShape, i))[0]
-		lCtrlPnts.append([lCtrlPntEach[0], lCtrlPntEach[1], lCtrlPntEach[2]])
-	return lCtrlPnts
-
-def __getCtrlShapeKnots(sCtrlShape):
-	mObj = apiUtils.setMObj(sCtrlShape)
-	mfnCrv = OpenMaya.MFnNurbsCurve(mObj)
-	mKnots = OpenMaya.MDoubleArray()
-	mfnCrv.getKnots(mKnots)
+def __getCtrlCurveShape(mDagPath):
+	'''
+	return the first nurbsCurve shape under the transform, None if it has no curve
+	'''
+	for i in range(mDagPath.childCount()):
+		mObjChild = mDagPath.child(i)
+		if mObjChild.hasFn(OpenMaya.MFn.kNurbsCurve):
+			return mObjChild
+	return None
+
+def __getDagPath(sNode):
+	'''
+	return the node's dag path, None if the name is missing or not unique
+	'''
+	mSel = OpenMaya.MSelectionList()
+	try:
+		mSel.add(sNode)
+	except RuntimeError:
+		return None
+	if mSel.length() != 1:
+		return None
+	mDagPath = OpenMaya.MDagPath()
+	mSel.getDagPath(0, mDagPath)
+	return mDagPath
+
+def __getCtrlColor(sColor, sSide):
+	if sColor:
+		if isinstance(sColor, basestring):
+			iColor = controlShapeDict.dColors[sColor]
+		else:
+			iColor = sColor
+	else:
+		if 'm' in sSide:
+			iColor = controlShapeDict.dColors['yellow']
+		elif 'l' in sSide:
+			iColor = controlShapeDict.dColors['blue']
+		else:
+			iColor = controlShapeDict.dColors['red']
+	return iColor
+
+def __getCtrlSpec(dSpec):
+	'''
+	fill the createMany spec with the create defaults
+	'''
+	if not dSpec.get('sPart', None):
+		raise RuntimeError('createMany spec has no sPart: %s' %dSpec)
+	dCtrlSpec = {'sSide': 'middle', 'iIndex': None, 'bSub': False, 'iStacks': 1, 'sParent': None, 'sPos': None,
+				 'iRotateOrder': 0, 'sShape': 'cube', 'fSize': 1, 'sColor': None, 'lLockHideAttrs': [],
+				 'sShapeAxis': 'y', 'lShapeOffset': None, 'fShapeThickness': None}
+	dCtrlSpec.update(dSpec)
+	dCtrlSpec['oFamily'] = naming.getNameFamily('control', sSide = dCtrlSpec['sSide'], sPart = dCtrlSpec['sPart'], iIndex = dCtrlSpec['iIndex'], iCount = dCtrlSpec['iStacks'])
+	return dCtrlSpec
+
+def __createNodeMod(mModifier, sNodeType, sName, dObjects, mObjParent = None):
+	'''
+	queue the node creation and rename on the modifier, return the node's mObject
+	'''
+	if mObjParent is None:
+		mObj = mModifier.createNode(sNodeType)
+	else:
+		mObj = mModifier.createNode(sNodeType, mObjParent)
+	mModifier.renameNode(mObj, sName)
+	dObjects[sName] = mObj
+	return mObj
+
+def __getPlug(mObj, sAttr, iIndex = None):
+	mPlug = OpenMaya.MFnDependencyNode(mObj).findPlug(sAttr, False)
+	if iIndex is not None:
+		mPlug = mPlug.elementByLogicalIndex(iIndex)
+	return mPlug
+
+def __createCtrlShapeData(dCtrlShapeInfo):
+	'''
+	return a nurbsCurve data object of the shape info
+	'''
+	mObjData = OpenMaya.MFnNurbsCurveData().create()
+	OpenMaya.MFnNurbsCurve().create(apiUtils.convertListToMPointArray(dCtrlShapeInfo['lCtrlPnts']), apiUtils.convertListToMDoubleArray(list(dCtrlShapeInfo['lKnots'])),
+									dCtrlShapeInfo['iDegree'], __getCurveForm(dCtrlShapeInfo['bPeriodic']), False, False, mObjData)
+	return mObjData
+
+def __setCtrlCurveData(sCtrlShape, lCtrlPnts, lKnots, iDegree, bPeriodic):
+	'''
+	set the shape node's curve data in one setAttr call,
+	nurbsCurve data: degree, spans, form, rational, dimension, knots, knot count, cv count, cvs
+	'''
+	if bPeriodic:
+		iForm = 2
+	else:
+		iForm = 0
+	lKnots = list(lKnots)
+	lPnts = [tuple(lPnt[:3]) for lPnt in lCtrlPnts]
+	cmds.setAttr('%s.cc' %sCtrlShape, iDegree, len(lPnts) - iDegree, iForm, False, 3, lKnots, len(lKnots), len(lPnts), *lPnts, type = 'nurbsCurve')
 
-	lKnots = []
-	for i in range(mKnots.length()):
-		lKnots.append(mKnots[i])
-	return lKnots
\ No newline at end of file
+def __setCtrlPnts(sCtrlShape, lCtrlPnts):
+	'''
+	set all the shape node's cvs in one setAttr call, on maya's undo queue unlike MFnNurbsCurve.setCVs
+	'''
+	lValues = [fValue for lPnt in lCtrlPnts for fValue in lPnt[:3]]
+	cmds.setAttr('%s.controlPoints[0:%d]' %(sCtrlShape, len(lCtrlPnts) - 1), *lValues)
+
+def __getCurveForm(bPeriodic):
+	if bPeriodic:
+		return OpenMaya.MFnNurbsCurve.kPeriodic
+	return OpenMaya.MFnNurbsCurve.kOpen
+
+def __getLibraryShapeInfo(sShape, fSize, iColor, sShapeAxis = 'y', lShapeOffset = None, fShapeThickness = None):
+	'''
+	return the library shape variant with the override info, ready for addCtrlShape/buildCtrlShape
+	'''
+	dCtrlShapeInfo = controlShapeLibrary.getShapeInfo(sShape, fSize = fSize, sAxis = sShapeAxis, lOffset = lShapeOffset, fThickness = fShapeThickness)
+	dCtrlShapeInfo.update({'bOverride': True, 'iOverrideType': 0, 'iColor': iColor})
+	return dCtrlShapeInfo
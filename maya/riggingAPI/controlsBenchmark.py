@@ -0,0 +1,60 @@
+## External Import
+import time
+import maya.cmds as cmds
+
+## libs Import
+import controls
+import namingAPI.naming as naming
+
+## Vars
+iControls = 500
+lSides = ['left', 'right', 'middle']
+
+#### Functions
+## a face rig mix, one or two stacks, every other control with a sub control,
+## every control parented under a shared group
+def getSpecs(iCount = iControls, sPart = 'benchmark', sParent = None):
+	lSpecs = []
+	for i in range(iCount):
+		lSpecs.append({'sPart': sPart, 'sSide': lSides[i % 3], 'iIndex': i + 1, 'iStacks': i % 2 + 1,
+					   'bSub': bool(i % 2), 'sParent': sParent, 'sShape': 'cube', 'fSize': 2,
+					   'lLockHideAttrs': ['sx', 'sy', 'sz', 'v']})
+	return lSpecs
+
+def runBenchmark(iCount = iControls):
+	'''
+	print controls per second for create in a loop and for createMany, the controls are removed after each run
+	'''
+	sGrp = cmds.group(empty = True, name = 'controlsBenchmark')
+	dResults = {}
+	try:
+		lSpecs = getSpecs(iCount = iCount, sPart = 'benchmarkCreate', sParent = sGrp)
+		fStartTime = time.time()
+		lCtrls = [controls.create(**dSpec) for dSpec in lSpecs]
+		dResults['create'] = time.time() - fStartTime
+		__deleteCtrls(lCtrls)
+
+		lSpecs = getSpecs(iCount = iCount, sPart = 'benchmarkCreateMany', sParent = sGrp)
+		fStartTime = time.time()
+		controls.createMany(lSpecs)
+		dResults['createMany'] = time.time() - fStartTime
+		controls.undoCreateMany()
+	finally:
+		cmds.delete(sGrp)
+
+	for sKey in sorted(dResults.keys()):
+		print '%-12s %8.2f s %10.1f controls/s' %(sKey, dResults[sKey], iCount / dResults[sKey])
+	print 'createMany is %.1fx faster' %(dResults['create'] / dResults['createMany'])
+	return dResults
+
+#### Sub Functions
+def __deleteCtrls(lCtrls):
+	lNodes = []
+	for oCtrl in lCtrls:
+		oFamily = naming.getNameFamily('control', sSide = oCtrl.sSide, sPart = oCtrl.sPart, iIndex = oCtrl.iIndex, iCount = oCtrl.iStacks)
+		lNodes += [oCtrl.sZero, oFamily.sInverseMatrixOutputLocal, oFamily.sInverseMatrixOutputWorld,
+				   oFamily.sMultMatrixOutputLocal, oFamily.sMultMatrixOutputWorld, oFamily.sMultMatrixStacks]
+	cmds.delete(lNodes)
+
+if __name__ == '__main__':
+	runBenchmark()
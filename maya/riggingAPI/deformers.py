@@ -8,10 +8,18 @@ import time
 import common.apiUtils as apiUtils
 import modelingAPI.meshes as meshes
 import joints
+import skinWeights
 import namingAPI.naming as naming
+import namingAPI.nameRegistry as nameRegistry
 import common.files as files
+import common.arrayFiles as arrayFiles
+import common.spatialIndex as spatialIndex
 reload(files)
 
+## Vars
+sSkinFormat = 'skinCluster'
+iSkinFormatVersion = 2
+
 #### Functions
 def getSkinCluster(sNode):
 	sSkinCluster = mel.eval('findRelatedSkinCluster("' + sNode + '")')
@@ -45,7 +53,7 @@ def createSkinCluster(sNode, lInfluences):
 	oName = naming.oName(sNode)
 	oName.sType = 'skinCluster'
 	for sInfluence in lInfluences:
-		if cmds.objExists(sInfluence):
+		if nameRegistry.exists(sInfluence):
 			if cmds.objectType(sInfluence) == 'joint':
 				lJnts.append(sInfluence)
 			elif cmds.objExists(sInfluence) == 'nurbsCurve':
@@ -55,7 +63,7 @@ def createSkinCluster(sNode, lInfluences):
 		else:
 			joints.createJnt(sInfluence)
 			lJnts.append(sInfluence)
-			if not cmds.objExists(sGrp):
+			if not nameRegistry.exists(sGrp):
 				cmds.group(empty = True, name = sGrp)
 				cmds.setAttr('%s.v' %sGrp, 0)
 			cmds.parent(sInfluence, sGrp)
@@ -93,17 +101,22 @@ def getSkinClusterDataFromMesh(sMesh):
 	iSkinMethod = cmds.getAttr('%s.skinningMethod' %sSkinCluster)
 	bComponents = cmds.getAttr('%s.useComponents' %sSkinCluster)
 	iNormalizeWeights = cmds.getAttr('%s.normalizeWeights' %sSkinCluster)
-	dSkinData = __getSkinWeightsData(sMesh)
+	lInfluences, lWeightOffsets, lWeightInfluences, lWeightValues = __getSkinWeightsData(sMesh)
 	lBlendWeights = __getSkinBlendWeights(sMesh)
 	mVtxPntArray = meshes.getMeshVtxPntArray(sMesh)
-	lVtxPos = apiUtils.convertMPointArrayToList(mVtxPntArray)
+	lVtxPos = []
+	for lPnt in apiUtils.convertMPointArrayToList(mVtxPntArray):
+		lVtxPos += lPnt
 	dSkinData = {
 					'sGeo' : sMesh,
 					'iVtxCount': iVtxCount,
 					'iSkinMethod': iSkinMethod,
 					'bComponents': bComponents,
 					'iNormalizeWeights': iNormalizeWeights,
-					'dSkinData': dSkinData,
+					'lInfluences': lInfluences,
+					'lWeightOffsets': lWeightOffsets,
+					'lWeightInfluences': lWeightInfluences,
+					'lWeightValues': lWeightValues,
 					'lBlendWeights': lBlendWeights,
 					'lVtxPos': lVtxPos
 				}
@@ -112,20 +125,82 @@ def getSkinClusterDataFromMesh(sMesh):
 
 
 #------------ save & load skinCluster functions -----------
-def saveSkinClusterData(sMesh, sPath):
+def saveSkinClusterData(sMesh, sPath, bDoublePrecision = False, iMaxInfluences = None, fPruneWeights = 0):
+	'''
+	save skinCluster data as a binary array file
+	weights are saved as sparse rows (vertex -> influence, weight)
+
+	iMaxInfluences: keep only the biggest weights per vertex
+	fPruneWeights: drop weights not greater than the value
+	the weights are renormalized if any of them is given
+	'''
 	fStartTime = time.time()
 
 	dSkinData = getSkinClusterDataFromMesh(sMesh)
-	files.writePickleFile(sPath, dSkinData)
+	if iMaxInfluences or fPruneWeights:
+		lWeightOffsets, lWeightInfluences, lWeightValues = skinWeights.pruneSparseWeights(dSkinData['lWeightOffsets'], dSkinData['lWeightInfluences'], dSkinData['lWeightValues'], iMaxInfluences = iMaxInfluences, fEpsilon = fPruneWeights)
+		dSkinData['lWeightOffsets'] = lWeightOffsets
+		dSkinData['lWeightInfluences'] = lWeightInfluences
+		dSkinData['lWeightValues'] = lWeightValues
+		if iMaxInfluences:
+			dSkinData['iMaxInfluences'] = iMaxInfluences
+	writeSkinClusterDataFile(sPath, dSkinData, bDoublePrecision = bDoublePrecision)
 
 	fEndTime = time.time()
 
 	print 'saved skinCluster for %s, took %s seconds' %(sMesh, fEndTime - fStartTime)
 
-def loadSkinClusterData(sPath, sMesh = None, sMethod = 'vtxId'):
+def writeSkinClusterDataFile(sPath, dSkinData, bDoublePrecision = False):
+	if bDoublePrecision:
+		sDtype = 'f8'
+	else:
+		sDtype = 'f4'
+	iVtxCount = dSkinData['iVtxCount']
+	iWeights = len(dSkinData['lWeightValues'])
+	dMeta = {
+				'sFormat': sSkinFormat,
+				'iFormatVersion': iSkinFormatVersion,
+				'sGeo': dSkinData['sGeo'],
+				'iVtxCount': iVtxCount,
+				'iSkinMethod': dSkinData['iSkinMethod'],
+				'bComponents': dSkinData['bComponents'],
+				'iNormalizeWeights': dSkinData['iNormalizeWeights'],
+				'lInfluences': dSkinData['lInfluences'],
+				'iMaxInfluences': dSkinData.get('iMaxInfluences', None),
+			}
+	lArrays = [
+				('lWeightOffsets', 'u4', [iVtxCount + 1], dSkinData['lWeightOffsets']),
+				('lWeightInfluences', 'u4', [iWeights], dSkinData['lWeightInfluences']),
+				('lWeightValues', sDtype, [iWeights], dSkinData['lWeightValues']),
+				('lBlendWeights', sDtype, [iVtxCount], dSkinData['lBlendWeights']),
+				('lVtxPos', 'f8', [iVtxCount, 3], dSkinData['lVtxPos']),
+			]
+	arrayFiles.writeArrayFile(sPath, dMeta, lArrays)
+
+def readSkinClusterDataFile(sPath):
+	'''
+	read skinCluster data file, support both the binary array file and the old pickle file
+	the arrays of binary files are memory mapped if numpy is available
+	'''
+	if arrayFiles.isArrayFile(sPath):
+		dMeta, dArrays = arrayFiles.readArrayFile(sPath)
+		if dMeta.get('sFormat') != sSkinFormat:
+			raise RuntimeError('%s is not a skinCluster data file' %sPath)
+		dSkinData = {}
+		for sKey in ['sGeo', 'iVtxCount', 'iSkinMethod', 'bComponents', 'iNormalizeWeights', 'lInfluences']:
+			dSkinData[sKey] = dMeta[sKey]
+		dSkinData['iMaxInfluences'] = dMeta.get('iMaxInfluences', None)
+		if dMeta['iFormatVersion'] < 2:
+			dArrays = __convertSkinWeightsToSparse(dArrays, len(dSkinData['lInfluences']))
+		dSkinData.update(dArrays)
+	else:
+		dSkinData = __convertSkinClusterDataFromPickle(files.readPickleFile(sPath))
+	return dSkinData
+
+def loadSkinClusterData(sPath, sMesh = None, sMethod = 'vtxId', fTolerance = 0.00001):
 	bReturn = False
 
-	dSkinData = files.readPickleFile(sPath)
+	dSkinData = readSkinClusterDataFile(sPath)
 
 	if not sMesh:
 		sMesh = dSkinData['sGeo']
@@ -137,17 +212,25 @@ def loadSkinClusterData(sPath, sMesh = None, sMethod = 'vtxId'):
 			if iVtxCount == dSkinData['iVtxCount']:
 				fStartTime = time.time()
 
-				lInfluences = dSkinData['dSkinData'].keys()
+				lInfluences = dSkinData['lInfluences']
 				sSkinCluster = createSkinCluster(sMesh, lInfluences)
 				mFnSkinCluster = __setMFnSkinCluster(sSkinCluster)
 
+				if sMethod == 'vtxPos':
+					lComponents, lUnmatched = meshes.remapVtxIdToMesh(sMesh, lVtxPosBase = spatialIndex.convertFlatListToPoints(dSkinData['lVtxPos']), fTolerance = fTolerance)
+				else:
+					lComponents = None
+
 				cmds.setAttr('%s.normalizeWeights' %sSkinCluster, 0)
-				__setSkinWeights(sMesh, mFnSkinCluster, dSkinData['dSkinData'], sMethod = sMethod, lVtxPos = dSkinData['lVtxPos'])
-				__setSkinBlendWeights(sMesh, mFnSkinCluster, dSkinData['lBlendWeights'], sMethod = sMethod, lVtxPos = dSkinData['lVtxPos'])
+				__setSkinWeights(mFnSkinCluster, dSkinData, lComponents = lComponents)
+				__setSkinBlendWeights(mFnSkinCluster, dSkinData['lBlendWeights'], lComponents = lComponents)
 
 				cmds.setAttr('%s.skinningMethod' %sSkinCluster, dSkinData['iSkinMethod'])
 				cmds.setAttr('%s.useComponents' %sSkinCluster, dSkinData['bComponents'])
 				cmds.setAttr('%s.normalizeWeights' %sSkinCluster, dSkinData['iNormalizeWeights'])
+				if dSkinData.get('iMaxInfluences', None):
+					cmds.setAttr('%s.maxInfluences' %sSkinCluster, dSkinData['iMaxInfluences'])
+					cmds.setAttr('%s.maintainMaxInfluences' %sSkinCluster, 1)
 
 				fEndTime = time.time()
 				print 'loaded skinCluster for %s, took %s seconds' %(sMesh, fEndTime - fStartTime)
@@ -204,21 +287,43 @@ def __getSkinWeightsData(sMesh):
 
 	mInfluenceArray, iInfluence = __getSkinInfluenceArray(mFnSkinCluster)
 
-	iComponents = mWeightArray.length() / iInfluence
-
-	dSkinData = {}
-
+	lInfluences = []
 	for i in range(iInfluence):
-		sInfluence = mInfluenceArray[i].partialPathName()
+		lInfluences.append(mInfluenceArray[i].partialPathName())
 
-		dSkinData[sInfluence] = []
-		for j in range(iComponents):
-			dSkinData[sInfluence].append(mWeightArray[j * iInfluence + i])
-
-	return dSkinData
+	lWeights = apiUtils.convertMDoubleArrayToList(mWeightArray)
+	lWeightOffsets, lWeightInfluences, lWeightValues = skinWeights.convertDenseToSparse(lWeights, iInfluence)
 
+	return lInfluences, lWeightOffsets, lWeightInfluences, lWeightValues
 
+def __convertSkinClusterDataFromPickle(dSkinDataPickle):
+	'''
+	convert the old pickle skinCluster data (per influence weight lists, nested vertex positions)
+	to sparse weights and flat vertex positions
+	'''
+	dSkinData = {}
+	for sKey in ['sGeo', 'iVtxCount', 'iSkinMethod', 'bComponents', 'iNormalizeWeights', 'lBlendWeights']:
+		dSkinData[sKey] = dSkinDataPickle[sKey]
+	lInfluences = dSkinDataPickle['dSkinData'].keys()
+	lInfluenceWeights = [dSkinDataPickle['dSkinData'][sInfluence] for sInfluence in lInfluences]
+	lWeights = []
+	for j in range(dSkinData['iVtxCount']):
+		for lInfluenceWeight in lInfluenceWeights:
+			lWeights.append(lInfluenceWeight[j])
+	lVtxPos = []
+	for lPnt in dSkinDataPickle['lVtxPos']:
+		lVtxPos += lPnt
+	dSkinData['lInfluences'] = lInfluences
+	dSkinData['lVtxPos'] = lVtxPos
+	dSkinData.update(__convertSkinWeightsToSparse({'lWeights': lWeights}, len(lInfluences)))
+	return dSkinData
 
+def __convertSkinWeightsToSparse(dArrays, iInfluence):
+	lWeightOffsets, lWeightInfluences, lWeightValues = skinWeights.convertDenseToSparse(dArrays.pop('lWeights'), iInfluence)
+	dArrays['lWeightOffsets'] = lWeightOffsets
+	dArrays['lWeightInfluences'] = lWeightInfluences
+	dArrays['lWeightValues'] = lWeightValues
+	return dArrays
 
 def __getSkinBlendWeights(sMesh):
 	sSkinCluster = getSkinCluster(sMesh)
@@ -229,39 +334,25 @@ def __getSkinBlendWeights(sMesh):
 	lBlendWeights = apiUtils.convertMDoubleArrayToList(mWeightArray)
 	return lBlendWeights
 
-def __setSkinWeights(sMesh, mFnSkinCluster, dSkinData, sMethod = 'vtxId', lVtxPos = None, fTolerance = 0.00001):
+def __setSkinWeights(mFnSkinCluster, dSkinData, lComponents = None):
 	mDagPath, mComponents = __getComponentsFromMFnSkinCluster(mFnSkinCluster)
-	mWeightArray = __getSkinWeightArray(mFnSkinCluster)
 	mInfluenceArray, iInfluence = __getSkinInfluenceArray(mFnSkinCluster)
-	iComponents = mWeightArray.length() / iInfluence
 
-	if sMethod == 'vtxPos':
-		lComponents = meshes.remapVtxIdToMesh(sMesh, lVtxPosBase = lVtxPos, fTolerance = fTolerance)
-	else:
-		lComponents = range(iComponents)
+	dInfluenceIndex = {}
+	for i in range(iInfluence):
+		dInfluenceIndex[mInfluenceArray[i].partialPathName()] = i
+	lInfluenceRemap = [dInfluenceIndex.get(sInfluence, None) for sInfluence in dSkinData['lInfluences']]
 
-	for sInfluence in dSkinData.keys():
-		for i in range(iInfluence):
-			sInfluenceCurrent = mInfluenceArray[i].partialPathName()
-			if sInfluence == sInfluenceCurrent:
-				for j, m in enumerate(lComponents):
-					mWeightArray.set(dSkinData[sInfluence][m], j * iInfluence + i)
-				break
+	lWeights = skinWeights.convertSparseToDense(dSkinData['lWeightOffsets'], dSkinData['lWeightInfluences'], dSkinData['lWeightValues'], len(dSkinData['lInfluences']), lComponents = lComponents, lInfluenceRemap = lInfluenceRemap, iInfluenceDense = iInfluence)
+	mWeightArray = apiUtils.convertListToMDoubleArray(lWeights.tolist())
 
 	mIndexArray = OpenMaya.MIntArray(iInfluence)
 	for i in range(iInfluence):
 		mIndexArray.set(i, i)
 	mFnSkinCluster.setWeights(mDagPath, mComponents, mIndexArray, mWeightArray, False)
 
-def __setSkinBlendWeights(sMesh, mFnSkinCluster, lBlendWeights, sMethod = 'vtxId', lVtxPos = None, fTolerance = 0.00001):
+def __setSkinBlendWeights(mFnSkinCluster, lBlendWeights, lComponents = None):
 	mDagPath, mComponents = __getComponentsFromMFnSkinCluster(mFnSkinCluster)
-	iComponents = len(lBlendWeights)
-	mBlendWeightsArray = OpenMaya.MDoubleArray(iComponents)
-
-	if sMethod == 'vtxPos':
-		lComponents = meshes.remapVtxIdToMesh(sMesh, lVtxPosBase = lVtxPos, fTolerance = fTolerance)
-	else:
-		lComponents = range(iComponents)
-	for i, j in enumerate(lComponents):
-		mBlendWeightsArray.set(lBlendWeights[j], i)
+	lBlendWeightsRemap = skinWeights.remapVtxValues(lBlendWeights, lComponents = lComponents)
+	mBlendWeightsArray = apiUtils.convertListToMDoubleArray(lBlendWeightsRemap)
 	mFnSkinCluster.setBlendWeights(mDagPath, mComponents, mBlendWeightsArray)
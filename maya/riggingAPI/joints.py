@@ -8,9 +8,11 @@ import json
 import common.files as files
 import common.transforms as transforms
 import common.hierarchy as hierarchy
+import namingAPI.nameRegistry as nameRegistry
 
 #### Functions
 def createJnt(sName, iRotateOrder = 0):
+	nameRegistry.checkName(sName)
 	cmds.select(clear = True)
 	sJnt = cmds.joint(name = sName)
 	cmds.setAttr('%s.ro' %sJnt, iRotateOrder)
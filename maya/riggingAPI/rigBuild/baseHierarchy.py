@@ -11,6 +11,7 @@ import namingAPI.naming as naming
 import modelingAPI.models as models
 import modelingAPI.meshes as meshes
 import riggingAPI.rigComponents as rigComponents
+import riggingAPI.controls as controls
 
 ## baseHierarchy build script
 class baseHierarchy(baseCore.baseCore):
@@ -122,6 +123,10 @@ class baseHierarchy(baseCore.baseCore):
 		
 	def createNewScene(self):
 		workspaces.createNewScene()
+		controls.oControl.clearCache()
+		controls.clearCreateManyHistory()
+		attributes.resetAttrProfileStats()
+		attributes.resetSwitchStats()
 		return True
 
 	def importModel(self):
@@ -140,7 +145,9 @@ class baseHierarchy(baseCore.baseCore):
 
 	def buildBaseRigNodes(self):
 		## create master node
-		sMaster = transforms.createTransformNode('master', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'])
+		sMaster = transforms.createTransformNode('master')
+		lGrpsLocked = [sMaster]
+		lGrpsLockedVisible = []
 		####### add attrs
 		sEnumName = ''
 		for sRes in self.lRes:
@@ -162,38 +169,52 @@ class baseHierarchy(baseCore.baseCore):
 		cmds.setAttr('%s.geoDeformMove' %sMaster, channelBox = True)
 
 		## create control, do not touch group
-		sControl = transforms.createTransformNode('controls', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sMaster)
-		sDoNotTouch = transforms.createTransformNode('doNotTouch', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sMaster)	
+		sControl = transforms.createTransformNode('controls', sParent = sMaster)
+		sDoNotTouch = transforms.createTransformNode('doNotTouch', sParent = sMaster)
+		lGrpsLocked += [sControl, sDoNotTouch]
 
 		## create geometry groups
-		sGeometry = transforms.createTransformNode('geometry', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sDoNotTouch)
+		sGeometry = transforms.createTransformNode('geometry', sParent = sDoNotTouch)
+		lGrpsLocked.append(sGeometry)
 		for sRes in self.lRes:
 			sResGrp = naming.oName(sType = 'group', sSide = 'middle', sRes = sRes, sPart = 'geo').sName
-			sResGrp = transforms.createTransformNode(sResGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sGeometry)
+			sResGrp = transforms.createTransformNode(sResGrp, sParent = sGeometry)
+			lGrpsLocked.append(sResGrp)
 			for sPart in ['xtrs', 'def']:
 				sGrp = naming.oName(sType = 'group', sSide = 'middle', sRes = sRes, sPart = sPart).sName
-				sGrp = transforms.createTransformNode(sGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sResGrp)
+				sGrp = transforms.createTransformNode(sGrp, sParent = sResGrp)
+				lGrpsLocked.append(sGrp)
 
 		## create joint group
-		sJoint = transforms.createTransformNode('joints', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sDoNotTouch)
+		sJoint = transforms.createTransformNode('joints', sParent = sDoNotTouch)
+		lGrpsLocked.append(sJoint)
 		for sGrp in ['defJoints', 'rigJoints']:
-			transforms.createTransformNode(sGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sJoint)
+			lGrpsLocked.append(transforms.createTransformNode(sGrp, sParent = sJoint))
 		
 		## create rigNode groups
-		sRigNode = transforms.createTransformNode('rigNodes', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sDoNotTouch)
+		sRigNode = transforms.createTransformNode('rigNodes', sParent = sDoNotTouch)
+		lGrpsLocked.append(sRigNode)
 		for sPart in ['transform', 'origin']:
 			sGrp = naming.oName(sType = 'group', sSide = 'middle', sPart = 'rigNodes%s' %sPart.title()).sName
-			sGrp = transforms.createTransformNode(sGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sRigNode)
+			sGrp = transforms.createTransformNode(sGrp, sParent = sRigNode)
+			lGrpsLocked.append(sGrp)
 
 		## create rigGeometry groups
-		sRigGeometry = transforms.createTransformNode('rigGeometry', lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sDoNotTouch)
+		sRigGeometry = transforms.createTransformNode('rigGeometry', sParent = sDoNotTouch)
+		lGrpsLocked.append(sRigGeometry)
 		for sRes in self.lRes:
 			sResGrp = naming.oName(sType = 'group', sSide = 'middle', sRes = sRes, sPart = 'rigGeometry').sName
-			sResGrp = transforms.createTransformNode(sResGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sRigGeometry)
+			sResGrp = transforms.createTransformNode(sResGrp, sParent = sRigGeometry)
+			lGrpsLocked.append(sResGrp)
 			for sPart in ['transform', 'origin']:
 				sGrp = naming.oName(sType = 'group', sSide = 'middle', sRes = sRes, sPart = 'rigGeometry%s' %sPart.title()).sName
-				sGrp = transforms.createTransformNode(sGrp, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sParent = sResGrp)
+				sGrp = transforms.createTransformNode(sGrp, sParent = sResGrp)
 				cmds.setAttr('%s.v' %sGrp, 0)
+				lGrpsLockedVisible.append(sGrp)
+
+		## lock and hide all the groups in one pass for each profile
+		attributes.applyAttrProfile(lGrpsLocked, 'lockedGroup')
+		attributes.applyAttrProfile(lGrpsLockedVisible, 'lockedGroupVisible')
 
 		## Vis connections
 		### resolution
@@ -259,6 +280,12 @@ class baseHierarchy(baseCore.baseCore):
 			sGrp = naming.oName(sType = 'group', sSide = 'middle', sRes = sRes, sPart = 'rigGeometryTransform').sName
 			lConstraints = constraints.constraint([sCtrlLocal, sGrp], sType = 'all', bForce = True)
 
+		## build report
+		dStats = attributes.getAttrProfileStats()
+		print 'attribute profiles: %d nodes locked and hidden, %d setAttr calls avoided' %(dStats['iNodes'], dStats['iSetAttrsAvoided'])
+		dStats = attributes.getSwitchStats()
+		print 'enum switches: %d nodes created, %d saved, %d switches shared' %(dStats['iNodesCreated'], dStats['iNodesSaved'], dStats['iSwitchesShared'])
+
 
 	def importBlueprint(self):
 		bReturn = rigComponents.importBlueprint(self.dRigData['dBlueprint'], self.sProject, self.sAsset)
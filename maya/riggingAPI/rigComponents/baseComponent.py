@@ -12,6 +12,7 @@ import namingAPI.namingDict as namingDict
 import common.transforms as transforms
 import common.attributes as attributes
 import common.apiUtils as apiUtils
+import common.matrixMath as matrixMath
 import riggingAPI.constraints as constraints
 import riggingAPI.joints as joints
 import riggingAPI.controls as controls
@@ -77,42 +78,39 @@ class baseComponent(object):
 		return self._lCtrls
 
 	def createComponent(self):
+		oFamily = naming.getNameFamily('component', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex)
+
 		# create groups
 		### master group
-		sComponentMaster = naming.oName(sType = 'rigComponent', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentMaster, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sParent)
+		sComponentMaster = transforms.createTransformNode(oFamily.sComponentMaster, sParent = self._sParent)
 
 		### rig nodes world group
-		sComponentRigNodesWorld = naming.oName(sType = 'rigNodesWorld', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentRigNodesWorld, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentMaster)
+		sComponentRigNodesWorld = transforms.createTransformNode(oFamily.sComponentRigNodesWorld, sParent = sComponentMaster)
 
 		### sub components group
-		sComponentSubComponents = naming.oName(sType = 'subComponents', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentSubComponents, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentMaster)
+		sComponentSubComponents = transforms.createTransformNode(oFamily.sComponentSubComponents, sParent = sComponentMaster)
 
 		### inherits group
-		sComponentInherits = naming.oName(sType = 'inherits', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentInherits, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentMaster)
+		sComponentInherits = transforms.createTransformNode(oFamily.sComponentInherits, sParent = sComponentMaster)
 
 		### xform group
-		sComponentXform = naming.oName(sType = 'xform', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentXform, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentInherits)
+		sComponentXform = transforms.createTransformNode(oFamily.sComponentXform, sParent = sComponentInherits)
 
 		### passer group
-		sComponentPasser = naming.oName(sType = 'passer', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentPasser, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentXform)
+		sComponentPasser = transforms.createTransformNode(oFamily.sComponentPasser, sParent = sComponentXform)
 
 		### space group
-		sComponentSpace = naming.oName(sType = 'space', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentSpace, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentPasser)
+		sComponentSpace = transforms.createTransformNode(oFamily.sComponentSpace, sParent = sComponentPasser)
 
 		## controls group
-		sComponentControls = naming.oName(sType = 'controls', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentControls, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentSpace)
+		sComponentControls = transforms.createTransformNode(oFamily.sComponentControls, sParent = sComponentSpace)
 		
 		### rig nodes local group
-		sComponentRigNodesLocal = naming.oName(sType = 'rigNodesLocal', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentRigNodesLocal, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentSpace)
+		sComponentRigNodesLocal = transforms.createTransformNode(oFamily.sComponentRigNodesLocal, sParent = sComponentSpace)
+
+		### lock and hide all the groups in one pass
+		attributes.applyAttrProfile([sComponentMaster, sComponentRigNodesWorld, sComponentSubComponents, sComponentInherits, sComponentXform,
+									 sComponentPasser, sComponentSpace, sComponentControls, sComponentRigNodesLocal], 'lockedGroup')
 
 		# visibility switch
 		### controls
@@ -126,23 +124,27 @@ class baseComponent(object):
 		cmds.setAttr('%s.subComponents' %sComponentMaster, channelBox = True)
 
 		### connect attrs
-		attributes.connectAttrs(['%s.controls' %sComponentMaster], ['%s.v' %sComponentControls], bForce = True)
-		attributes.connectAttrs(['%s.rigNodes' %sComponentMaster, '%s.rigNodes' %sComponentMaster], ['%s.v' %sComponentRigNodesLocal, '%s.v' %sComponentRigNodesWorld], bForce = True)
-		attributes.connectAttrs(['%s.subComponents' %sComponentMaster], ['%s.v' %sComponentSubComponents], bForce = True)
+		attributes.connectAttrsBatch([('%s.controls' %sComponentMaster, '%s.v' %sComponentControls, True),
+									  ('%s.rigNodes' %sComponentMaster, '%s.v' %sComponentRigNodesLocal, True),
+									  ('%s.rigNodes' %sComponentMaster, '%s.v' %sComponentRigNodesWorld, True),
+									  ('%s.subComponents' %sComponentMaster, '%s.v' %sComponentSubComponents, True)])
 		
 		# input attrs
 		### input matrix
 		cmds.addAttr(sComponentMaster, ln = 'inputMatrix', at = 'matrix')
 		cmds.addAttr(sComponentMaster, ln = 'inputMatrixInverse', at = 'matrix')
-		sMultMatrix = naming.oName(sType = 'multMatrix', sSide = self._sSide, sPart = '%sInputMatrix' %self._sName, iIndex = self._iIndex).sName
-		sDecomposeMatrix = naming.oName(sType = 'decomposeMatrix', sSide = self._sSide, sPart = '%sInputMatrix' %self._sName, iIndex = self._iIndex).sName
+		sMultMatrix = oFamily.sMultMatrixInput
+		sDecomposeMatrix = oFamily.sDecomposeMatrixInput
 		cmds.createNode('multMatrix', name = sMultMatrix)
 		cmds.createNode('decomposeMatrix', name = sDecomposeMatrix)
 		cmds.connectAttr('%s.inputMatrixInverse' %sComponentMaster, '%s.matrixIn[0]' %sMultMatrix)
 		cmds.connectAttr('%s.inputMatrix' %sComponentMaster, '%s.matrixIn[1]' %sMultMatrix)
 		cmds.connectAttr('%s.matrixSum' %sMultMatrix, '%s.inputMatrix' %sDecomposeMatrix)
+		lEdges = []
 		for sAxis in ['X', 'Y', 'Z']:
-			attributes.connectAttrs(['%s.outputTranslate%s' %(sDecomposeMatrix, sAxis), '%s.outputRotate%s' %(sDecomposeMatrix, sAxis), '%s.outputScale%s' %(sDecomposeMatrix, sAxis)], ['%s.translate%s' %(sComponentXform, sAxis), '%s.rotate%s' %(sComponentXform, sAxis), '%s.scale%s' %(sComponentXform, sAxis)], bForce = True)
+			for sAttrOutput, sAttr in [['outputTranslate', 'translate'], ['outputRotate', 'rotate'], ['outputScale', 'scale']]:
+				lEdges.append(('%s.%s%s' %(sDecomposeMatrix, sAttrOutput, sAxis), '%s.%s%s' %(sComponentXform, sAttr, sAxis), True))
+		attributes.connectAttrsBatch(lEdges)
 		attributes.connectAttrs(['%s.outputShear' %sDecomposeMatrix], ['%s.shear' %sComponentXform], bForce = True)
 
 		self._sComponentMaster = sComponentMaster
@@ -171,12 +173,9 @@ class baseComponent(object):
 		self._sWorldMatrixRvsPlug = '%s.lWorldMatrixRvs' %sComponentMaster
 
 	def connectComponents(self, sMatrixPlug):
-		mMatrixOrig = apiUtils.createMMatrixFromTransformInfo()
-		lMatrixOrig = apiUtils.convertMMatrixToList(mMatrixOrig)
+		lMatrixOrig = matrixMath.lIdentity
 		lMatrixIn = cmds.getAttr(sMatrixPlug)
-		mMatrix = apiUtils.convertListToMMatrix(lMatrixIn)
-		mMatrixInverse = mMatrix.inverse()
-		lMatrixInInverse = apiUtils.convertMMatrixToList(mMatrixInverse)
+		lMatrixInInverse = matrixMath.inverseMatrix(lMatrixIn)
 		sMultMatrix = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = self._sSide, sPart = '%sConnectIn' %self._sName, iIndex = self._iIndex).sName)
 		cmds.setAttr('%s.matrixIn[0]' %sMultMatrix, lMatrixOrig, type = 'matrix')
 		cmds.setAttr('%s.matrixIn[1]' %sMultMatrix, lMatrixInInverse, type = 'matrix')
@@ -242,7 +241,7 @@ class baseComponent(object):
 
 
 	def _addSpaceAttr(self, sCtrl, sType, lKeys, lIndex, lPlugs, iDefaultA, iDefaultB):
-		oCtrl = controls.oControl(sCtrl)
+		oCtrl = controls.oControl.get(sCtrl)
 
 		sEnumName = ''
 		for i, sKey in enumerate(lKeys):
@@ -317,7 +316,7 @@ class baseComponent(object):
 		cmds.addAttr('%s.spaceA%s' %(sCtrl, sType.upper()), e = True, en = sEnumName_orig[:-1], dv = iDefaultA)
 		cmds.addAttr('%s.spaceB%s' %(sCtrl, sType.upper()), e = True, en = sEnumName_orig[:-1], dv = iDefaultB)
 
-		oCtrl = controls.oControl(sCtrl)
+		oCtrl = controls.oControl.get(sCtrl)
 		sChoiceA = naming.oName(sType = 'choice', sSide = oCtrl.sSide, sPart = '%sSpaceA%s' %(oCtrl.sPart, sType.upper()), iIndex = oCtrl.iIndex).sName
 		sChoiceB = naming.oName(sType = 'choice', sSide = oCtrl.sSide, sPart = '%sSpaceB%s' %(oCtrl.sPart, sType.upper()), iIndex = oCtrl.iIndex).sName
 		
@@ -327,7 +326,7 @@ class baseComponent(object):
 			cmds.connectAttr(sPlug_space, '%s.input[%d]' %(sChoiceB, lIndex[i]), f = True)
 
 	def _spaceMatrix(self, sCtrl, sPlug, sKey):
-		oCtrl = controls.oControl(sCtrl)
+		oCtrl = controls.oControl.get(sCtrl)
 		sMultMatrix = naming.oName(sType = 'multMatrix', sSide = oCtrl.sSide, sPart = '%sSpace%sMatrix' %(oCtrl.sPart, sKey.title()), iIndex = oCtrl.iIndex).sName
 		if not cmds.objExists(sMultMatrix):
 			cmds.createNode('multMatrix', name = sMultMatrix)
@@ -123,6 +123,7 @@ class baseComponentsBlendLimb(baseJointsLimb.baseJointsLimb):
 			lNodes.append([sChoiceA, sChoiceB])
 
 		dModuleInfo = {}
+		lEdges = []
 		for sKey in self._dComponents.keys():
 			sModulePath = self._dComponents[sKey]['sModulePath']
 			sModuleName = self._dComponents[sKey]['sModuleName']
@@ -133,9 +134,10 @@ class baseComponentsBlendLimb(baseJointsLimb.baseJointsLimb):
 			oLimb = getattr(oModule, sModuleName)(**dKwargs)
 			oLimb.createComponent()
 
-			## connect attrs
-			attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = self._sComponentPasser, sDriven = oLimb._sComponentPasser, bForce = True)
-			attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = self._sComponentSpace, sDriven = oLimb._sComponentSpace, bForce = True)
+			## connect attrs, connected in one pass after the loop
+			for sDriver, sDriven in [[self._sComponentPasser, oLimb._sComponentPasser], [self._sComponentSpace, oLimb._sComponentSpace]]:
+				for sAttr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz']:
+					lEdges.append(('%s.%s' %(sDriver, sAttr), '%s.%s' %(sDriven, sAttr), True))
 
 			cmds.connectAttr('%s.inputMatrix' %self._sComponentMaster, '%s.inputMatrix' %oLimb._sComponentMaster)
 			cmds.connectAttr('%s.lWorldMatrix' %self._sComponentMaster, '%s.lWorldMatrix' %oLimb._sComponentMaster)
@@ -163,6 +165,8 @@ class baseComponentsBlendLimb(baseJointsLimb.baseJointsLimb):
 
 			dModuleInfo.update({sKey: {'sModulePath': sModulePath, 'sModuleName': sModuleName, 'sComponentNode': oLimb._sComponentMaster}})
 
+		attributes.connectAttrsBatch(lEdges)
+
 		cmds.delete(sCrv)
 
 		if lBindJnts:
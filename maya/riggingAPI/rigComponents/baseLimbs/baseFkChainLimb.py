@@ -8,7 +8,7 @@ import maya.cmds as cmds
 import namingAPI.naming as naming
 import common.transforms as transforms
 import common.attributes as attributes
-import common.apiUtils as apiUtils
+import common.matrixMath as matrixMath
 import riggingAPI.joints as joints
 import riggingAPI.controls as controls
 import riggingAPI.constraints as constraints
@@ -56,8 +56,7 @@ class baseFkChainLimb(baseJointsLimb.baseJointsLimb):
 			sMultMatrix = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = oJntName.sSide, sPart = '%sFkConstraint' %oJntName.sPart, iIndex = oJntName.iIndex).sName)
 			cmds.connectAttr('%s.matrixOutputLocal' %oCtrl.sName, '%s.matrixIn[0]' %sMultMatrix)
 			lTranslate = cmds.getAttr('%s.translate' %sJnt)[0]
-			mMatrix = apiUtils.createMMatrixFromTransformInfo(lTranslate = [lTranslate[0], lTranslate[1], lTranslate[2]])
-			lMatrix = apiUtils.convertMMatrixToList(mMatrix)
+			lMatrix = matrixMath.composeMatrix(lTranslate = [lTranslate[0], lTranslate[1], lTranslate[2]])
 			cmds.setAttr('%s.matrixIn[1]' %sMultMatrix, lMatrix, type = 'matrix')
 
 			constraints.matrixConnect(sMultMatrix, [sJnt], 'matrixSum', lSkipScale = ['X', 'Y', 'Z'], bForce = True)
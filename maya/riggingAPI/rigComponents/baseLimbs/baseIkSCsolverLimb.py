@@ -57,8 +57,9 @@ class baseIkSCsolverLimb(baseJointsLimb.baseJointsLimb):
 		lCtrls.append(oCtrlAim.sName)
 
 		## put ik joint chain locally
-		sGrp_ikJnts = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCJointsLocal' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld)
+		sGrp_ikJnts = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCJointsLocal' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld)
 		sParent_jntLocal = sGrp_ikJnts
+		lGrps = [sGrp_ikJnts]
 		lJntsLocal = []
 
 		lJntsLocal, lBindJnts = createDriveJoints.createDriveJoints(self._lBpJnts, sParent = sGrp_ikJnts, sSuffix = 'IkSCLocal', bBind = False)
@@ -75,7 +76,8 @@ class baseIkSCsolverLimb(baseJointsLimb.baseJointsLimb):
 			cmds.addAttr(oCtrlAim.sName, ln = 'factorZNeg', at = 'float', min = 0, dv = self._lFactorZ[0], keyable = True)
 			cmds.addAttr(oCtrlAim.sName, ln = 'stretchLengthOrig', at = 'float')
 
-			sGrp_stretch = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCJointStretch' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld)
+			sGrp_stretch = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCJointStretch' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld)
+			lGrps.append(sGrp_stretch)
 			
 			## distance measure
 			sDistance = cmds.createNode('distanceBetween', name = naming.oName(sType = 'distanceBetween', sSide = self._sSide, sPart = '%sStretch' %self._sName, iIndex = self._iIndex).sName)
@@ -153,13 +155,17 @@ class baseIkSCsolverLimb(baseJointsLimb.baseJointsLimb):
 		cmds.ikHandle(sj = lJntsLocal[0], ee = lJntsLocal[-1], sol = 'ikSCsolver', name = sIkHnd)
 
 		#### offset group
-		sGrpIk = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCsolverOffset' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld, sPos = oCtrlAim.sName)
+		sGrpIk = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSCsolverOffset' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld, sPos = oCtrlAim.sName)
 		cmds.parent(sIkHnd, sGrpIk)
 
 		#### matrix connect
 		constraints.matrixConnect(oCtrlAim.sName, [sGrpIk], 'matrixOutputWorld', lSkipScale = ['X', 'Y', 'Z'], bForce = True)
 		constraints.matrixConnect(oCtrlRoot.sName, [lJnts[0]], 'matrixOutputWorld',lSkipRotate = ['X', 'Y', 'Z'], lSkipScale = ['X', 'Y', 'Z'], bForce = True)
 
+		## lock and hide the rig groups in one pass, after the matrix connections
+		lGrps.append(sGrpIk)
+		attributes.applyAttrProfile(lGrps, 'lockedGroup')
+
 		## pass info to class
 		self._lJnts = lJnts
 		self._lCtrls = lCtrls
@@ -43,7 +43,7 @@ class baseIkSpringSolverLimb(baseJointsLimb.baseJointsLimb):
 		sParent_ctrl = self._sComponentControls
 
 		## put ik joint chain locally
-		sGrp_ikJnts = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSpringJointsLocal' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld)
+		sGrp_ikJnts = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSpringJointsLocal' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld)
 		sParent_jntLocal = sGrp_ikJnts
 		lJntsLocal = []
 
@@ -73,8 +73,8 @@ class baseIkSpringSolverLimb(baseJointsLimb.baseJointsLimb):
 		cmds.ikHandle(sj = lJntsLocal[0], ee = lJntsLocal[-1], sol = 'ikSplineSolver', name = sIkHnd)
 
 		#### offset group
-		sGrpIk = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSpringSolver' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld, sPos = lCtrls[-1])
-		sGrpPv = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sPV' %self._sName, iIndex = self._iIndex).sName, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentRigNodesWorld, sPos = lCtrls[1])
+		sGrpIk = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sSpringSolver' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld, sPos = lCtrls[-1])
+		sGrpPv = transforms.createTransformNode(naming.oName(sType = 'group', sSide = self._sSide, sPart = '%sPV' %self._sName, iIndex = self._iIndex).sName, sParent = self._sComponentRigNodesWorld, sPos = lCtrls[1])
 		cmds.parent(sIkHnd, sGrpIk)
 
 		#### pole vector constraint
@@ -111,6 +111,9 @@ class baseIkSpringSolverLimb(baseJointsLimb.baseJointsLimb):
 		cmds.connectAttr('%s.matrix' %lJnts[0], '%s.matrixIn[1]' %sMultMatrixPv)
 		constraints.matrixConnect(sMultMatrixPv, [lClsHnds[0]], 'matrixSum', lSkipRotate = ['X', 'Y', 'Z'], lSkipScale = ['X', 'Y', 'Z'], bForce = True)
 
+		## lock and hide the rig groups in one pass, after the matrix connections
+		attributes.applyAttrProfile([sGrp_ikJnts, sGrpIk, sGrpPv], 'lockedGroup')
+
 		## write component info
 		self._writeGeneralComponentInfo('baseIkSpringSolverLimb', lJnts, lCtrls, lBindJnts, self._lBindRootJnts)
 
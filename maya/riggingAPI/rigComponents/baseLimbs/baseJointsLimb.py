@@ -71,27 +71,34 @@ class baseJointsLimb(baseComponent.baseComponent):
 
 		### inherits local group
 		sComponentInheritsLocal = naming.oName(sType = 'inherits', sSide = self._sSide, sPart = '%sLocal' %self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentInheritsLocal, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = self._sComponentMaster, bInheritsTransform = False)
+		transforms.createTransformNode(sComponentInheritsLocal, sParent = self._sComponentMaster, bInheritsTransform = False)
 
 		### xform local group
 		sComponentXformLocal = naming.oName(sType = 'xform', sSide = self._sSide, sPart = '%sLocal' %self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentXformLocal, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentInheritsLocal)
-		attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = self._sComponentXform, sDriven = sComponentXformLocal, bForce = True)
+		transforms.createTransformNode(sComponentXformLocal, sParent = sComponentInheritsLocal)
 
 		### passer local group
 		sComponentPasserLocal = naming.oName(sType = 'passer', sSide = self._sSide, sPart = '%sLocal' %self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentPasserLocal, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentXformLocal)
-		attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = self._sComponentPasser, sDriven = sComponentPasserLocal, bForce = True)
+		transforms.createTransformNode(sComponentPasserLocal, sParent = sComponentXformLocal)
 
 		### space local group
 		sComponentSpaceLocal = naming.oName(sType = 'space', sSide = self._sSide, sPart = '%sLocal' %self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentSpaceLocal, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentPasserLocal)
-		attributes.connectAttrs(['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'], sDriver = self._sComponentSpace, sDriven = sComponentSpaceLocal, bForce = True)
-		
+		transforms.createTransformNode(sComponentSpaceLocal, sParent = sComponentPasserLocal)
+
+		### connect the local groups to the component groups in one pass
+		lEdges = []
+		for sDriver, sDriven in [[self._sComponentXform, sComponentXformLocal], [self._sComponentPasser, sComponentPasserLocal], [self._sComponentSpace, sComponentSpaceLocal]]:
+			for sAttr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz']:
+				lEdges.append(('%s.%s' %(sDriver, sAttr), '%s.%s' %(sDriven, sAttr), True))
+		attributes.connectAttrsBatch(lEdges)
+
 
 		## joints group
 		sComponentJoints = naming.oName(sType = 'joints', sSide = self._sSide, sPart = self._sName, iIndex = self._iIndex).sName
-		transforms.createTransformNode(sComponentJoints, lLockHideAttrs = ['tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz', 'v'], sParent = sComponentSpaceLocal)
+		transforms.createTransformNode(sComponentJoints, sParent = sComponentSpaceLocal)
+
+		### lock and hide all the local groups in one pass
+		attributes.applyAttrProfile([sComponentInheritsLocal, sComponentXformLocal, sComponentPasserLocal, sComponentSpaceLocal, sComponentJoints], 'lockedGroup')
 
 		# visibility switch
 		### joints
@@ -4,7 +4,7 @@
 import maya.cmds as cmds
 ## import libs
 import namingAPI.naming as naming
-import common.apiUtils as apiUtils
+import common.matrixMath as matrixMath
 import riggingAPI.joints as joints
 import riggingAPI.rigComponents.rigUtils.componentInfo as componentInfo
 import riggingAPI.rigComponents.rigUtils.createDriveJoints as createDriveJoints
@@ -130,8 +130,7 @@ def _twistMatrixDriver(sJnt, oName, sPos = 'Start'):
 		sMultMatrix = cmds.createNode('multMatrix', name = naming.oName(sType = 'multMatrix', sSide = oName.sSide, sPart = '%sTwist%s' %(oName.sPart, sPos), iIndex = oName.iIndex).sName)
 		cmds.connectAttr('%s.matrix' %sJnt, '%s.matrixIn[0]' %sMultMatrix)
 		lJntOrient = joints.getJointOrient(sJnt)
-		mMatrix = apiUtils.createMMatrixFromTransformInfo(lRotate = lJntOrient)
-		lMatrixInInverse = apiUtils.convertMMatrixToList(mMatrix.inverse())
+		lMatrixInInverse = matrixMath.inverseMatrix(matrixMath.composeMatrix(lRotate = lJntOrient))
 		cmds.setAttr('%s.matrixIn[1]' %sMultMatrix, lMatrixInInverse, type = 'matrix')
 		cmds.connectAttr('%s.matrixSum' %sMultMatrix, '%s.inputMatrix' %sDecomposeMatrix)
 
@@ -0,0 +1,123 @@
+## External Import
+import array
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+## sparse skin weights, stored as compressed sparse rows
+## lOffsets: vertex count + 1, weights of vertex i are lOffsets[i]:lOffsets[i+1]
+## lInfluences: influence index of each weight
+## lValues: weight values
+
+#### Functions
+def convertDenseToSparse(lWeights, iInfluence, fEpsilon = 0):
+	'''
+	convert flat vertex x influence weights (MFnSkinCluster.getWeights layout) to sparse rows
+	weights not greater than fEpsilon are dropped
+	'''
+	if numpy is not None:
+		aWeights = numpy.asarray(lWeights, dtype = numpy.float64).reshape(-1, iInfluence)
+		aVtx, aInfluences = numpy.nonzero(aWeights > fEpsilon)
+		aOffsets = numpy.zeros(aWeights.shape[0] + 1, dtype = numpy.uint32)
+		numpy.cumsum(numpy.bincount(aVtx, minlength = aWeights.shape[0]), out = aOffsets[1:])
+		return aOffsets, aInfluences.astype(numpy.uint32), aWeights[aVtx, aInfluences]
+
+	lOffsets = array.array('I', [0])
+	lInfluences = array.array('I')
+	lValues = array.array('d')
+	for iStart in xrange(0, len(lWeights), iInfluence):
+		for i in xrange(iInfluence):
+			fWeight = lWeights[iStart + i]
+			if fWeight > fEpsilon:
+				lInfluences.append(i)
+				lValues.append(fWeight)
+		lOffsets.append(len(lValues))
+	return lOffsets, lInfluences, lValues
+
+def convertSparseToDense(lOffsets, lInfluences, lValues, iInfluence, lComponents = None, lInfluenceRemap = None, iInfluenceDense = None):
+	'''
+	convert sparse rows back to flat vertex x influence weights
+
+	lComponents: source vertex of each output vertex, default is the saved vertex order,
+				 None entries are left with zero weights
+	lInfluenceRemap: output influence index of each saved influence, None to skip the influence
+	iInfluenceDense: influence count of the output layout, default is iInfluence
+	'''
+	if iInfluenceDense is None:
+		iInfluenceDense = iInfluence
+	if lComponents is None:
+		lComponents = xrange(len(lOffsets) - 1)
+	if lInfluenceRemap is None:
+		lInfluenceRemap = range(iInfluence)
+
+	if numpy is not None:
+		return __convertSparseToDenseNumpy(lOffsets, lInfluences, lValues, lComponents, lInfluenceRemap, iInfluenceDense)
+
+	lWeights = array.array('d', [0.0]) * (len(lComponents) * iInfluenceDense)
+	for j, m in enumerate(lComponents):
+		if m is None:
+			continue
+		iStart = j * iInfluenceDense
+		for k in xrange(lOffsets[m], lOffsets[m + 1]):
+			iRemap = lInfluenceRemap[lInfluences[k]]
+			if iRemap is not None:
+				lWeights[iStart + iRemap] = lValues[k]
+	return lWeights
+
+def pruneSparseWeights(lOffsets, lInfluences, lValues, iMaxInfluences = None, fEpsilon = 0, bNormalize = True):
+	'''
+	keep the iMaxInfluences biggest weights per vertex, drop weights not greater than fEpsilon,
+	and renormalize each vertex to sum 1
+	'''
+	lOffsetsPrune = array.array('I', [0])
+	lInfluencesPrune = array.array('I')
+	lValuesPrune = array.array('d')
+	for i in xrange(len(lOffsets) - 1):
+		lVtxWeights = []
+		for k in xrange(lOffsets[i], lOffsets[i + 1]):
+			if lValues[k] > fEpsilon:
+				lVtxWeights.append((float(lValues[k]), int(lInfluences[k])))
+		if iMaxInfluences and len(lVtxWeights) > iMaxInfluences:
+			lVtxWeights.sort(reverse = True)
+			lVtxWeights = lVtxWeights[:iMaxInfluences]
+		lVtxWeights.sort(key = lambda tWeight: tWeight[1])
+		fSum = sum([tWeight[0] for tWeight in lVtxWeights])
+		for fWeight, iInfluence in lVtxWeights:
+			if bNormalize and fSum > 0:
+				fWeight /= fSum
+			lInfluencesPrune.append(iInfluence)
+			lValuesPrune.append(fWeight)
+		lOffsetsPrune.append(len(lValuesPrune))
+	return lOffsetsPrune, lInfluencesPrune, lValuesPrune
+
+def remapVtxValues(lValues, lComponents = None):
+	'''
+	reorder per vertex values by lComponents, None entries get 0, return a list of floats
+	'''
+	if lComponents is None:
+		return [float(fValue) for fValue in lValues]
+	if numpy is not None:
+		aValues = numpy.append(numpy.asarray(lValues, dtype = numpy.float64), 0.0)
+		aComponents = numpy.array([len(lValues) if m is None else m for m in lComponents], dtype = numpy.int64)
+		return aValues[aComponents].tolist()
+	return [0.0 if m is None else float(lValues[m]) for m in lComponents]
+
+#### Sub Functions
+def __convertSparseToDenseNumpy(lOffsets, lInfluences, lValues, lComponents, lInfluenceRemap, iInfluenceDense):
+	'''
+	scatter the sparse rows into a dense matrix with one extra zero row,
+	then reorder the vertices with a single fancy index
+	'''
+	aOffsets = numpy.asarray(lOffsets, dtype = numpy.int64)
+	iVtxCount = len(aOffsets) - 1
+	aRemap = numpy.array([-1 if iRemap is None else iRemap for iRemap in lInfluenceRemap], dtype = numpy.int64)
+	aVtx = numpy.repeat(numpy.arange(iVtxCount), numpy.diff(aOffsets))
+	aInfluences = aRemap[numpy.asarray(lInfluences, dtype = numpy.int64)]
+	aMask = aInfluences >= 0
+
+	aWeights = numpy.zeros((iVtxCount + 1, iInfluenceDense), dtype = numpy.float64)
+	aWeights[aVtx[aMask], aInfluences[aMask]] = numpy.asarray(lValues, dtype = numpy.float64)[aMask]
+
+	aComponents = numpy.array([iVtxCount if m is None else m for m in lComponents], dtype = numpy.int64)
+	return aWeights[aComponents].ravel()